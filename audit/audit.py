@@ -4,14 +4,36 @@ Auditovací skript pro kontrolu kvality kódu.
 Spouští nástroje Vulture, Flake8 a Pylint nad aktuální složkou nebo soubory,
 sbírá výstupy a ukládá je do souboru audit_report_<timestamp>.txt.
 
+Nástroje běží souběžně v poolu procesů. Výsledky Flake8 se ukládají do cache
+podle SHA-256 obsahu souboru (audit/.audit_cache.json), takže se znovu analyzují
+jen změněné soubory. Vulture a Pylint analyzují celý program najednou (nevyužitý
+kód, no-member, import-error i cyclic-import závisí na ostatních modulech) a jejich
+výsledek se použije z cache, jen pokud se nezměnil žádný soubor.
+
+Poslední sekce reportu spouští výkonnostní benchmark (audit/benchmark.py) a porovná
+jej s baseline (audit/benchmark_baseline.json); regrese nad prahem se označí ❌.
+Regrese i chybějící baseline ukončí audit kódem 1.
+
 Používá se pro ruční kontrolu čistoty a stylu kódu mimo hlavní aplikaci.
 
-Bash: python audit/audit.py
+Bash: python audit/audit.py                  (s cache)
+      python audit/audit.py --no-cache       (vše znovu)
+      python audit/audit.py --no-bench       (bez benchmarku)
+      python audit/audit.py --threshold 10   (práh regrese v %)
 """
 
 import os
 import re
+import sys
+import json
+import hashlib
+import argparse
+import subprocess
+import importlib.util
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmark import compare, load_baseline
 
 # 🔍 Cesty a výjimky
 TARGET_PATH = "."
@@ -20,6 +42,9 @@ EXCLUDED_FILES = {
     "audit.py", "config.ini", "requirements.txt", "README.md",
     "vulture_whitelist.txt", "setup.py"
 }
+CACHE_PATH = os.path.join("audit", ".audit_cache.json")
+CONFIG_FILES = (".flake8", ".pylintrc")  # 💡 změna konfigurace zneplatní celou cache
+TOOLS = ("vulture", "flake8", "pylint")
 
 
 # 📦 Sběr souborů pro analýzu
@@ -31,7 +56,66 @@ def get_python_files():
             if filename.endswith(".py") and filename not in EXCLUDED_FILES:
                 full_path = os.path.join(root, filename)
                 files.append(full_path)
-    return files
+    return sorted(files)
+
+
+# 🔑 Otisky souborů pro cache
+def file_hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def config_hash() -> str:
+    digest = hashlib.sha256()
+    for path in CONFIG_FILES:
+        if os.path.exists(path):
+            digest.update(file_hash(path).encode())
+    return digest.hexdigest()
+
+
+def empty_cache(config_key: str) -> dict:
+    return {"config": config_key, "files": {}, "vulture": {}, "pylint": {}}
+
+
+def program_hash(hashes: dict[str, str]) -> str:
+    return hashlib.sha256("".join(f"{f}:{h}" for f, h in hashes.items()).encode()).hexdigest()
+
+
+def load_cache(config_key: str) -> dict:
+    try:
+        with open(CACHE_PATH, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return empty_cache(config_key)
+    if cache.get("config") != config_key:
+        return empty_cache(config_key)
+    return cache
+
+
+def save_cache(cache: dict):
+    tmp = CACHE_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, CACHE_PATH)
+
+
+# 🛠️ Spuštění jednoho nástroje (běží v samostatném procesu poolu)
+def run_tool(tool: str, files: list[str]) -> str:
+    command = [sys.executable, "-m", tool, *files]
+    result = subprocess.run(command, capture_output=True, text=True, encoding="utf-8")
+    return result.stdout
+
+
+# ⏱️ Benchmark v samostatném procesu (fake moduly nesmí ovlivnit audit)
+def run_benchmark_section(threshold_pct: float | None) -> tuple[str, bool]:
+    result = subprocess.run(
+        [sys.executable, os.path.join("audit", "benchmark.py")],
+        capture_output=True, text=True, encoding="utf-8"
+    )
+    if result.returncode != 0:
+        return f"❌ Benchmark selhal:\n{result.stderr.strip()}", True
+    metrics = json.loads(result.stdout.strip().splitlines()[-1])
+    return compare(metrics, load_baseline(), threshold_pct)
 
 
 # 📝 Zápis do reportu
@@ -106,38 +190,89 @@ def filter_vulture_output(output: str) -> str:
 
 
 # 🚀 Spuštění auditů
-def run_audit():
+def run_audit(use_cache: bool = True, bench: bool = True, threshold_pct: float | None = None):
+    # 💡 chybějící nástroj by do cache uložil prázdný výsledek
+    missing = [tool for tool in TOOLS if importlib.util.find_spec(tool) is None]
+    if missing:
+        print(f"❌ Chybí nástroje: {', '.join(missing)} (pip install -r dev-requirements.txt)")
+        sys.exit(1)
+
     python_files = get_python_files()
 
     if os.path.exists("main.py"):
         python_files.insert(0, "main.py")
 
+    config_key = config_hash()
+    cache = load_cache(config_key) if use_cache else empty_cache(config_key)
+    hashes = {file: file_hash(file) for file in python_files}
+    tree_hash = program_hash(hashes)
+
+    # 📌 Soubory, jejichž obsah se od posledního běhu změnil
+    changed = [
+        file for file in python_files
+        if cache["files"].get(file, {}).get("hash") != hashes[file]
+    ]
+    cache.setdefault("pylint", {})
+    whole_program = {
+        tool: None if cache[tool].get("hash") == tree_hash else python_files
+        for tool in ("vulture", "pylint")
+    }
+
+    with ProcessPoolExecutor() as pool:
+        # 🔍 VULTURE + 🧠 PYLINT – celý program v jednom běhu; změna kteréhokoli souboru
+        # zneplatní výsledek (závislosti mezi moduly)
+        whole_futures = {
+            tool: pool.submit(run_tool, tool, files)
+            for tool, files in whole_program.items() if files is not None
+        }
+
+        # 🧼 FLAKE8 – jen změněné soubory, každý samostatně
+        flake8_futures = {file: pool.submit(run_tool, "flake8", [file]) for file in changed}
+
+        for file in changed:
+            cache["files"][file] = {"hash": hashes[file], "flake8": flake8_futures[file].result()}
+        for tool, future in whole_futures.items():
+            cache[tool] = {"hash": tree_hash, "output": future.result()}
+
+    cache["files"] = {file: cache["files"][file] for file in python_files}
+    save_cache(cache)
+
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M")
     report_name = os.path.join("audit", f"audit_report_{timestamp}.txt")
 
     with open(report_name, "w", encoding="utf-8") as report:
         # 🔍 VULTURE
-        vulture_cmd = f"vulture {' '.join(python_files)}"
-        vulture_output = os.popen(vulture_cmd).read()
-        vulture_output = filter_vulture_output(vulture_output)
+        vulture_output = filter_vulture_output(cache["vulture"]["output"])
         write_section(report, "🔍 VULTURE — nevyužitý kód", vulture_output)
 
         # 🧼 FLAKE8
-        flake8_cmd = f"flake8 {' '.join(python_files)}"
-        flake8_output = os.popen(flake8_cmd).read()
+        flake8_output = "".join(cache["files"][file]["flake8"] for file in python_files)
         write_section(report, "🧼 FLAKE8 — styl a chyby", flake8_output)
 
         # 🧠 PYLINT
-        pylint_output = ""
-        for file in python_files:
-            pylint_cmd = f"pylint {file}"
-            pylint_output += f"\n📄 {file}\n"
-            pylint_output += os.popen(pylint_cmd).read()
-        write_section(report, "🧠 PYLINT — hloubková analýza", pylint_output)
+        write_section(report, "🧠 PYLINT — hloubková analýza", cache["pylint"]["output"])
+
+        # ⏱️ VÝKON – až po doběhnutí analyzátorů, aby neovlivnily měření
+        regressed = False
+        if bench:
+            bench_output, regressed = run_benchmark_section(threshold_pct)
+            write_section(report, "⏱️ VÝKON — benchmark a regrese", bench_output)
 
-    print(f"✅ Audit dokončen. Výsledky najdeš v {report_name}")
+    if regressed:
+        print("❌ Benchmark hlásí výkonnostní regresi nebo chybí baseline, viz report.")
+    rerun = [tool for tool, files in whole_program.items() if files is not None]
+    print(f"✅ Audit dokončen (flake8: {len(changed)}/{len(python_files)} souborů znovu, "
+          f"celý program znovu: {', '.join(rerun) or 'nic'}). Výsledky najdeš v {report_name}")
+    return not regressed
 
 
 # ▶️ Spusť audit
 if __name__ == "__main__":
-    run_audit()
+    parser = argparse.ArgumentParser(description="Audit kvality kódu (Vulture, Flake8, Pylint).")
+    parser.add_argument("--no-cache", action="store_true", help="analyzovat všechny soubory znovu")
+    parser.add_argument("--no-bench", action="store_true", help="vynechat výkonnostní benchmark")
+    parser.add_argument("--threshold", type=float, help="práh regrese v procentech")
+    args = parser.parse_args()
+    passed = run_audit(use_cache=not args.no_cache, bench=not args.no_bench,
+                       threshold_pct=args.threshold)
+    sys.exit(0 if passed else 1)
@@ -0,0 +1,324 @@
+"""
+Výkonnostní benchmark pro audit (regresní brána před vydáním .exe).
+
+Spouští pevný scénář nad falešným prostředím (BarTender, spooler a COM jsou
+nahrazeny rychlými fake moduly, soubory leží v dočasné složce):
+
+    - start aplikace až po sestavení přihlašovacího okna (samostatný proces)
+    - alokace Pythonu během animace splash screenu
+    - ověření hesla (první dekódování souboru a opakované přihlášení z cache)
+    - 100 skenů přes celý tiskový pipeline (PrintService.print_job)
+
+Výsledek vypíše jako JSON na stdout. Porovnání s baseline provádí audit.py.
+
+Bash: python audit/benchmark.py
+      python audit/benchmark.py --update-baseline   (uloží nové hodnoty jako baseline)
+"""
+
+import os
+import sys
+import json
+import time
+import types
+import argparse
+import tempfile
+import statistics
+import subprocess
+import tracemalloc
+from pathlib import Path
+
+# 🔍 Parametry scénáře
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+BASELINE_PATH = PROJECT_ROOT / "audit" / "benchmark_baseline.json"
+DEFAULT_THRESHOLD_PCT = 25
+SCANS = 100
+LOGIN_USERS = 500
+LOGIN_LOOKUPS = 200
+PRINTERS = ("BENCH_A", "BENCH_B", "BENCH_C")
+
+
+# 🧪 Falešné Windows moduly (pywin32) – instalují se před importem aplikace
+def install_fakes():
+    class FakeError(Exception):
+        pass
+
+    class FakeFormat:
+        Printer = ""
+
+        def Save(self):  # noqa: N802 – jméno dle COM API
+            pass
+
+        def Close(self, _mode):  # noqa: N802
+            pass
+
+    class FakeFormats:
+        def Open(self, _path, _close, _printer):  # noqa: N802
+            return FakeFormat()
+
+    class FakeBarTender:
+        Visible = False
+        ProcessId = 0
+        Formats = FakeFormats()
+
+        def Quit(self, _mode):  # noqa: N802
+            pass
+
+    pywintypes = types.ModuleType("pywintypes")
+    pywintypes.error = FakeError
+    pywintypes.com_error = FakeError
+
+    win32print = types.ModuleType("win32print")
+    for i, name in enumerate((
+            "PRINTER_STATUS_OFFLINE", "PRINTER_STATUS_ERROR", "PRINTER_STATUS_NOT_AVAILABLE",
+            "PRINTER_STATUS_PAPER_OUT", "PRINTER_STATUS_PAPER_JAM", "PRINTER_STATUS_DOOR_OPEN",
+            "PRINTER_ATTRIBUTE_WORK_OFFLINE")):
+        setattr(win32print, name, 1 << i)
+    win32print.EnumPrinters = lambda _level: [(0, "", name, "") for name in PRINTERS]
+    win32print.OpenPrinter = lambda name: name
+    win32print.GetPrinter = lambda _handle, _level: {"Attributes": 0, "Status": 0, "cJobs": 0}
+    win32print.ClosePrinter = lambda _handle: None
+
+    win32com = types.ModuleType("win32com")
+    win32com_client = types.ModuleType("win32com.client")
+    win32com_client.Dispatch = lambda _name: FakeBarTender()
+    win32com.client = win32com_client
+
+    pythoncom = types.ModuleType("pythoncom")
+    pythoncom.CoInitialize = lambda: None
+
+    modules = {
+        "pywintypes": pywintypes,
+        "win32print": win32print,
+        "win32com": win32com,
+        "win32com.client": win32com_client,
+        "pythoncom": pythoncom,
+    }
+    for name in ("win32api", "win32con", "win32event", "win32gui", "win32process"):
+        modules[name] = types.ModuleType(name)
+    sys.modules.update(modules)
+
+
+# 📦 Dočasné prostředí (config.ini, šablony, přihlašovací soubor)
+def encode_login_line(fields: list[str]) -> str:
+    data = "\x15".join(fields).encode("windows-1250")
+    int_xor = len(data) % 32
+    encoded = bytearray(len(data))
+    for i, byte in enumerate(data):
+        encoded[i] = byte ^ (int_xor ^ 0x6)
+        int_xor = (int_xor + 5) % 32
+    return encoded.hex()
+
+
+def prepare_environment(root: Path):
+    (root / "labels").mkdir()
+    (root / "orders").mkdir()
+    (root / "logs").mkdir()
+    for name in ("a.btw", "b.btw"):
+        (root / "labels" / name).write_bytes(b"\0" * 64 * 1024)
+    (root / "bartend.exe").write_bytes(b"")
+
+    with (root / "szv_login.txt").open("w", encoding="utf-8") as f:
+        for i in range(LOGIN_USERS):
+            fields = [f"badge{i:04d}", "x", f"Prijmeni{i}", f"Jmeno{i}", f"P{i % 100:02d}"]
+            f.write(encode_login_line(fields) + "\n")
+
+    (root / "config.ini").write_text(f"""[Window]
+title = Benchmark
+
+[Paths]
+szv_input_file = {root / "szv_login.txt"}
+orders_path = {root / "orders"}
+bartender_path = {root / "bartend.exe"}
+
+[Labels]
+label01 = {root / "labels" / "a.btw"}|BENCH_A,BENCH_B|1
+label02 = {root / "labels" / "b.btw"}|BENCH_C|2
+
+[Printing]
+retries = 0
+pool_strategy = round_robin
+
+[Cache]
+templates = true
+directory = cache/templates
+
+[Journal]
+spool_dir = spool
+sync_interval = 1
+""", encoding="utf-8")
+
+    # 💡 ResourceResolver odvozuje config.ini a logs/ od sys.argv[0]
+    sys.argv[0] = str(root / "benchmark.py")
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+# ⏱️ Scénáře
+def bench_print_pipeline() -> dict:
+    import utils.print_service as print_service_module  # pylint: disable=import-outside-toplevel
+    from models.print_job import PrintJob  # pylint: disable=import-outside-toplevel
+
+    service = print_service_module.PrintService(print_service_module.ConfigReader())
+    service.bartender_utils.print_label = lambda _path, _printer, _copies: True  # 🧪 fake tisk
+
+    durations = []
+    try:
+        for i in range(SCANS):
+            start = time.perf_counter()
+            service.print_job(PrintJob(serial=f"SN{i:06d}", prefix="PB", source="benchmark"))
+            durations.append((time.perf_counter() - start) * 1000)
+    finally:
+        service.close()
+
+    return {
+        "print_scan_mean_ms": statistics.fmean(durations),
+        "print_scan_p95_ms": sorted(durations)[int(len(durations) * 0.95) - 1],
+        "print_total_ms": sum(durations),
+    }
+
+
+def bench_login() -> dict:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        # pylint: disable=import-outside-toplevel
+        from PyQt6.QtWidgets import QApplication
+        from utils.login_services import LoginServices
+    except ImportError as e:
+        return {"skipped_login": str(e)}
+
+    # 💡 Messenger v UserModel vytváří QPixmap – bez QApplication Qt proces ukončí
+    app = QApplication.instance() or QApplication([])  # noqa: F841 – musí žít po celý běh
+    services = LoginServices()
+    start = time.perf_counter()
+    services.check_login("badge0000")
+    cold = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for i in range(LOGIN_LOOKUPS):
+        services.check_login(f"badge{i % LOGIN_USERS:04d}")
+    warm = (time.perf_counter() - start) * 1000 / LOGIN_LOOKUPS
+
+    return {"login_cold_ms": cold, "login_warm_ms": warm}
+
+
+def startup_probe():
+    """Běží v samostatném procesu: QApplication → styl → assety → LoginWindow → splash."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    # pylint: disable=import-outside-toplevel
+    from PyQt6.QtWidgets import QApplication
+    from utils import asset_cache
+    from views.login_window import LoginWindow
+    from views.splash_screen import CustomSplash, STEPS
+
+    app = QApplication([])
+    app.setStyleSheet(asset_cache.stylesheet())
+    asset_cache.warm_up()
+    login_window = LoginWindow()
+    app.processEvents()
+    ready_ms = (time.time() - float(os.environ["BENCH_T0"])) * 1000
+
+    splash = CustomSplash(login_window)
+    splash.timer.stop()  # 💡 snímky pouštíme ručně, bez čekání na časovač
+    splash.start()
+    tracemalloc.start()
+    for _ in range(STEPS):
+        splash.handle_timer()
+        app.processEvents()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(json.dumps({"startup_login_window_ms": ready_ms, "splash_alloc_kib": peak / 1024}))
+
+
+def bench_startup(root: Path) -> dict:
+    env = dict(os.environ, BENCH_T0=str(time.time()), BENCH_ROOT=str(root))
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, __file__, "--startup-probe"],
+        capture_output=True, text=True, encoding="utf-8", env=env
+    )
+    total = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        return {"skipped_startup": result.stderr.strip().splitlines()[-1:]}
+    metrics = json.loads(result.stdout.strip().splitlines()[-1])
+    metrics["startup_process_ms"] = total
+    return metrics
+
+
+def run_benchmark() -> dict:
+    with tempfile.TemporaryDirectory(prefix="printsinglesn_bench_") as tmp:
+        root = Path(tmp)
+        prepare_environment(root)
+        install_fakes()
+
+        metrics = {}
+        metrics.update(bench_startup(root))
+        metrics.update(bench_login())
+        metrics.update(bench_print_pipeline())
+        return {key: round(value, 3) if isinstance(value, float) else value
+                for key, value in metrics.items()}
+
+
+# 📊 Porovnání s baseline (volá audit.py)
+def load_baseline(path=BASELINE_PATH) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def compare(metrics: dict, baseline: dict, threshold_pct: float | None = None) -> tuple[str, bool]:
+    threshold = threshold_pct if threshold_pct is not None else baseline.get(
+        "threshold_pct", DEFAULT_THRESHOLD_PCT
+    )
+    reference = baseline.get("metrics", {})
+    if not reference:
+        # 💡 bez baseline by brána nikdy neselhala
+        return (f"❌ Chybí baseline ({BASELINE_PATH.name}). Změř ji na referenčním PC linky:\n"
+                "   python audit/benchmark.py --update-baseline"), True
+    lines = [f"Práh regrese: +{threshold} % oproti baseline ({BASELINE_PATH.name})", ""]
+    regressed = False
+
+    for key, value in metrics.items():
+        if not isinstance(value, (int, float)):
+            lines.append(f"⚠️ {key}: {value}")
+            continue
+        base = reference.get(key)
+        if not base:
+            lines.append(f"   {key:<26} {value:>10.3f}   (bez baseline)")
+            continue
+        change = (value - base) / base * 100
+        flag = "❌" if change > threshold else "✅"
+        regressed |= change > threshold
+        lines.append(f"{flag} {key:<26} {value:>10.3f}   baseline {base:>10.3f}   {change:+6.1f} %")
+
+    lines.append("")
+    lines.append("❌ Zjištěna výkonnostní regrese!" if regressed else "✅ Bez výkonnostní regrese.")
+    return "\n".join(lines), regressed
+
+
+# ▶️ Spusť benchmark
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Výkonnostní benchmark PrintSingleSN.")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="uložit výsledek jako baseline")
+    parser.add_argument("--startup-probe", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.startup_probe:
+        install_fakes()
+        sys.argv[0] = str(Path(os.environ["BENCH_ROOT"]) / "benchmark.py")
+        sys.path.insert(0, str(PROJECT_ROOT))
+        startup_probe()
+        sys.exit(0)
+
+    results = run_benchmark()
+    print(json.dumps(results, ensure_ascii=False))
+
+    if args.update_baseline:
+        baseline = load_baseline()
+        baseline = {"threshold_pct": baseline.get("threshold_pct", DEFAULT_THRESHOLD_PCT),
+                    "metrics": {k: v for k, v in results.items() if isinstance(v, (int, float))}}
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"✅ Baseline uložena do {BASELINE_PATH}")
@@ -0,0 +1,302 @@
+"""
+Soak test celé směny – hledá únik paměti a zpomalování v čase.
+
+Nad falešným prostředím z benchmark.py (BarTender, spooler a COM jsou fake, soubory
+v dočasné složce) pohání skutečné kontrolery:
+
+    - desítky cyklů přihlášení → skeny → odhlášení přes LoginController/PrintController
+      (tlačítka, vstupní pole, toasty, fronta úloh, journal, historie tisku)
+    - tisíce skenů přes print_button_click
+
+Průběžně vzorkuje tracemalloc (aktuální halda), RSS procesu, počet Qt widgetů
+a oken, počet handlerů loggerů a latenci skenů. Na konci porovná první a poslední
+čtvrtinu běhu a skončí kódem 1, pokud růst nebo drift překročí prahy.
+
+Bez PyQt6 (např. Linux CI) pohání jen PrintService (přihlášení bez dekódování SZV)
+a Qt metriky vynechá.
+
+Bash: python audit/soak.py                          (5000 skenů, 40 přihlášení)
+      python audit/soak.py --scans 500 --logins 5   (rychlá kontrola)
+      python audit/soak.py --json soak.json         (vzorky pro graf)
+"""
+
+import gc
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import tracemalloc
+from pathlib import Path
+
+import benchmark
+
+# 🔍 Výchozí prahy
+DEFAULT_THRESHOLDS = {
+    "heap_growth_mib": 16.0,       # růst haldy Pythonu mezi první a poslední čtvrtinou
+    "rss_growth_mib": 64.0,        # růst RSS procesu
+    "latency_drift_pct": 50.0,     # zpomalení mediánu latence skenu
+    "qt_widget_growth": 50,        # přírůstek živých widgetů
+    "log_handler_growth": 0,       # přírůstek handlerů loggerů
+}
+
+
+# 📏 Měření procesu
+def rss_mib() -> float | None:
+    try:
+        import psutil  # pylint: disable=import-outside-toplevel
+        return psutil.Process().memory_info().rss / 2**20
+    except ImportError:
+        pass
+    if sys.platform.startswith("linux"):
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    if sys.platform == "win32":
+        import ctypes  # pylint: disable=import-outside-toplevel
+        from ctypes import wintypes  # pylint: disable=import-outside-toplevel
+
+        class Counters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage",
+                    "QuotaPagedPoolUsage", "QuotaPeakNonPagedPoolUsage",
+                    "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")
+            ]
+
+        counters = Counters()
+        counters.cb = ctypes.sizeof(counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(
+            ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb
+        )
+        return counters.WorkingSetSize / 2**20
+    return None
+
+
+def log_handler_count() -> int:
+    import logging  # pylint: disable=import-outside-toplevel
+    loggers = [logging.getLogger()] + [
+        logger for logger in logging.Logger.manager.loggerDict.values()
+        if isinstance(logger, logging.Logger)
+    ]
+    return sum(len(logger.handlers) for logger in loggers)
+
+
+# 🎛️ Řízení aplikace
+class QtDriver:
+    """Skutečné okno přihlášení + kontrolery v offscreen QApplication."""
+
+    def __init__(self):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        # pylint: disable=import-outside-toplevel
+        from PyQt6.QtWidgets import QApplication
+        from utils import asset_cache
+        from utils.config_reader import ConfigReader
+        from utils.serial_validator import SerialValidator
+        from utils.window_stack import WindowStackManager
+        from views.login_window import LoginWindow
+        from controllers.login_controller import LoginController
+
+        self.app = QApplication.instance() or QApplication([])
+        self.app.setStyleSheet(asset_cache.stylesheet())
+        asset_cache.warm_up()
+        self.window_stack = WindowStackManager()
+        self.login_window = LoginWindow()
+        self.login_controller = LoginController(
+            self.login_window,
+            self.window_stack,
+            SerialValidator.from_config(ConfigReader())  # 💡 jako AppLauncher.initialize
+        )
+        self.window_stack.push(self.login_window)
+
+    def login(self, badge: str):
+        self.login_window.password_input.setText(badge)
+        self.login_controller.handle_login()
+        controller = self.login_controller.print_controller
+        if controller is None or controller.session is None:
+            raise RuntimeError(f"Přihlášení '{badge}' selhalo")
+        # 🧪 fake tisk – jediná náhrada v celém pipeline
+        if controller.print_service:
+            controller.print_service.bartender_utils.print_label = lambda _p, _t, _c: True
+        self.app.processEvents()
+
+    def scan(self, serial: str):
+        controller = self.login_controller.print_controller
+        controller.print_window.serial_number_input.setText(serial)
+        controller.print_button_click()
+        controller.worker.wait_idle(30)  # 💡 tiskne tiskové vlákno, měříme až dotištěný sken
+        controller.print_window.restore_inputs()  # 💡 nečekáme 3 s na časovač
+        self.app.processEvents()
+
+    def logout(self):
+        self.login_controller.print_controller.handle_back()
+        self.app.processEvents()
+
+    def qt_counts(self) -> dict:
+        from PyQt6.QtWidgets import QApplication  # pylint: disable=import-outside-toplevel
+        return {
+            "qt_widgets": len(QApplication.allWidgets()),
+            "qt_windows": len(QApplication.allWindows()),
+        }
+
+    def close(self):
+        controller = self.login_controller.print_controller
+        if controller:
+            controller.stop_inputs()
+            controller.close_service()
+        self.app.processEvents()
+
+
+class HeadlessDriver:
+    """Bez Qt: LoginServices + PrintService, stejný tiskový pipeline jako daemon."""
+
+    def __init__(self):
+        # pylint: disable=import-outside-toplevel
+        from utils.config_reader import ConfigReader
+        from utils.print_service import PrintService
+        from models.print_job import PrintJob
+
+        self.job_type = PrintJob
+        try:
+            from utils.login_services import LoginServices
+            self.services = LoginServices()
+        except ImportError:
+            self.services = None  # 💡 SzvDecrypt hlásí chyby přes Messenger (Qt)
+        self.service = PrintService(ConfigReader())
+        self.service.bartender_utils.print_label = lambda _p, _t, _c: True  # 🧪 fake tisk
+        self.session = None
+
+    def login(self, badge: str):
+        if self.services is None:
+            from models.user_info import UserInfo  # pylint: disable=import-outside-toplevel
+            from models.user_session import UserSession  # pylint: disable=import-outside-toplevel
+            self.session = UserSession(UserInfo("Soak", badge, "SK"))
+            return
+        self.session = self.services.check_login(badge)
+        if self.session is None:
+            raise RuntimeError(f"Přihlášení '{badge}' selhalo")
+
+    def scan(self, serial: str):
+        self.session.touch()
+        self.service.print_job(
+            self.job_type(serial=serial, prefix=self.session.prefix, source="soak")
+        )
+
+    def logout(self):
+        self.session = None
+
+    @staticmethod
+    def qt_counts() -> dict:
+        return {}
+
+    def close(self):
+        self.service.close()
+
+
+def create_driver():
+    try:
+        return QtDriver()
+    except ImportError as e:
+        print(f"⚠️ PyQt6 není k dispozici ({e}) – běží jen tisková služba bez Qt metrik.")
+        return HeadlessDriver()
+
+
+# 📊 Vzorkování a vyhodnocení
+def sample(driver, started: float, scans_done: int, latencies: list[float]) -> dict:
+    gc.collect()
+    heap, _ = tracemalloc.get_traced_memory()
+    return {
+        "scans": scans_done,
+        "time_s": round(time.perf_counter() - started, 2),
+        "heap_mib": round(heap / 2**20, 3),
+        "rss_mib": round(rss_mib() or 0, 2),
+        "latency_median_ms": round(statistics.median(latencies), 3) if latencies else 0,
+        "log_handlers": log_handler_count(),
+        **driver.qt_counts(),
+    }
+
+
+def evaluate(samples: list[dict], thresholds: dict) -> tuple[list[str], bool]:
+    quarter = max(1, len(samples) // 4)
+    first, last = samples[:quarter], samples[-quarter:]
+
+    def mean(rows, key):
+        return statistics.fmean(row.get(key, 0) for row in rows)
+
+    checks = [
+        ("heap_growth_mib", mean(last, "heap_mib") - mean(first, "heap_mib"), "MiB"),
+        ("rss_growth_mib", mean(last, "rss_mib") - mean(first, "rss_mib"), "MiB"),
+        ("log_handler_growth", last[-1]["log_handlers"] - first[0]["log_handlers"], ""),
+    ]
+    base_latency = mean(first, "latency_median_ms")
+    if base_latency:
+        drift = (mean(last, "latency_median_ms") - base_latency) / base_latency * 100
+        checks.append(("latency_drift_pct", drift, "%"))
+    if "qt_widgets" in samples[0]:
+        checks.append(("qt_widget_growth", last[-1]["qt_widgets"] - first[0]["qt_widgets"], ""))
+
+    lines, failed = [], False
+    for key, value, unit in checks:
+        limit = thresholds[key]
+        flag = "❌" if value > limit else "✅"
+        failed |= value > limit
+        lines.append(f"{flag} {key:<20} {value:>10.2f} {unit:<3} (práh {limit})")
+    return lines, failed
+
+
+def run_soak(scans: int, logins: int, sample_every: int) -> list[dict]:
+    driver = create_driver()
+    samples, latencies = [], []
+    scans_per_login = max(1, scans // logins)
+    done = 0
+    started = time.perf_counter()
+    try:
+        for cycle in range(logins):
+            driver.login(f"badge{cycle % benchmark.LOGIN_USERS:04d}")
+            for _ in range(scans_per_login):
+                start = time.perf_counter()
+                driver.scan(f"SOAK{done:08d}")
+                latencies.append((time.perf_counter() - start) * 1000)
+                done += 1
+                if done % sample_every == 0:
+                    samples.append(sample(driver, started, done, latencies[-sample_every:]))
+            driver.logout()
+        if done % sample_every:
+            samples.append(sample(driver, started, done, latencies[-sample_every:]))
+    finally:
+        driver.close()
+    return samples
+
+
+# ▶️ Spusť soak test
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Soak test PrintSingleSN (paměť a latence v čase)."
+    )
+    parser.add_argument("--scans", type=int, default=5000, help="celkový počet skenů")
+    parser.add_argument("--logins", type=int, default=40, help="počet cyklů přihlášení/odhlášení")
+    parser.add_argument("--sample-every", type=int, default=100, help="vzorek po N skenech")
+    parser.add_argument("--json", help="uložit vzorky do souboru JSON")
+    for name, value in DEFAULT_THRESHOLDS.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=float, default=value,
+                            help=f"práh (výchozí {value})")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="printsinglesn_soak_") as tmp:
+        benchmark.prepare_environment(Path(tmp))
+        benchmark.install_fakes()
+        tracemalloc.start()
+        results = run_soak(args.scans, args.logins, args.sample_every)
+        tracemalloc.stop()
+
+    for row in results:
+        print(json.dumps(row, ensure_ascii=False))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=1)
+
+    report, soak_failed = evaluate(results, {k: getattr(args, k) for k in DEFAULT_THRESHOLDS})
+    print("\n".join(["", f"Soak: {results[-1]['scans']} skenů, {args.logins} přihlášení", *report]))
+    print("❌ Zjištěn růst nebo drift nad prahem!" if soak_failed else "✅ Bez úniku a driftu.")
+    sys.exit(1 if soak_failed else 0)
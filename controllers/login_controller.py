@@ -3,8 +3,10 @@
 
 Controller for managing user login in the PrintSingleSN application.
 
-Handles password validation, post-authentication transitions, and process cleanup.
+Handles password validation and post-authentication transitions.
+The BarTender engine stays warm across logins (see AppLauncher and ProcessSupervisor).
 Interacts with the LoginWindow UI and launches the PrintController upon successful login.
+The PrintController (and its window) is created on the first login and reused afterwards.
 
 Author: Miloslav Hradecky
 """
@@ -13,19 +15,31 @@ Author: Miloslav Hradecky
 from PyQt6.QtCore import QCoreApplication
 
 # 🧠 First-party (project-specific)
-import models.user_model
 from utils.login_context import LoginContext
 from controllers.print_controller import PrintController
 
 
-class LoginController:
+class LoginController:  # pylint: disable=too-many-instance-attributes
     """Handles login validation and transitions to the work order phase."""
 
-    def __init__(self, login_window, window_stack):
-        """Initializes login logic, UI bindings, and supporting services."""
+    def __init__(self, login_window, window_stack, validator, engine=None, supervisor=None):
+        """
+        Initializes login logic, UI bindings, and supporting services.
+
+        Args:
+            login_window (LoginWindow): The login window.
+            window_stack (WindowStackManager): Application window stack.
+            validator (SerialValidator): [Validation] rules compiled at startup.
+            engine (BartenderEngine | None): App-owned BarTender engine (local mode).
+            supervisor (ProcessSupervisor | None): Supervisor of the engine (diagnostics).
+        """
         self.login_window = login_window
         self.window_stack = window_stack
-        self.value_prefix = None
+        self.validator = validator
+        self.engine = engine
+        self.supervisor = supervisor
+        self.session = None
+        self.print_controller = None
         self.context = LoginContext(login_window)
 
         # 📌 Linking the button to the method
@@ -38,9 +52,9 @@ class LoginController:
         self.login_window.clear_password()
 
         try:
-            if self.context.services.check_login(password):
-                self.value_prefix = models.user_model.get_value_prefix()
-                self.context.services.kill_bartender_processes()
+            session = self.context.services.check_login(password)
+            if session:
+                self.session = session
                 self.open_print_window()
             else:
                 self.context.logger.warning("Zadané heslo '%s' není správné!", password)
@@ -52,14 +66,21 @@ class LoginController:
             self.login_window.reset_password_input()
 
     def open_print_window(self):
-        """Instantiates and opens the PrintController window."""
-        print_controller = PrintController(self.window_stack)
-        self.window_stack.push(print_controller.print_window)
+        """Opens the print window, creating the PrintController on the first login only."""
+        if self.print_controller is None:
+            self.print_controller = PrintController(
+                self.window_stack, self.context.services, self.validator, self.engine,
+                self.supervisor
+            )
+        self.window_stack.push(self.print_controller.print_window)
+        self.print_controller.activate(self.session)
 
     def handle_exit(self):
         """Closes the LoginWindow and exits the application."""
         self.context.logger.info("Aplikace byla ukončena uživatelem.")
-        self.context.bartender_utils.kill_processes()
+        if self.print_controller:
+            self.print_controller.stop_inputs()  # 💡 no scan may arrive after the worker stops
+            self.print_controller.close_service()  # 💡 ships the journal backlog
         self.window_stack.mark_exiting()
         self.login_window.close()
         QCoreApplication.instance().quit()
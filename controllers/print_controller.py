@@ -3,9 +3,33 @@
 
 Coordinates the label printing workflow in the PrintSingleSN application.
 
-Handles serial input validation, label preparation, printer assignment,
-and execution of BarTender print commands. Integrates with the PrintWindow UI
-and supports dynamic configuration of label paths, printers, and copy counts.
+Collects scans from all configured input sources (keyboard wedge, serial port,
+TCP, file drop) into one ordered, de-duplicated job queue. A print worker thread
+drains the queue and hands each job either to the in-process PrintService or to
+the local print server daemon, so the GUI thread never waits for a print.
+Integrates with the PrintWindow UI and supports dynamic configuration of label
+paths, printers, and copy counts.
+
+The controller and its window are created once per process and rebound to every
+new login (activate), so switching operators does not rebuild anything. Input
+sources are started with the first login and run until the application exits;
+scans arriving while nobody is logged in are ignored.
+Operators may also switch by scanning their badge into the serial field, and an
+idle session is logged out after [Session] idle_timeout minutes.
+
+The last [Reprint] cache_size printed jobs are kept with their prepared labels
+(LRU), so a damaged label is reprinted with one keystroke (F2), the Dotisk
+button or a scan of the [Reprint] barcode ("REPRINT" or "REPRINT:<serial>").
+
+In btxml data mode, scans waiting in the queue are printed together (up to
+[Printing] batch_size) with one BarTender invocation.
+
+A hidden diagnostics dump (Ctrl+Shift+F12 or the flag file logs/diag.flag)
+writes heap, Qt and queue counters to logs/diag_<timestamp>.json.
+
+Every scan is checked against the [Validation] rules (compiled once by the
+launcher, which exits on an invalid rule) before it enters the queue, so a mis-scan
+never reaches BarTender or the journal.
 
 Designed for audit clarity, modularity, and seamless user interaction.
 
@@ -13,175 +37,431 @@ Author: Miloslav Hradecky
 """
 
 # 🧱 Standard library
-import csv
-import configparser
-from pathlib import Path
-from datetime import datetime
+from collections import OrderedDict, deque
+from dataclasses import replace
 
 # 🧩 Third-party libraries
 from PyQt6.QtCore import QTimer, QCoreApplication
+from PyQt6.QtWidgets import QApplication
 
 # 🧠 First-party (project-specific)
 from utils.logger import get_logger
 from utils.messenger import Messenger
 from utils.config_reader import ConfigReader
-from utils.bartender_utils import BartenderUtils
-from utils.set_printer import set_printer_in_label
-from utils.resource_resolver import ResourceResolver
-
-from models.user_model import get_value_prefix
+from utils.diagnostics import Diagnostics
+from utils.login_services import LoginServices
+from utils.print_server import PrintClient
+from utils.print_service import PrintService
+from utils.job_queue import PrintJobQueue
+from utils.print_worker import PrintWorker
+from utils.serial_validator import SerialValidator
+from utils.input_sources import KeyboardWedgeSource, create_input_sources
+
+from models.print_job import PrintJob
+from models.user_session import UserSession
 from views.print_window import PrintWindow
 
 
-class PrintController:
+class PrintController:  # pylint: disable=too-many-instance-attributes
     """Handles label printing, UI events, and config-driven workflows."""
 
-    def __init__(self, window_stack):
-        """Initializes controller, services, and connects UI buttons."""
+    def __init__(self, window_stack, login_services: LoginServices,
+                 validator: SerialValidator, engine=None, supervisor=None):
+        """
+        Initializes controller, services, and connects UI buttons.
+
+        Args:
+            window_stack (WindowStackManager): Application window stack.
+            login_services (LoginServices): Shared login services (badge switching).
+            validator (SerialValidator): [Validation] rules compiled at startup.
+            engine (BartenderEngine | None): App-owned BarTender engine (local mode).
+            supervisor (ProcessSupervisor | None): Supervisor of the engine; its restart
+                count is included in diagnostics dumps.
+        """
 
         # 📌 Loading the configuration file
-        resolver = ResourceResolver()
-        config_path = resolver.config()
-        self.config = configparser.ConfigParser()
-        self.config.optionxform = str  # 💡 Ensures letter size is maintained
-        self.config.read(config_path)
+        self.config_reader = ConfigReader()
+        mode, host, port = self.config_reader.get_server_settings()
 
         # 📌 Initialization
         self.window_stack = window_stack
+        self.login_services = login_services
+        self.session = None
+        self.badge_switch = self.config_reader.get_bool("Session", "badge_switch", True)
+        self.idle_timeout = self.config_reader.get_int("Session", "idle_timeout", 0) * 60
+        self.validator = validator
         self.print_window = PrintWindow(controller=self)
         self.messenger = Messenger(self.print_window)
-        self.bartender_utils = BartenderUtils(messenger=self.messenger, config=self.config)
+        self.print_service = None
+        self.print_client = None
+        if mode == "client":
+            self.print_client = PrintClient(host, port)  # 💡 the daemon owns the journal spool
+        else:
+            self.print_service = PrintService(
+                self.config_reader, messenger=self.messenger, engine=engine
+            )
         self.logger = get_logger("PrintController")
-        self.config_reader = ConfigReader()
+
+        # 📥 Input sources feeding one job queue
+        self._init_inputs()
+
+        # 🔁 Recently printed jobs for reprint (serial → job with prepared labels)
+        self.prepared_jobs = OrderedDict()
+        self.reprint_cache_size = max(1, self.config_reader.get_int("Reprint", "cache_size", 10))
+        self.reprint_barcode = self.config_reader.get_value(
+            "Reprint", "barcode", fallback="REPRINT"
+        ).strip()
+        self._reprint_requests = deque()
+
+        # 🧵 Print worker: the only thread that prints (waits for the daemon or BarTender)
+        self.worker = PrintWorker(
+            self._process_queue,
+            on_error=lambda _: self.messenger.notify("Tisk se nezdařil, viz log.", "error")
+        )
+
+        self.status_timer = QTimer(self.print_window)
+        self.status_timer.timeout.connect(self.update_status)
+        self.idle_timer = QTimer(self.print_window)
+        self.idle_timer.timeout.connect(self.check_idle)
 
         # 🔗 linking the button to the method
         self.print_window.print_button.clicked.connect(self.print_button_click)
+        self.print_window.reprint_button.clicked.connect(self.reprint_button_click)
+        self.print_window.reprint_shortcut.activated.connect(self.reprint_button_click)
+
+        # 🩺 Diagnostics: hotkey and flag file (polled in the GUI thread, also between logins)
+        self.diagnostics = Diagnostics()
+        self._register_diagnostics()
+        if supervisor:
+            self.diagnostics.register("bartender_restarts", lambda: supervisor.restarts)
+        self.print_window.diagnostics_shortcut.activated.connect(self.diagnostics.dump)
+        self.diagnostics_timer = QTimer(self.print_window)
+        self.diagnostics_timer.timeout.connect(self.diagnostics.check_flag)
+        self.diagnostics_timer.start(2000)
         self.print_window.back_button.clicked.connect(self.handle_back)
         self.print_window.exit_button.clicked.connect(self.handle_exit)
 
+    def _init_inputs(self):
+        """Creates the job queue, the input sources and the batch size (no source is started)."""
+        self.job_queue = PrintJobQueue(
+            dedup_window=self.config_reader.get_int("Inputs", "dedup_window", 5)
+        )
+        self.keyboard_source = KeyboardWedgeSource()
+        self.input_sources = [self.keyboard_source]
+        self.input_sources += create_input_sources(self.config_reader.get_input_settings())
+        self._inputs_started = False
+        self.batch_size = 1
+        if self.print_service and self.print_service.data_mode == "btxml":
+            self.batch_size = max(1, self.config_reader.get_int("Printing", "batch_size", 10))
+
     @property
     def serial_input(self) -> str:
         """Returns cleaned serial number from input field."""
 
         return self.print_window.serial_number_input.text().strip()
 
-    def write_to_label_csv(self, serial_number: str, label_path: str):
-        """Saves serial number, date, and user prefix to label.csv next to the label file."""
-        label_file = Path(label_path)
-        csv_path = label_file.parent / "label.csv"
-        today = datetime.today().strftime("%Y-%m-%d")
-        prefix = get_value_prefix() or "?"  # 💡 fallback in case it is not set
-        row = [serial_number, today, prefix]
+    def enqueue(self, serial: str, source: str) -> bool:
+        """
+        Validates a scanned serial and adds it to the job queue (called from any
+        input source thread). Rejections and keyboard duplicates are reported to the user.
 
-        try:
-            with csv_path.open(mode="w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f, delimiter=";")
-                writer.writerow(["SerialNumber", "Date", "Signature"])  # 💡 header
-                writer.writerow(row)
-        except (OSError, IOError) as e:
-            self.logger.error("Chyba při zápisu do label.csv: %s", str(e))
-            self.messenger.error("Nepodařilo se zapsat do label.csv", "Print Ctrl")
-
-    def write_sn(self, serial_number: str, copies: int, printer: str):
+        Returns:
+            bool: False if the serial was invalid or a duplicate of a pending or recent scan.
         """
-        Appends serial number, timestamp, and user prefix to single.sn file
-        located in the orders_path directory defined in config.ini.
+        session = self.session
+        if session is None:
+            self.logger.warning(
+                "Sken '%s' ze vstupu '%s' bez přihlášení ignorován.",
+                serial,
+                source
+            )
+            return False
+        session.touch()
+        target = self._parse_reprint(serial)
+        if target is not None:
+            self._reprint_requests.append(target)  # 💡 bypasses de-duplication on purpose
+            self.worker.wake()
+            return True
+        if not self._accept_serial(serial, source):
+            return False
+        job = PrintJob(serial=serial, prefix=session.prefix, source=source)
+        accepted = self.job_queue.put(job)
+        if accepted:
+            self.worker.wake()
+            return True
+        self.logger.info("Duplicitní sken '%s' ze vstupu '%s' ignorován.", serial, source)
+        if source == self.keyboard_source.name:
+            self.messenger.notify("Sériové číslo už bylo zadáno.", "warning")
+        return False
+
+    def _accept_serial(self, serial: str, source: str) -> bool:
+        """Checks the serial against the [Validation] rules and reports a rejection."""
+        reason = self.validator.validate(serial)
+        if reason is None:
+            return True
+        self.logger.warning(
+            "Sken '%s' ze vstupu '%s' odmítnut: %s",
+            serial,
+            source,
+            reason
+        )
+        self.messenger.notify(f"Neplatné sériové číslo {serial}: {reason}", "error")
+        return False
+
+    def _parse_reprint(self, serial: str) -> str | None:
         """
-        try:
-            orders_path_raw = self.config.get("Paths", "orders_path")
-            orders_path = Path(orders_path_raw)
-            file_path = orders_path / "single.sn"
+        Recognizes the reprint barcode.
+
+        Returns:
+            str | None: Serial to reprint ("" for the last job), None for an ordinary scan.
+        """
+        if not self.reprint_barcode:
+            return None
+        if serial == self.reprint_barcode:
+            return ""
+        if serial.startswith(self.reprint_barcode + ":"):
+            return serial[len(self.reprint_barcode) + 1:].strip()
+        return None
+
+    def _register_diagnostics(self):
+        """Registers the live counters included in every diagnostics dump."""
+        self.diagnostics.register("qt_widgets", lambda: len(QApplication.allWidgets()))
+        self.diagnostics.register(
+            "qt_top_level_widgets", lambda: len(QApplication.topLevelWidgets())
+        )
+        self.diagnostics.register("window_stack_depth", lambda: len(self.window_stack))
+        self.diagnostics.register("job_queue", lambda: len(self.job_queue))
+        self.diagnostics.register("reprint_requests", lambda: len(self._reprint_requests))
+        self.diagnostics.register("reprint_cache", lambda: len(self.prepared_jobs))
+        self.diagnostics.register(
+            "session", lambda: self.session.prefix if self.session else None
+        )
+        self.diagnostics.register(
+            "session_seconds", lambda: round(self.session.duration()) if self.session else None
+        )
+        if self.print_service:
+            self.diagnostics.register("journal_backlog", lambda: self.print_service.journal.pending)
+
+    def activate(self, session: UserSession):
+        """
+        Rebinds the controller to a new login: starts timers (and inputs once), resets the UI
+        and, in client mode, checks that the print server answers.
+        """
+        self.session = session
+        self.print_window.restore_inputs()
+        if self.idle_timeout:
+            self.idle_timer.start(10_000)
+        if self.print_service:
+            self.update_status()
+            self.status_timer.start(1000)
+        if self.print_client and not self.print_client.ping():
+            # 💡 readiness check: warn at login, not at the first scan
+            self.logger.warning(
+                "Tiskový server %s:%d neodpovídá.",
+                self.print_client.host,
+                self.print_client.port
+            )
+            self.messenger.notify("Tiskový server není dostupný.", "error")
+        if not self._inputs_started:
+            self.start_inputs()
+
+    def start_inputs(self):
+        """Starts all input sources (once per process; they reconnect on their own)."""
+        self._inputs_started = True
+        for source in self.input_sources:
+            try:
+                source.start(self.enqueue)
+            except OSError as e:
+                self.logger.error("Vstup '%s' nelze spustit: %s", source.name, str(e))
+                self.messenger.notify(f"Vstup {source.name} nelze spustit.", "error")
+
+    def stop_inputs(self):
+        """Stops all input sources (at exit) and drops jobs that were not printed yet."""
+        for source in self.input_sources:
+            source.stop()
+        self._inputs_started = False
+        self.drop_pending()
+
+    def drop_pending(self):
+        """Stops the session timers and drops jobs that were not printed yet (logout)."""
+        self.status_timer.stop()
+        self.idle_timer.stop()
+        self._reprint_requests.clear()
+        dropped = self.job_queue.clear()
+        if dropped:
+            self.logger.warning("Zahozeno %d nevytištěných úloh z fronty.", dropped)
+
+    def _process_queue(self):
+        """Prints queued jobs and reprint requests in arrival order (print worker thread)."""
+        batch = self._take_batch()
+        while batch:
+            for job, ok in zip(batch, self._submit_batch(batch)):
+                if ok:
+                    self._remember_job(job)
+                if ok and job.source == self.keyboard_source.name:
+                    self.messenger.notify("Zpracovávám požadavek...")
+            batch = self._take_batch()
+        while self._reprint_requests:
+            self.reprint(self._reprint_requests.popleft())
+
+    def _take_batch(self) -> list[PrintJob]:
+        """Removes up to batch_size waiting jobs from the queue (in arrival order)."""
+        batch = []
+        while len(batch) < self.batch_size:
+            job = self.job_queue.get_nowait()
+            if job is None:
+                break
+            batch.append(job)
+        return batch
+
+    def _submit_batch(self, batch: list[PrintJob]) -> list[bool]:
+        """Prints several jobs with one BarTender invocation, a single job via submit_job."""
+        if len(batch) == 1:
+            return [self._submit_job(batch[0])]
+        return self.print_service.print_batch(batch)
+
+    def _remember_job(self, job: PrintJob):
+        """Stores a printed job in the reprint LRU (the oldest job is evicted)."""
+        self.prepared_jobs.pop(job.serial, None)
+        self.prepared_jobs[job.serial] = job
+        while len(self.prepared_jobs) > self.reprint_cache_size:
+            self.prepared_jobs.popitem(last=False)
+
+    def reprint(self, serial: str = "") -> bool:
+        """
+        Resubmits a recently printed job, flagged as a reprint in the journal.
 
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            prefix = get_value_prefix() or "?"
-            row = f"{timestamp};{serial_number};{copies};{printer};{prefix}"
+        Args:
+            serial (str): Serial of a cached job; empty reprints the last job.
 
-            file_exists = file_path.exists()
+        Returns:
+            bool: True if the job was printed again.
+        """
+        if serial:
+            job = self.prepared_jobs.get(serial)
+        else:
+            job = next(reversed(self.prepared_jobs.values()), None)
+        if job is None:
+            self.logger.warning("Dotisk '%s': úloha není v paměti posledních tisků.", serial)
+            self.messenger.notify("Není co dotisknout.", "warning")
+            return False
+
+        self.prepared_jobs.move_to_end(job.serial)
+        job = replace(job, reprint=True, prepared=list(job.prepared))
+
+        if self.print_client is None:
+            ok = self.print_service.reprint(job)
+        else:
+            ok = self._submit_job(job)  # 💡 the daemon prints it again and journals the flag
+        if ok:
+            self.logger.info("Dotisk SN %s (%s).", job.serial, job.prefix)
+            self.messenger.notify(f"Dotisk SN {job.serial}")
+        return ok
+
+    def reprint_button_click(self):
+        """Queues a reprint of the last job (Dotisk button or F2)."""
+        if self.session is None:
+            return
+        self.session.touch()
+        self.print_window.disable_inputs()
+        self._reprint_requests.append("")
+        self.worker.wake()
+        self.restore_ui()
 
-            with file_path.open(mode="a", encoding="utf-8") as f:
-                if not file_exists:
-                    f.write("date;sn;copy;printer;prefix\n")
-                f.write(row + "\n")
+    def update_status(self):
+        """Shows the number of single.sn records not yet written to the share."""
+        backlog = self.print_service.journal.pending
+        self.print_window.set_status(f"Čeká na zápis do single.sn: {backlog}" if backlog else "")
+
+    def switch_session(self, session: UserSession):
+        """Switches the operator without leaving the print window (badge scan)."""
+        previous = self.session.user if self.session else None
+        self.session = session
+        self.logger.info(
+            "Přepnutí obsluhy: %s → %s %s (%s)",
+            f"{previous.surname} {previous.name}" if previous else "-",
+            session.user.surname,
+            session.user.name,
+            session.prefix
+        )
+        self.messenger.notify(f"Přihlášen: {session.user.name} {session.user.surname}")
+
+    def check_idle(self):
+        """Logs the operator out after the configured idle time."""
+        if self.session and self.session.idle_for() >= self.idle_timeout:
+            self.logger.info("Automatické odhlášení po %d min nečinnosti.", self.idle_timeout // 60)
+            self.handle_back()
+
+    def close_service(self):
+        """Stops the print worker and the in-process print service (local mode only)."""
+        self.worker.stop()
+        if self.print_service:
+            self.print_service.close()
+
+    def _submit_job(self, job: PrintJob) -> bool:
+        """
+        Prints the job in-process or sends it to the print server in client mode.
 
-        except (OSError, IOError, configparser.Error) as e:
-            self.logger.error("Chyba při zápisu do single.sn: %s", str(e))
-            self.messenger.error("Nepodařilo se zapsat do single.sn", "Print Ctrl")
+        Returns:
+            bool: True if the job was printed successfully.
+        """
+        if self.print_client is None:
+            return self.print_service.print_job(job)
+
+        try:
+            response = self.print_client.submit(job)
+        except (OSError, ValueError) as e:
+            self.logger.error("Tiskový server není dostupný: %s", str(e))
+            self.messenger.notify("Tiskový server není dostupný.", "error")
+            return False
+
+        if not response.get("ok"):
+            error = response.get("error", "Neznámá chyba")
+            self.logger.error("Tiskový server odmítl úlohu %s: %s", job.serial, error)
+            self.messenger.notify(f"Tisk se nezdařil: {error}", "error")
+            return False
+        return True
 
     def print_button_click(self):
         """Main workflow triggered by print button."""
         serial = self.serial_input
 
         if not serial:
-            self.messenger.warning("Zadejte sériové číslo.", "Print Ctrl")
+            self.messenger.notify("Zadejte sériové číslo.", "warning")
             return
 
-        self.print_window.disable_inputs()
-        try:
-            labels = self.config_reader.get_all_labels()
-        except ValueError as e:
-            self.logger.error("Chyba v config.ini: %s", str(e))
-            self.messenger.error(f"Chyba v config.ini:\n{str(e)}", "Print Ctrl")
-            self.restore_ui()
+        if self._parse_reprint(serial) is not None:
+            self.keyboard_source.feed(serial)
+            self.print_window.reset_input_focus()
             return
 
-        if not labels:
-            self.logger.warning("V config.ini nejsou definovány žádné etikety.")
-            self.messenger.warning("V config.ini nejsou definovány žádné etikety.", "Print Ctrl")
-            self.restore_ui()
-            return
-
-        for label_key, (label_path, printer, copies) in labels.items():
-            if not label_path:
-                self.logger.warning("Etiketa '%s' nemá definovanou cestu.", label_key)
-                self.messenger.warning(
-                    f"Etiketa {label_key} není definována v config.ini",
-                    "Print Ctrl"
-                )
-                self.restore_ui()
-                return
-
-            success = set_printer_in_label(
-                label_path,
-                printer,
-                logger=self.logger,
-                messenger=self.messenger
-            )
-            if not success:
-                self.logger.warning(
-                    "Tiskárnu '%s' se nepodařilo nastavit v etiketě '%s'",
-                    printer,
-                    label_path
-                )
-                self.messenger.warning(
-                    f"Tiskárnu {printer} se nepodařilo nastavit v etiketě {label_key}",
-                    "Print Ctrl"
-                )
-                self.restore_ui()
+        if self.badge_switch:
+            session = self.login_services.switch_by_badge(serial)
+            if session:
+                self.switch_session(session)
+                self.print_window.reset_input_focus()
                 return
 
-            self.write_to_label_csv(serial, label_path)
-            self.bartender_utils.print_label(label_path, printer, copies)
-            self.logger.info(
-                "Etiketa: '%s' | Tiskárna: '%s' | Serial number: '%s' | Pcs kopií: '%d'",
-                label_key,
-                printer,
-                serial,
-                copies
-            )
-            self.write_sn(serial, copies, printer)
+        # 📌 validation and de-duplication happen once, on the enqueue path
+        if not self.keyboard_source.feed(serial):
+            self.print_window.reset_input_focus()  # 💡 instant reject, no 3 s lockout
+            return
 
-        self.messenger.auto_info_dialog("Zpracovávám požadavek...", timeout_ms=3000)
+        self.print_window.disable_inputs()
         self.restore_ui()
 
     def handle_back(self):
-        """Returns to previous window in the stack."""
-        self.print_window.close()
-        self.window_stack.show_previous()
+        """Returns to the login window; the print window is kept for the next login."""
+        self.session = None
+        self.drop_pending()  # 💡 input sources keep running, scans without login are ignored
+        self.window_stack.pop()
 
     def handle_exit(self):
-        """Closes app and terminates BarTender processes."""
+        """Closes app; the launcher then stops the supervised BarTender engine."""
         self.logger.info("Aplikace byla ukončena uživatelem.")
-        self.bartender_utils.kill_processes()
+        self.stop_inputs()
+        self.close_service()
+        self.diagnostics_timer.stop()
         self.window_stack.mark_exiting()
         self.print_window.close()
         QCoreApplication.instance().quit()
@@ -0,0 +1,35 @@
+"""
+📦 Module: print_job.py
+
+Dataclasses representing a single print request (one scanned serial number)
+and the labels prepared for it (template, printer binding, copies).
+Used by PrintController, PrintService and the print server protocol.
+
+Author: Miloslav Hradecky
+"""
+
+# 🧱 Standard library
+from dataclasses import dataclass, field
+
+
+@dataclass
+class PreparedLabel:
+    """One printed label of a job: local template used, printer it was bound to and copies."""
+    label_key: str
+    label_path: str
+    printer: str
+    copies: int
+
+
+@dataclass
+class PrintJob:
+    """
+    Holds one print request: serial number, signature (user prefix) and input source.
+    After printing, `prepared` lists the labels as printed, so the job can be reprinted
+    without resolving labels and printers again.
+    """
+    serial: str = ""
+    prefix: str = "?"
+    source: str = "keyboard"
+    reprint: bool = False
+    prepared: list[PreparedLabel] = field(default_factory=list, repr=False)
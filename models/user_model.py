@@ -7,6 +7,7 @@ Provides functionality to:
 - Decode login data using XOR-based decryption
 - Verify user passwords against SHA-256 hashes
 - Extract user metadata upon successful login
+- Keep decoded credentials indexed by hash (the file is decoded again only when it changes)
 
 Used by LoginController during authentication.
 
@@ -25,14 +26,6 @@ from utils.logger import get_logger
 from utils.messenger import Messenger
 from utils.resource_resolver import ResourceResolver
 
-# 📌 Global variable holding the value prefix
-VALUE_PREFIX = None
-
-
-def get_value_prefix():
-    """Returns the current global value prefix after successful login."""
-    return VALUE_PREFIX
-
 
 class SzvDecrypt:
     """
@@ -55,7 +48,8 @@ class SzvDecrypt:
         raw_path = self.config.get('Paths', 'szv_input_file')
         self.szv_input_file = self.resolver.resolve(raw_path)
         self.logger = get_logger("SzvDecrypt")
-        self.user_info = UserInfo()
+        self._index = None
+        self._index_mtime = None
 
     @staticmethod
     def decoding_line(encoded_data):
@@ -72,52 +66,86 @@ class SzvDecrypt:
 
         return decoded_data.decode('windows-1250').split('\x15')
 
-    def check_login(self, password):
+    def _load_index(self) -> dict[str, str] | None:
         """
-        Verifies input password against stored credentials.
-        Updates global prefix and user metadata on success.
+        Returns {sha256: decoded line} of the login file.
+        The file is decoded again only when its modification time changes.
         """
-        # pylint: disable=global-statement
-        global VALUE_PREFIX  # ✅ Allows you to modify a global variable
         try:
+            mtime = Path(self.szv_input_file).stat().st_mtime_ns
+        except OSError as e:
+            self.logger.error("Při čtení souboru došlo k chybě: %s", str(e))
+            self.messenger.error(f"{str(e)}", "Přihlášení")
+            return None
+
+        if self._index is None or mtime != self._index_mtime:
             decoded_data = self.decoding_file()
+            if decoded_data is False:
+                return None
+            index = {}
+            for hashed_value, joined_line in decoded_data:
+                index.setdefault(hashed_value, joined_line)  # 💡 first match wins
+            self._index, self._index_mtime = index, mtime
+        return self._index
+
+    def _parse_user(self, joined_line: str) -> UserInfo | None:
+        """Extracts surname, name and prefix from a decoded line."""
+        parts = joined_line.split(',')
+        if len(parts) < 5:
+            self.logger.warning("Řádek neobsahuje dostatek částí: %s", joined_line)
+            return None
+        return UserInfo(
+            surname=parts[2].strip(),
+            name=parts[3].strip(),
+            prefix=parts[4].strip()
+        )
+
+    def check_login(self, password) -> UserInfo | None:
+        """
+        Verifies input password against stored credentials.
+
+        Returns:
+            UserInfo | None: Metadata of the logged-in user, None if the password is invalid.
+        """
+        try:
+            index = self._load_index()
+            if index is None:
+                return None
+
             hashed_password = hashlib.sha256(password.encode()).hexdigest()
-            for decoded_line in decoded_data:  # type: ignore
-                if hashed_password == decoded_line[0]:
-                    if len(decoded_line) > 1:
-                        parts = decoded_line[1].split(',')
-                        if len(parts) >= 4:
-                            self.user_info.surname = parts[2].strip()
-                            self.user_info.name = parts[3].strip()
-                            self.user_info.prefix = parts[4].strip()
-                            # pylint: disable=global-statement
-                            global VALUE_PREFIX
-                            VALUE_PREFIX = self.user_info.prefix  # ✅ Updating a global variable
-                            self.logger.info(
-                                "Logged: %s %s %s",
-                                self.user_info.surname,
-                                self.user_info.name,
-                                self.user_info.prefix
-                            )
-                            return True
-                        self.logger.warning(
-                            "Řádek neobsahuje dostatek částí: %s",
-                            decoded_line[1]
-                        )
-                        return False
-                    self.logger.warning("Řádek neobsahuje další části: %s", decoded_line)
-                    return False
-            self.logger.warning(
-                "Zadané heslo (%s) nebylo nalezeno v souboru (%s).",
-                password,
-                self.szv_input_file
-            )
-            return False
+            joined_line = index.get(hashed_password)
+            if joined_line is None:
+                self.logger.warning(
+                    "Zadané heslo (%s) nebylo nalezeno v souboru (%s).",
+                    password,
+                    self.szv_input_file
+                )
+                return None
+
+            user_info = self._parse_user(joined_line)
+            if user_info:
+                self.logger.info(
+                    "Logged: %s %s %s",
+                    user_info.surname,
+                    user_info.name,
+                    user_info.prefix
+                )
+            return user_info
 
         except (FileNotFoundError, ValueError, IndexError, AttributeError) as e:
             self.logger.error("Neočekávaná chyba při ověřování hesla: %s", str(e))
             self.messenger.error(f"{str(e)}", "Přihlášení")
-            return False
+            return None
+
+    def lookup_cached(self, password) -> UserInfo | None:
+        """
+        Looks a badge up in the already decoded credentials (no file access, no logging).
+        Used for quick operator switching from the print window.
+        """
+        if not self._index:
+            return None
+        joined_line = self._index.get(hashlib.sha256(password.encode()).hexdigest())
+        return self._parse_user(joined_line) if joined_line else None
 
     def decoding_file(self):
         """
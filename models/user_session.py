@@ -0,0 +1,40 @@
+"""
+📦 Module: user_session.py
+
+Dataclass representing the logged-in operator for the print pipeline.
+Created by LoginServices and passed to PrintController on every login or badge switch.
+
+Author: Miloslav Hradecky
+"""
+
+# 🧱 Standard library
+import time
+from dataclasses import dataclass, field
+
+# 🧠 First-party (project-specific)
+from models.user_info import UserInfo
+
+
+@dataclass
+class UserSession:
+    """Holds the logged-in user, the login time and the last activity (monotonic clock)."""
+    user: UserInfo
+    started_at: float = field(default_factory=time.monotonic)
+    last_activity: float = field(default_factory=time.monotonic)
+
+    @property
+    def prefix(self) -> str:
+        """Returns the user prefix written to label.csv and single.sn."""
+        return self.user.prefix or "?"
+
+    def touch(self):
+        """Records operator activity (called from any thread)."""
+        self.last_activity = time.monotonic()
+
+    def duration(self) -> float:
+        """Returns seconds since the login (reported by diagnostics)."""
+        return time.monotonic() - self.started_at
+
+    def idle_for(self) -> float:
+        """Returns seconds since the last activity."""
+        return time.monotonic() - self.last_activity
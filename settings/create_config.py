@@ -22,6 +22,74 @@ config["Labels"] = {
     "label01": "T:/Prikazy/DataTPV/PrintSingleSN/Etikety/50x45_SN.btw|50x45_ZD621|2",
 }
 
+# 🌐 Section: Printers – network addresses of printers used in [Labels] (raw ZPL)
+config["Printers"] = {}
+
+# 🖨️ Section: Printing – readiness probe retries, per-printer circuit breaker,
+# data mode (file | com | btxml)
+config["Printing"] = {
+    "retries": "2",
+    "failure_threshold": "3",
+    "probe_interval": "10",
+    "pool_strategy": "round_robin",
+    "data_mode": "file",
+    "batch_size": "10",
+    "tcp_timeout": "5",
+    "tcp_idle_timeout": "30",
+    "tcp_max_in_flight": "4",
+    "tcp_linger": "2",
+    "tcp_persistent": "",
+}
+
+# 🗂️ Section: Cache – local copies of label templates from the share
+config["Cache"] = {
+    "templates": "true",
+    "directory": "cache/templates",
+    "validate": "mtime",
+    "refresh_interval": "60",
+}
+
+# 🗃️ Section: History – local SQLite print history (lookups, export for older tools)
+config["History"] = {
+    "enabled": "true",
+    "database": "history/print_history.db",
+}
+
+# ✔️ Section: Validation – serial number rules (pattern, length, prefix, check_digit)
+config["Validation"] = {}
+
+# 🖧 Section: Server – local print server daemon (mode = local | client)
+config["Server"] = {
+    "mode": "local",
+    "host": "127.0.0.1",
+    "port": "9150",
+}
+
+# 👤 Section: Session – idle logout in minutes (0 = off), badge switching on the print window
+config["Session"] = {
+    "idle_timeout": "0",
+    "badge_switch": "true",
+}
+
+# 🧾 Section: Journal – write-ahead spool, station shards, partitions (none|month|day)
+config["Journal"] = {
+    "spool_dir": "spool",
+    "sync_interval": "5",
+    "shards": "false",
+    "partition": "none",
+}
+
+# 🔁 Section: Reprint – cached jobs for reprint and the reprint barcode (empty = off)
+config["Reprint"] = {
+    "cache_size": "10",
+    "barcode": "REPRINT",
+}
+
+# 📥 Section: Inputs – additional scanners (keyboard wedge is always active)
+config["Inputs"] = {
+    "dedup_window": "5",
+}
+
 # 🧪 For testing: preview config content
 configfile = StringIO()
 config.write(configfile)
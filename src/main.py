@@ -6,6 +6,9 @@ Responsible for initializing the Qt application, validating configuration,
 enforcing single-instance behavior, applying global styles, and launching
 the splash screen and login window.
 
+With the "--daemon" argument it starts the headless local print server instead
+of the GUI (see utils/print_server.py).
+
 Version:
     1.0.0.0
 
@@ -19,14 +22,23 @@ import sys
 from configparser import ConfigParser
 
 # 🧩 Third-party libraries
+from PyQt6.QtCore import QEventLoop
 from PyQt6.QtWidgets import QApplication
 
 # 🧠 First-party (project-specific)
 from views.login_window import LoginWindow
 from views.splash_screen import CustomSplash
 
+from utils import asset_cache
 from utils.logger import get_logger
 from utils.messenger import Messenger
+from utils.config_reader import ConfigReader
+from utils.diagnostics import Diagnostics
+from utils.bartender_engine import BartenderEngine
+from utils.bartender_utils import BartenderUtils
+from utils.print_server import PrintServer
+from utils.print_service import PrintService
+from utils.serial_validator import SerialValidator
 from utils.system_info import log_system_info
 from utils.path_validation import PathValidator
 from utils.startup_checker import StartupChecker
@@ -37,7 +49,7 @@ from utils.single_instance import SingleInstanceChecker
 from controllers.login_controller import LoginController
 
 
-class AppLauncher:
+class AppLauncher:  # pylint: disable=too-many-instance-attributes
     """
     Orchestrates the startup sequence of the PrintSingleSN application.
     Handles logging, configuration validation, UI setup, and event loop execution.
@@ -57,6 +69,9 @@ class AppLauncher:
         self.startup_checker = StartupChecker()
         self.checker = None
         self.app = None
+        self.engine = None
+        self.supervisor = None
+        self.validator = None
 
     def initialize(self):
         """Prepares the application environment before launch."""
@@ -67,7 +82,10 @@ class AppLauncher:
         self._validate_config_paths()
         self.startup_checker.ensure_logs_dir()
         self.startup_checker.check_config_or_exit()
+        self._compile_validator()
         self._apply_global_stylesheet()
+        asset_cache.warm_up()
+        self._start_bartender_supervisor()
 
     def run(self):
         """Executes the UI launch sequence."""
@@ -98,10 +116,9 @@ class AppLauncher:
 
     def _apply_global_stylesheet(self):
         """Applies the global stylesheet if available."""
-        style_path = self.resolver.resource("views/themes/style.qss")
-        if style_path.exists():
-            with open(style_path, encoding="utf-8") as f:
-                self.app.setStyleSheet(f.read())
+        style = asset_cache.stylesheet()
+        if style:
+            self.app.setStyleSheet(style)
 
     def _validate_config_paths(self):  # noqa: method may use self.logger in future
         """
@@ -120,31 +137,126 @@ class AppLauncher:
             )
             sys.exit(1)
 
+    def _compile_validator(self):
+        """
+        Compiles the [Validation] rules once for the whole session.
+        Logs the invalid rule and exits, so a broken config never reaches the login window.
+        """
+        try:
+            self.validator = SerialValidator.from_config(ConfigReader())
+        except ValueError as e:
+            self.logger.error("Neplatná pravidla validace: %s", e)
+            Messenger(None).error(
+                f"Neplatná pravidla validace: {e}\nAplikace bude ukončena.",
+                "Main"
+            )
+            sys.exit(1)
+
+    def _start_bartender_supervisor(self):
+        """Starts one warm, supervised BarTender engine for the whole session (local mode only)."""
+        mode, _, _ = ConfigReader().get_server_settings()
+        if mode != "local":
+            return  # 💡 in client mode the daemon owns BarTender
+        self.engine = BartenderEngine()
+        self.supervisor = BartenderUtils(self.engine).create_supervisor()
+        self.supervisor.start()
+
     def _launch_ui(self):
         """Displays the splash screen and launches the login window."""
         login_window = LoginWindow()
-        login_controller = LoginController(login_window, self.window_stack)
+        login_controller = LoginController(
+            login_window, self.window_stack, self.validator, self.engine, self.supervisor
+        )
         login_window.controller = login_controller
 
         splash = CustomSplash(login_window)
         _ = Messenger(splash)
+        # 🎭 Block further execution until splash screen closes (without busy-waiting)
+        loop = QEventLoop()
+        splash.finished.connect(loop.quit)
         splash.start()
-
-        # 🎭 Block further execution until splash screen closes
-        while splash.isVisible():
-            self.app.processEvents()
+        loop.exec()
 
         # 🎯 Now show login window
         self.window_stack.push(login_window)
 
     def shutdown(self):
         """Cleans up resources before application exit."""
+        if self.supervisor:
+            self.supervisor.stop()
+        if self.engine:
+            self.engine.close()  # 💡 quits BarTender, nothing is left running
         if self.checker:
             self.checker.release()
 
 
+class DaemonLauncher:  # pylint: disable=too-few-public-methods
+    """
+    Starts the headless print server daemon.
+    Keeps one print engine and one job queue shared by all local clients.
+    """
+
+    def __init__(self, version: str):
+        """
+        Initializes the daemon launcher with application version.
+
+        Args:
+            version (str): Application version string.
+        """
+        self.version = version
+        self.logger = get_logger("Daemon")
+        self.startup_checker = StartupChecker()
+        self.server = None
+        self.supervisor = None
+        self.diagnostics = Diagnostics()
+
+    def run(self):
+        """Starts the print server and blocks until it is interrupted."""
+        log_system_info(self.version)
+        self.startup_checker.ensure_logs_dir()
+        if not self.startup_checker.config_path.exists():
+            self.logger.error("Konfigurační soubor chybí: %s", self.startup_checker.config_path)
+            sys.exit(1)
+
+        config_reader = ConfigReader()
+        _, host, port = config_reader.get_server_settings()
+        try:
+            validator = SerialValidator.from_config(config_reader)
+        except ValueError as e:
+            self.logger.error("Neplatná pravidla validace: %s", e)
+            sys.exit(1)
+        service = PrintService(config_reader)
+        self.supervisor = service.bartender_utils.create_supervisor()
+        self.supervisor.start()
+
+        self.server = PrintServer(
+            service.print_job,
+            host=host,
+            port=port,
+            status=lambda: {"backlog": service.journal.pending},
+            validator=validator.validate
+        )
+        self.diagnostics.register("server_queue", lambda: self.server.queue_depth)
+        self.diagnostics.register("journal_backlog", lambda: service.journal.pending)
+        self.diagnostics.register("bartender_restarts", lambda: self.supervisor.restarts)
+        self.diagnostics.start_flag_watch()
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            self.logger.info("Tiskový server ukončen uživatelem.")
+        finally:
+            self.diagnostics.stop()
+            self.server.stop()
+            self.supervisor.stop()
+            service.close()  # 💡 also quits the engine the service owns
+
+
 def main():
     """Entry point for the PrintSingleSN application."""
+    if "--daemon" in sys.argv[1:]:
+        DaemonLauncher(__version__).run()
+        return
+
     launcher = AppLauncher(__version__)
     launcher.run()
     launcher.shutdown()
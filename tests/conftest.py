@@ -0,0 +1,34 @@
+"""
+📦 Module: conftest.py
+
+Shared pytest setup for the unit tests.
+
+Responsibilities:
+    - Make the project packages (utils, models, ...) importable from any working directory
+    - Redirect logs/ of the tested modules into a temporary directory
+
+Author: Miloslav Hradecky
+"""
+
+# 🧱 Standard library
+import sys
+from pathlib import Path
+
+# 🧩 Third-party libraries
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+@pytest.fixture(autouse=True, scope="session")
+def runtime_dir(tmp_path_factory):
+    """Points ResourceResolver (logs/) at a temporary directory for the whole session."""
+    root = tmp_path_factory.mktemp("runtime")
+    original = sys.argv[0]
+    # 💡 ResourceResolver derives logs/ from sys.argv[0], like the benchmark does
+    sys.argv[0] = str(root / "tests.py")
+    yield root
+    sys.argv[0] = original
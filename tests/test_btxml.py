@@ -0,0 +1,79 @@
+"""
+📦 Module: test_btxml.py
+
+Tests of BTXML script generation and BarTender response parsing.
+
+Author: Miloslav Hradecky
+"""
+
+# 🧱 Standard library
+from pathlib import Path
+
+# 🧩 Third-party libraries
+import pytest
+
+# 🧠 First-party (project-specific)
+from utils.btxml import ScriptEntry, build_script, parse_response
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+NAMES = ["0001_label01", "0001_label02"]
+
+
+def scan_entries() -> list[ScriptEntry]:
+    """Two labels of one scan, the second with a path that needs XML escaping."""
+    return [
+        ScriptEntry(NAMES[0], "C:/labels/50x45_SN.btw", "ZD621_A", 1,
+                    {"SerialNumber": "SN000123", "Signature": "PB"}),
+        ScriptEntry(NAMES[1], "C:/labels/box & pallet.btw", "ZD621_B", 2,
+                    {"SerialNumber": "SN000123", "Date": "18.10.2026"}),
+    ]
+
+
+def test_build_script_matches_golden_file():
+    """Two labels of one scan compile to the committed script."""
+    golden = (FIXTURES / "btxml_scan_two_labels.xml").read_text(encoding="utf-8")
+    assert build_script(scan_entries()) == golden
+
+
+def test_build_script_is_deterministic():
+    """The same entries always give the same script text."""
+    assert build_script(scan_entries()) == build_script(scan_entries())
+
+
+def test_parse_response_without_messages_marks_all_printed():
+    """A response without messages means every command printed."""
+    response = '<XMLScript Version="2.0"><Command Name="0001_label01"/></XMLScript>'
+    assert parse_response(response, NAMES) == {NAMES[0]: None, NAMES[1]: None}
+
+
+def test_parse_response_reports_command_error():
+    """An error message of a command fails only that command."""
+    response = """
+    <XMLScript Version="2.0">
+      <Command Name="0001_label02">
+        <Print>
+          <Messages>
+            <Message ID="3201" Severity="Error"><Text>Printer not found</Text></Message>
+            <Message ID="1000" Severity="Information"><Text>ignored</Text></Message>
+          </Messages>
+        </Print>
+      </Command>
+    </XMLScript>
+    """
+    assert parse_response(response, NAMES) == {NAMES[0]: None, NAMES[1]: "Printer not found"}
+
+
+def test_parse_response_script_error_fails_every_command():
+    """A script-level error fails every command of the script."""
+    response = """
+    <XMLScript Version="2.0">
+      <Messages><Message ID="42" Severity="Fatal"><Text>License</Text></Message></Messages>
+    </XMLScript>
+    """
+    assert parse_response(response, NAMES) == dict.fromkeys(NAMES, "License")
+
+
+def test_parse_response_rejects_malformed_xml():
+    """A response that is not XML raises ValueError."""
+    with pytest.raises(ValueError):
+        parse_response("<XMLScript>", NAMES)
@@ -0,0 +1,102 @@
+"""
+📦 Module: test_job_queue.py
+
+Tests of the de-duplicating print job queue fed by a SimulatedSource.
+
+Author: Miloslav Hradecky
+"""
+
+# 🧠 First-party (project-specific)
+from models.print_job import PrintJob
+from utils.input_sources import SimulatedSource
+from utils.job_queue import PrintJobQueue
+
+
+class FakeClock:  # pylint: disable=too-few-public-methods
+    """Monotonic clock advanced by hand."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def drain(queue: PrintJobQueue) -> list[str]:
+    """Removes all waiting jobs and returns their serials in queue order."""
+    serials = []
+    while (job := queue.get_nowait()) is not None:
+        serials.append(job.serial)
+    return serials
+
+
+def test_keeps_arrival_order():
+    """Jobs leave the queue in the order they arrived."""
+    queue = PrintJobQueue()
+    for serial in ("SN1", "SN2", "SN3"):
+        assert queue.put(PrintJob(serial=serial))
+    assert len(queue) == 3
+    assert drain(queue) == ["SN1", "SN2", "SN3"]
+    assert queue.get_nowait() is None
+
+
+def test_rejects_pending_duplicate():
+    """A serial still waiting in the queue is not queued again."""
+    queue = PrintJobQueue(dedup_window=0)
+    assert queue.put(PrintJob(serial="SN1"))
+    assert not queue.put(PrintJob(serial="SN1", source="tcp"))
+    assert drain(queue) == ["SN1"]
+
+
+def test_rejects_repeat_within_window_after_print():
+    """A printed serial is rejected until the dedupe window passes."""
+    clock = FakeClock()
+    queue = PrintJobQueue(dedup_window=5.0, clock=clock)
+    assert queue.put(PrintJob(serial="SN1"))
+    drain(queue)
+
+    clock.now += 4.9
+    assert not queue.put(PrintJob(serial="SN1"))
+    clock.now += 0.1
+    assert queue.put(PrintJob(serial="SN1"))
+
+
+def test_clear_drops_waiting_jobs_and_pending_serials():
+    """clear() empties the queue and forgets its serials."""
+    queue = PrintJobQueue(dedup_window=0)
+    queue.put(PrintJob(serial="SN1"))
+    queue.put(PrintJob(serial="SN2"))
+    assert queue.clear() == 2
+    assert len(queue) == 0
+    assert queue.put(PrintJob(serial="SN1"))
+
+
+def test_simulated_source_feeds_queue_with_double_reads():
+    """Double reads of a simulated scanner end up queued once."""
+    queue = PrintJobQueue()
+    sources = []
+
+    def submit(serial: str, source: str) -> bool:
+        sources.append(source)
+        return queue.put(PrintJob(serial=serial, source=source))
+
+    scanner = SimulatedSource([" SN1\r\n", "SN1", "", "SN2", "SN1", "SN3"], name="sim")
+    scanner.start(submit)
+    assert scanner.finished.wait(2.0)
+    scanner.stop()
+
+    assert drain(queue) == ["SN1", "SN2", "SN3"]
+    assert set(sources) == {"sim"}
+    assert len(sources) == 5  # 💡 the empty reading is never submitted
+
+
+def test_stopped_source_submits_nothing():
+    """A stopped source does not submit further readings."""
+    queue = PrintJobQueue()
+    scanner = SimulatedSource(["SN1"])
+    scanner.start(lambda serial, source: queue.put(PrintJob(serial=serial, source=source)))
+    assert scanner.finished.wait(2.0)
+    scanner.stop()
+
+    assert not scanner.emit("SN2")
+    assert drain(queue) == ["SN1"]
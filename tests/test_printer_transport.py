@@ -0,0 +1,165 @@
+"""
+📦 Module: test_printer_transport.py
+
+Tests of PrinterConnection against a local TCP server simulating a raw-port printer.
+
+Author: Miloslav Hradecky
+"""
+
+# 🧱 Standard library
+import time
+import socket
+import threading
+
+# 🧩 Third-party libraries
+import pytest
+
+# 🧠 First-party (project-specific)
+from utils.printer_transport import PrinterConnection, PrinterTransport, parse_tcp_target
+
+
+class FakePrinter:
+    """Raw-port server: records the data of every accepted connection."""
+
+    def __init__(self):
+        self._server = socket.create_server(("127.0.0.1", 0))
+        self.address = self._server.getsockname()
+        self.connections = []  # 💡 one bytearray per accepted client
+        self.clients = []
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._accept, daemon=True)
+        self._thread.start()
+
+    def _accept(self):
+        while True:
+            try:
+                client, _ = self._server.accept()
+            except OSError:
+                return
+            received = bytearray()
+            with self._lock:
+                self.connections.append(received)
+                self.clients.append(client)
+            threading.Thread(target=self._read, args=(client, received), daemon=True).start()
+
+    @staticmethod
+    def _read(client: socket.socket, received: bytearray):
+        while True:
+            try:
+                chunk = client.recv(4096)
+            except OSError:
+                return
+            if not chunk:
+                return
+            received.extend(chunk)
+
+    def drop_clients(self):
+        """Closes every accepted connection, as a printer does after a restart."""
+        with self._lock:
+            for client in self.clients:
+                # 💡 shutdown wakes the reader thread blocked in recv; close alone does not
+                client.shutdown(socket.SHUT_RDWR)
+                client.close()
+            self.clients.clear()
+
+    def wait_for(self, expected: list[bytes], timeout: float = 2.0) -> list[bytes]:
+        """Returns the data per connection once it matches expected (or on timeout)."""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                received = [bytes(data) for data in self.connections]
+            if received == expected or time.monotonic() > deadline:
+                return received
+            time.sleep(0.01)
+
+    def close(self):
+        """Stops accepting and drops the accepted connections."""
+        self._server.close()
+        self.drop_clients()
+
+
+@pytest.fixture(name="printer")
+def printer_fixture():
+    """Runs a FakePrinter for one test."""
+    fake = FakePrinter()
+    yield fake
+    fake.close()
+
+
+def test_parse_tcp_target():
+    """tcp:// targets are parsed, spooler printer names are not."""
+    assert parse_tcp_target("tcp://10.0.0.21:9101") == ("10.0.0.21", 9101)
+    assert parse_tcp_target("TCP://zebra") == ("zebra", 9100)
+    assert parse_tcp_target("ZD621") is None
+
+
+def test_burst_reuses_one_connection(printer):
+    """Labels sent within the linger time share one connection."""
+    connection = PrinterConnection(printer.address, timeout=1.0, linger=5.0)
+    try:
+        for label in (b"A", b"B", b"C"):
+            connection.send(label)
+        assert printer.wait_for([b"ABC"]) == [b"ABC"]
+    finally:
+        connection.close()
+
+
+def test_connection_is_closed_after_linger(printer):
+    """An idle connection is closed and reopened for the next job."""
+    connection = PrinterConnection(printer.address, timeout=1.0, linger=0.1)
+    try:
+        connection.send(b"A")
+        time.sleep(0.3)
+        assert connection._sock is None
+        connection.send(b"B")
+        assert printer.wait_for([b"A", b"B"]) == [b"A", b"B"]
+    finally:
+        connection.close()
+
+
+def test_zero_linger_closes_after_every_job(printer):
+    """With zero linger every job gets its own connection."""
+    connection = PrinterConnection(printer.address, timeout=1.0, linger=0)
+    connection.send(b"A")
+    assert connection._sock is None
+    connection.send(b"B")
+    assert printer.wait_for([b"A", b"B"]) == [b"A", b"B"]
+
+
+def test_reconnects_after_printer_dropped_connection(printer):
+    """A connection dropped by the printer is reopened on send."""
+    connection = PrinterConnection(printer.address, timeout=1.0, persistent=True)
+    try:
+        connection.send(b"A")
+        printer.wait_for([b"A"])
+        printer.drop_clients()
+        time.sleep(0.05)
+        connection.send(b"B")
+        assert printer.wait_for([b"A", b"B"]) == [b"A", b"B"]
+    finally:
+        connection.close()
+
+
+def test_probe_does_not_hold_the_port(printer):
+    """The health probe closes its connection at once."""
+    connection = PrinterConnection(printer.address, timeout=1.0)
+    assert connection.probe()
+    assert connection._sock is None
+
+
+def test_unreachable_printer_raises():
+    """A closed port fails the probe and raises on send."""
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        address = server.getsockname()
+    connection = PrinterConnection(address, timeout=0.5)
+    assert not connection.probe()
+    with pytest.raises(OSError):
+        connection.send(b"A")
+
+
+def test_transport_without_spooler_rejects_local_printer():
+    """Spooler printers fail cleanly without pywin32."""
+    transport = PrinterTransport()
+    with pytest.raises(OSError):
+        transport.send("ZD621", b"A")
+    assert transport.status("ZD621") is None
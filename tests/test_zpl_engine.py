@@ -0,0 +1,94 @@
+"""
+📦 Module: test_zpl_engine.py
+
+Tests of ZPL template rendering and template caching.
+
+Author: Miloslav Hradecky
+"""
+
+# 🧱 Standard library
+import os
+
+# 🧠 First-party (project-specific)
+from utils.zpl_engine import ZplEngine, ZplTemplate, is_zpl_template
+
+TEMPLATE = "^XA^CI28^FO20,20^FD{SerialNumber}^FS^FO20,60^FD{Date} {Signature}^FS^XZ"
+DATA = {"SerialNumber": "SN000123", "Date": "18.10.2026", "Signature": "PB"}
+
+
+class RecordingTransport:  # pylint: disable=too-few-public-methods
+    """Transport stub collecting (printer, payload) of every send."""
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, printer: str, payload: bytes):
+        """Records the payload instead of sending it."""
+        self.sent.append((printer, payload))
+
+
+def test_render_substitutes_placeholders():
+    """Placeholders are replaced by the label data."""
+    assert ZplTemplate(TEMPLATE).render(DATA) == (
+        "^XA^CI28^FO20,20^FDSN000123^FS^FO20,60^FD18.10.2026 PB^FS^XZ"
+    )
+
+
+def test_render_keeps_unknown_placeholders():
+    """Placeholders without data stay in the ZPL as they are."""
+    assert ZplTemplate("^XA^FD{SerialNumber} {Batch}^FS^XZ").render({"SerialNumber": "A"}) == (
+        "^XA^FDA {Batch}^FS^XZ"
+    )
+
+
+def test_render_strips_zpl_command_prefixes_from_data():
+    """Scanned data cannot inject ZPL commands."""
+    rendered = ZplTemplate(TEMPLATE).render(dict(DATA, SerialNumber="SN^XZ~JR"))
+    assert "^FDSNXZJR^FS" in rendered
+    assert rendered.count("^XZ") == 1
+
+
+def test_render_adds_quantity_for_copies():
+    """Copies are printed with one ^PQ command."""
+    assert ZplTemplate("^XA^FD{SerialNumber}^FS^XZ").render(DATA, copies=3) == (
+        "^XA^FDSN000123^FS^PQ3^XZ"
+    )
+
+
+def test_render_keeps_quantity_set_by_template():
+    """A ^PQ in the template wins over the copies."""
+    template = ZplTemplate("^XA^FD{SerialNumber}^FS^PQ2^XZ")
+    assert template.render(DATA, copies=5) == "^XA^FDSN000123^FS^PQ2^XZ"
+
+
+def test_is_zpl_template():
+    """Only .zpl labels are printed by the ZPL engine."""
+    assert is_zpl_template("T:/labels/50x45_SN.ZPL")
+    assert not is_zpl_template("T:/labels/50x45_SN.btw")
+
+
+def test_engine_reloads_changed_template(tmp_path):
+    """The parsed template is cached until the file changes."""
+    path = tmp_path / "label.zpl"
+    path.write_text("^XA^FD{SerialNumber}^FS^XZ", encoding="utf-8")
+    transport = RecordingTransport()
+    engine = ZplEngine(transport)
+
+    assert engine.print_label(str(path), "tcp://printer", 1, DATA)
+    assert engine.template(str(path)) is engine.template(str(path))
+
+    path.write_text("^XA^FO0,0^FD{SerialNumber}^FS^XZ", encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert engine.print_label(str(path), "tcp://printer", 1, DATA)
+
+    assert [payload for _, payload in transport.sent] == [
+        b"^XA^FDSN000123^FS^XZ",
+        b"^XA^FO0,0^FDSN000123^FS^XZ",
+    ]
+
+
+def test_engine_reports_missing_template(tmp_path):
+    """A missing template fails the print instead of raising."""
+    engine = ZplEngine(RecordingTransport())
+    assert not engine.print_label(str(tmp_path / "missing.zpl"), "tcp://printer", 1, DATA)
@@ -0,0 +1,88 @@
+"""
+📦 Module: asset_cache.py
+
+Process-wide cache of GUI assets (icons, pre-scaled pixmaps, stylesheet, window title).
+
+Responsibilities:
+    - Load every QIcon and QPixmap once per process
+    - Keep scaled pixmaps keyed by their target size
+    - Warm the cache during startup, so window construction and dialogs do no file I/O
+
+Requires a running QApplication (QPixmap cannot be created before it).
+
+Usage:
+    warm_up()
+    window.setWindowIcon(icon("views/assets/main.ico"))
+    logo.setPixmap(pixmap("views/assets/print.png", 340, 200))
+
+Author: Miloslav Hradecky
+"""
+
+# 🧱 Standard library
+from functools import cache
+
+# 🧩 Third-party libraries
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QIcon, QPixmap
+
+# 🧠 First-party (project-specific)
+from utils.config_reader import ConfigReader
+from utils.resource_resolver import ResourceResolver
+
+MAIN_ICON = "views/assets/main.ico"
+MESSAGE_ICON = "views/assets/message.ico"
+STYLESHEET = "views/themes/style.qss"
+
+# 📌 Pixmaps used by the windows and the splash screen, with their display sizes
+PRELOADED_PIXMAPS = (
+    ("views/assets/user.png", 340, 200),
+    ("views/assets/print.png", 340, 200),
+    ("views/assets/splash_logo.png", 240, 240),
+)
+
+
+@cache
+def icon(relative_path: str) -> QIcon:
+    """Returns the QIcon of a bundled resource (loaded once)."""
+    return QIcon(str(ResourceResolver().resource(relative_path)))
+
+
+@cache
+def _original(relative_path: str) -> QPixmap:
+    """Returns the unscaled QPixmap of a bundled resource (loaded once)."""
+    return QPixmap(str(ResourceResolver().resource(relative_path)))
+
+
+@cache
+def pixmap(relative_path: str, width: int, height: int) -> QPixmap:
+    """Returns a bundled image scaled to fit width × height (scaled once per size)."""
+    return _original(relative_path).scaled(
+        width, height,
+        Qt.AspectRatioMode.KeepAspectRatio,
+        Qt.TransformationMode.SmoothTransformation
+    )
+
+
+@cache
+def stylesheet() -> str:
+    """Returns the global stylesheet (empty if the file is missing)."""
+    style_path = ResourceResolver().resource(STYLESHEET)
+    if not style_path.exists():
+        return ""
+    return style_path.read_text(encoding="utf-8")
+
+
+@cache
+def window_title() -> str:
+    """Returns the window title from config.ini (read once)."""
+    return ConfigReader().get_window_title()
+
+
+def warm_up():
+    """Loads all GUI assets used by the windows, the splash screen and Messenger."""
+    icon(MAIN_ICON)
+    icon(MESSAGE_ICON)
+    for relative_path, width, height in PRELOADED_PIXMAPS:
+        pixmap(relative_path, width, height)
+    stylesheet()
+    window_title()
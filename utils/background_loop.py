@@ -0,0 +1,75 @@
+"""
+📦 Module: background_loop.py
+
+Periodic background thread shared by the services that poll something on their own.
+
+Responsibilities:
+    - Call one action every `interval` seconds in a named daemon thread
+    - Start at most one thread, stop it promptly (also in the middle of a wait)
+    - Let the action wait (e.g. a restart backoff) and still react to stop at once
+
+Used by the printer health probe, the printer status cache, the template cache,
+the diagnostics flag watch and the process supervisor.
+
+Author: Miloslav Hradecky
+"""
+
+# 🧱 Standard library
+import threading
+
+
+class BackgroundLoop:
+    """Daemon thread calling an action periodically until it is stopped."""
+
+    def __init__(self, action, interval: float, name: str, immediate: bool = False):
+        """
+        Initializes the loop without starting it.
+
+        Args:
+            action (Callable[[], None]): Called every interval seconds in the loop thread.
+            interval (float): Seconds between two calls.
+            name (str): Thread name.
+            immediate (bool): Make the first call right after start instead of after
+                one interval.
+        """
+        self.action = action
+        self.interval = interval
+        self.name = name
+        self.immediate = immediate
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        """Returns True while the loop thread is started."""
+        return self._thread is not None
+
+    def start(self):
+        """Starts the loop thread (no-op if it is already running)."""
+        if self._thread is None:
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stops the loop thread after the action in progress."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def wait(self, delay: float) -> bool:
+        """
+        Sleeps inside the action, waking up early on stop.
+
+        Returns:
+            bool: True if the loop is being stopped (the action should return).
+        """
+        return self._stop_event.wait(delay)
+
+    def _run(self):
+        """Loop body: waits one interval, then calls the action, until stopped."""
+        if self.immediate:
+            self.action()
+        while not self._stop_event.wait(self.interval):
+            self.action()
@@ -0,0 +1,199 @@
+"""
+📦 Module: bartender_engine.py
+
+Owns the one BarTender COM engine of the process.
+
+Responsibilities:
+    - Start BarTender through COM once and keep it warm for the whole session
+    - Run every COM call (printing, BTXML scripts, printer assignment) on one
+      dedicated thread, so the engine is never shared across COM apartments
+    - Expose the engine process through a Popen-like handle, so ProcessSupervisor
+      watches and restarts the very instance that prints
+    - Quit the engine on close, so no bartend.exe is left behind
+
+Author: Miloslav Hradecky
+"""
+
+# 🧱 Standard library
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+# 🧩 Third-party libraries
+import pythoncom
+import pywintypes
+import win32api
+import win32con
+import win32event
+import win32process
+import win32com.client
+
+# 🧠 First-party (project-specific)
+from utils.logger import get_logger
+
+BT_DO_NOT_SAVE_CHANGES = 1
+STILL_ACTIVE = 259  # 💡 exit code of a process that has not exited yet
+
+
+class EngineProcess:
+    """Popen-like handle of the engine process (pid, poll, terminate, wait, kill)."""
+
+    def __init__(self, engine: "BartenderEngine", pid: int):
+        """
+        Opens the engine process for supervision.
+
+        Args:
+            engine (BartenderEngine): Engine that started the process.
+            pid (int): Process ID reported by the engine.
+        """
+        self.engine = engine
+        self.pid = pid
+        self._handle = win32api.OpenProcess(
+            win32con.SYNCHRONIZE | win32con.PROCESS_TERMINATE
+            | win32con.PROCESS_QUERY_INFORMATION,
+            False,
+            pid
+        )
+
+    def poll(self) -> int | None:
+        """Returns the exit code, or None while the process is running."""
+        code = win32process.GetExitCodeProcess(self._handle)
+        return None if code == STILL_ACTIVE else code
+
+    def terminate(self):
+        """Asks the engine to quit (queued behind the call in progress)."""
+        self.engine.quit()
+
+    def wait(self, timeout: float | None = None) -> int | None:
+        """
+        Waits for the process to exit.
+
+        Raises:
+            subprocess.TimeoutExpired: If the process is still running after timeout.
+        """
+        millis = win32event.INFINITE if timeout is None else int(timeout * 1000)
+        if win32event.WaitForSingleObject(self._handle, millis) == win32event.WAIT_TIMEOUT:
+            raise subprocess.TimeoutExpired("bartend.exe", timeout)
+        return self.poll()
+
+    def kill(self):
+        """Terminates a hung engine; its pending COM call fails and frees the engine thread."""
+        win32api.TerminateProcess(self._handle, 1)
+
+
+class BartenderEngine:
+    """
+    Runs all BarTender COM calls of the process on one thread and one engine instance.
+    The engine is started on the first call (or by the supervisor) and reused afterwards.
+    """
+
+    def __init__(self, call_timeout: float = 120.0):
+        """
+        Initializes the engine thread without starting BarTender.
+
+        Args:
+            call_timeout (float): Maximum seconds a caller waits for one COM call.
+        """
+        self.call_timeout = call_timeout
+        self.logger = get_logger("BartenderEngine")
+        self._executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="BarTenderEngine",
+            initializer=pythoncom.CoInitialize
+        )
+        self._app = None  # 💡 touched only on the engine thread
+        self._closed = False
+
+    def call(self, operation, *args):
+        """
+        Runs operation(app, *args) on the engine thread.
+
+        Returns:
+            Any: Result of the operation.
+
+        Raises:
+            pywintypes.com_error: If BarTender rejected the call.
+            TimeoutError: If the engine did not answer within call_timeout.
+            RuntimeError: If the engine was closed.
+        """
+        future = self._executor.submit(self._invoke, operation, args)
+        try:
+            return future.result(self.call_timeout)
+        except FutureTimeout as e:
+            raise TimeoutError(f"BarTender neodpověděl do {self.call_timeout:.0f} s") from e
+
+    def launch(self) -> EngineProcess:
+        """
+        Starts the engine unless it is running (launcher of ProcessSupervisor).
+
+        Raises:
+            OSError: If BarTender could not be started through COM.
+        """
+        try:
+            pid = self._executor.submit(self._start).result(self.call_timeout)
+        except (pywintypes.com_error, FutureTimeout, RuntimeError) as e:
+            raise OSError(f"BarTender COM nelze spustit: {e}") from e
+        return EngineProcess(self, pid)
+
+    def quit(self):
+        """Queues Quit of the running engine (no-op after close)."""
+        if not self._closed:
+            self._executor.submit(self._quit)
+
+    def close(self, timeout: float = 10.0):
+        """Quits the engine and stops the engine thread."""
+        if self._closed:
+            return
+        future = self._executor.submit(self._quit)
+        self._closed = True
+        try:
+            future.result(timeout)
+        except FutureTimeout:
+            self.logger.warning("BarTender neukončen do %.0f s.", timeout)
+        self._executor.shutdown(wait=False)
+
+    def _start(self) -> int:
+        """
+        Returns the process ID of the engine, creating a new engine if none is
+        running or the previous one has died (engine thread).
+        """
+        if self._app is not None:
+            try:
+                return self._app.ProcessId
+            except pywintypes.com_error:
+                # 💡 the process is gone (crash, kill) – its COM proxy is useless
+                self.logger.warning("BarTender COM neodpovídá, spouštím nový engine.")
+                self._app = None
+        app = win32com.client.Dispatch("BarTender.Application")
+        app.Visible = False
+        self._app = app
+        pid = app.ProcessId
+        self.logger.info("BarTender COM spuštěn (PID %d).", pid)
+        return pid
+
+    def _invoke(self, operation, args):
+        """Runs one operation on the engine (engine thread)."""
+        self._start()
+        try:
+            return operation(self._app, *args)
+        except pywintypes.com_error:
+            self._drop_if_dead()
+            raise
+
+    def _drop_if_dead(self):
+        """Forgets an engine whose process is gone, so the next call starts a new one."""
+        try:
+            _ = self._app.ProcessId
+        except pywintypes.com_error:
+            self._app = None
+
+    def _quit(self):
+        """Quits the engine without saving any open format (engine thread)."""
+        app, self._app = self._app, None
+        if app is None:
+            return
+        try:
+            app.Quit(BT_DO_NOT_SAVE_CHANGES)
+        except pywintypes.com_error as e:
+            self.logger.warning("BarTender nelze ukončit přes COM: %s", str(e))
+        else:
+            self.logger.info("BarTender COM ukončen.")
@@ -2,103 +2,226 @@
 📦 Module: bartender_utils.py
 
 Provides utility methods for managing BarTender processes (Cmdr.exe, bartend.exe),
-including termination and optional user feedback via Messenger.
+including in-process enumeration, health probing, a supervisor of the warm engine,
+printing and optional user feedback via Messenger.
+
+Every print goes through the one app-owned BartenderEngine: it prints the template
+as saved (data read from label.csv), sets the named substrings directly on the open
+format (COM data mode), or runs one BTXML script holding all labels of a scan or
+batch (btxml data mode).
 
 Author: Miloslav Hradecky
 """
 
 # 🧱 Standard library
-import subprocess
 from pathlib import Path
 
+# 🧩 Third-party libraries
+import pywintypes
+import win32api
+import win32con
+import win32gui
+import win32process
+
 # 🧠 First-party (project-specific)
 from utils.logger import get_logger
+from utils.bartender_engine import BT_DO_NOT_SAVE_CHANGES, BartenderEngine
+from utils.process_supervisor import ProcessSupervisor
+
+PROCESS_NAMES = ("cmdr.exe", "bartend.exe")
+BT_SCRIPT_STRING = 1  # 💡 BtXMLSourceType: the script is passed as text, not as a file path
 
 
 class BartenderUtils:
     """
     Utility class for managing BarTender-related processes.
-    Provides methods to kill, launch, and monitor BarTender components.
+    Provides methods to find, supervise, and print with BarTender components.
     """
-    def __init__(self, messenger=None, config=None):
+    def __init__(self, engine: BartenderEngine, messenger=None):
         """
-        Initializes the utility with optional Messenger for user feedback.
+        Initializes the utility with the shared engine and optional Messenger.
 
         Args:
+            engine (BartenderEngine): The one BarTender engine of the process.
             messenger (Messenger | None): Optional messenger instance.
-            config (ConfigParser | None): Optional config for path resolution.
         """
         self.logger = get_logger("BartenderUtils")
+        self.engine = engine
         self.messenger = messenger
-        self.config = config
 
-    def kill_processes(self):
-        """Terminates all running BarTender instances (Cmdr.exe and bartend.exe)."""
-        try:
-            subprocess.run(
-                "taskkill /f /im cmdr.exe 1>nul 2>nul",
-                shell=True,
-                creationflags=subprocess.CREATE_NO_WINDOW
-            )
-            subprocess.run(
-                "taskkill /f /im bartend.exe 1>nul 2>nul",
-                shell=True,
-                creationflags=subprocess.CREATE_NO_WINDOW
-            )
-        except subprocess.CalledProcessError as e:
-            self.logger.error("Chyba při ukončování BarTender procesů: %s", str(e))
-            if self.messenger:
-                self.messenger.error(
-                    f"Chyba při ukončování BarTender procesů: {str(e)}",
-                    "Bartender Utils"
+    def find_processes(self, names=PROCESS_NAMES) -> list[int]:
+        """
+        Enumerates running BarTender processes in-process (no shell commands).
+
+        Args:
+            names (tuple[str, ...]): Lower-case executable names to look for.
+
+        Returns:
+            list[int]: PIDs of matching processes.
+        """
+        pids = []
+        for pid in win32process.EnumProcesses():
+            try:
+                handle = win32api.OpenProcess(
+                    win32con.PROCESS_QUERY_INFORMATION | win32con.PROCESS_VM_READ, False, pid
+                )
+            except pywintypes.error:
+                continue  # 💡 system or foreign-session process
+            try:
+                image = win32process.GetModuleFileNameEx(handle, None)
+            except pywintypes.error:
+                continue
+            finally:
+                win32api.CloseHandle(handle)
+            if Path(image).name.lower() in names:
+                pids.append(pid)
+        return pids
+
+    @staticmethod
+    def is_responding(pid: int, timeout_ms: int = 5000) -> bool:
+        """
+        Health probe: checks that every top-level window of the process handles messages.
+
+        Args:
+            pid (int): Process ID to probe.
+            timeout_ms (int): Maximum time a window may take to answer.
+
+        Returns:
+            bool: False if any window of the process is hung.
+        """
+        windows = []
+
+        def collect(hwnd, _):
+            if win32process.GetWindowThreadProcessId(hwnd)[1] == pid:
+                windows.append(hwnd)
+            return True
+
+        win32gui.EnumWindows(collect, None)
+        for hwnd in windows:
+            try:
+                win32gui.SendMessageTimeout(
+                    hwnd, win32con.WM_NULL, 0, 0, win32con.SMTO_ABORTIFHUNG, timeout_ms
                 )
+            except pywintypes.error:
+                return False
+        return True
 
-    def print_label(self, label_path: str, printer_name: str, copies: int = 1):
+    def create_supervisor(self) -> ProcessSupervisor:
         """
-        Launches BarTender to print a label using the specified printer.
+        Creates a supervisor keeping the engine warm (restarted when it crashes or hangs).
+
+        Returns:
+            ProcessSupervisor: Supervisor of the engine process (not started).
+        """
+        foreign = self.find_processes()
+        if foreign:
+            self.logger.info("Běžící cizí instance BarTenderu (ponechány): %s", foreign)
+
+        return ProcessSupervisor(
+            None,
+            probe=self.is_responding,
+            name="BarTender",
+            launcher=self.engine.launch
+        )
+
+    def print_label(self, label_path: str, printer_name: str, copies: int = 1) -> bool:
+        """
+        Prints a label on the warm engine with the printer and data source saved in the template.
 
         Args:
             label_path (str): Full path to the .btw label template.
             printer_name (str): Name of the printer to use.
             copies (int): Number of copies to print.
+
+        Returns:
+            bool: True if BarTender accepted the print job.
         """
         label_file = Path(label_path)
-
         if not label_file.exists():
             self.logger.error("Šablona neexistuje: %s", label_file)
             if self.messenger:
-                self.messenger.error(f"Šablona neexistuje: {label_file}", "Bartender Utils")
-            return
+                self.messenger.notify(f"Šablona neexistuje: {label_file}", "error")
+            return False
 
-        if not self.config:
-            self.logger.error("Chybí config pro získání cesty k BarTenderu.")
+        try:
+            self.engine.call(_print_format, str(label_file), None, copies, {})
+        except (pywintypes.com_error, TimeoutError, RuntimeError) as e:
+            self.logger.error("Chyba při tisku BarTenderem: %s", str(e))
             if self.messenger:
-                self.messenger.error("Chybí config pro BarTender path.", "Bartender Utils")
-            return
+                self.messenger.notify(f"Tisk se nezdařil: {str(e)}", "error")
+            return False
+
+        self.logger.info("Etiketa: %s tiskárna: %s", label_file.name, printer_name)
+        return True
+
+    def print_label_data(self, label_path: str, printer_name: str, copies: int,
+                         data: dict[str, str]) -> bool:
+        """
+        Prints a label through COM with the data passed as named substrings.
 
-        bartender_path = Path(self.config.get("Paths", "bartender_path", fallback=""))
+        The template is opened read-only in memory: the printer and the data are not
+        saved, so no label.csv is written and stations sharing a template do not race.
 
-        if not bartender_path.exists():
-            self.logger.error("BarTender nebyl nalezen: %s", bartender_path)
+        Args:
+            label_path (str): Full path to the .btw label template.
+            printer_name (str): Name of the printer to use.
+            copies (int): Number of copies to print.
+            data (dict[str, str]): Named substring → value (e.g. SerialNumber).
+
+        Returns:
+            bool: True if BarTender accepted the print job.
+        """
+        label_file = Path(label_path)
+        if not label_file.exists():
+            self.logger.error("Šablona neexistuje: %s", label_file)
             if self.messenger:
-                self.messenger.error(
-                    f"BarTender nebyl nalezen: {bartender_path}",
-                    "Bartender Utils"
-                )
-            return
-
-        command = (
-            f'"{bartender_path}" '
-            f'/P '
-            f'/AF="{label_file}" '
-            f'/C={copies} '
-            f'/X'
-        )
+                self.messenger.notify(f"Šablona neexistuje: {label_file}", "error")
+            return False
 
         try:
-            subprocess.run(command, shell=True, check=True)
-            self.logger.info("Etiketa: %s tiskárna: %s", label_file.name, printer_name)
-        except subprocess.CalledProcessError as e:
-            self.logger.error("Chyba při tisku BarTenderem: %s", str(e))
+            self.engine.call(_print_format, str(label_file), printer_name, copies, data)
+        except (pywintypes.com_error, TimeoutError, RuntimeError) as e:
+            self.logger.error("Chyba COM při tisku etikety %s: %s", label_file.name, str(e))
             if self.messenger:
-                self.messenger.error(f"Tisk se nezdařil: {str(e)}", "Bartender Utils")
+                self.messenger.notify("Tisk přes BarTender COM se nezdařil.", "error")
+            return False
+
+        self.logger.info("Etiketa (COM): %s tiskárna: %s", label_file.name, printer_name)
+        return True
+
+    def run_xml_script(self, script: str) -> str | None:
+        """
+        Executes a BTXML script in the BarTender COM engine (one invocation for all its labels).
+
+        Args:
+            script (str): Script text (see utils.btxml.build_script).
+
+        Returns:
+            str | None: Response XML, or None if the engine rejected the call.
+        """
+        try:
+            response = self.engine.call(
+                lambda app: app.XMLScript(script, BT_SCRIPT_STRING, None)
+            )
+        except (pywintypes.com_error, TimeoutError, RuntimeError) as e:
+            self.logger.error("Chyba COM při spuštění XML skriptu: %s", str(e))
+            return None
+
+        if isinstance(response, tuple):
+            response = response[0]  # 💡 pywin32 returns ByRef arguments after the result
+        return response or ""
+
+
+def _print_format(app, label_path: str, printer_name: str | None, copies: int,
+                  data: dict[str, str]):
+    """Opens a template, prints it and closes it without saving (engine thread)."""
+    btformat = app.Formats.Open(label_path, False, "")
+    try:
+        if printer_name:
+            btformat.Printer = printer_name
+        btformat.IdenticalCopiesOfLabel = copies
+        for name, value in data.items():
+            btformat.SetNamedSubStringValue(name, value)
+        btformat.PrintOut(False, False)
+    finally:
+        btformat.Close(BT_DO_NOT_SAVE_CHANGES)
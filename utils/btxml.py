@@ -0,0 +1,123 @@
+"""
+📦 Module: btxml.py
+
+BarTender XML Script (BTXML) generation and response parsing for batched printing.
+
+One script holds a Print command for every label of one scan (or of a batch of
+queued scans), so BarTender is invoked once instead of once per label. Each
+command carries its template, printer, copy count and named substrings.
+
+Both functions are pure (no BarTender, no I/O): the same entries always produce
+the same script text, so the output can be compared with a stored golden file.
+
+Usage:
+    script = build_script([ScriptEntry("0001_label01", "C:/labels/a.btw", "ZD621", 1,
+                                       {"SerialNumber": "SN1"})])
+    errors = parse_response(response, ["0001_label01"])   # {"0001_label01": None}
+
+Author: Miloslav Hradecky
+"""
+
+# 🧱 Standard library
+from dataclasses import dataclass, field
+from xml.etree import ElementTree
+
+SCRIPT_VERSION = "2.0"
+ERROR_SEVERITIES = ("error", "fatal")
+
+
+@dataclass
+class ScriptEntry:
+    """One Print command of a script: a label of one scan."""
+    name: str
+    label_path: str
+    printer: str
+    copies: int
+    data: dict[str, str] = field(default_factory=dict)
+
+
+def build_script(entries: list[ScriptEntry], name: str = "PrintSingleSN") -> str:
+    """
+    Compiles print entries into one BTXML script.
+
+    Args:
+        entries (list[ScriptEntry]): Labels to print, in print order.
+        name (str): Script name reported back by BarTender.
+
+    Returns:
+        str: Script text (UTF-8 XML declaration, two-space indentation, LF line ends).
+    """
+    root = ElementTree.Element("XMLScript", {"Version": SCRIPT_VERSION, "Name": name})
+    for entry in entries:
+        command = ElementTree.SubElement(root, "Command", {"Name": entry.name})
+        print_element = ElementTree.SubElement(command, "Print")
+        template = ElementTree.SubElement(print_element, "Format", {"CloseAtEndOfJob": "true"})
+        template.text = str(entry.label_path)
+
+        setup = ElementTree.SubElement(print_element, "PrintSetup")
+        ElementTree.SubElement(setup, "Printer").text = entry.printer
+        ElementTree.SubElement(setup, "IdenticalCopiesOfLabel").text = str(entry.copies)
+
+        for key, value in entry.data.items():
+            substring = ElementTree.SubElement(print_element, "NamedSubString", {"Name": key})
+            ElementTree.SubElement(substring, "Value").text = value
+
+    ElementTree.indent(root)
+    body = ElementTree.tostring(root, encoding="unicode", short_empty_elements=False)
+    return f'<?xml version="1.0" encoding="utf-8"?>\n{body}\n'
+
+
+def _errors(element) -> list[str]:
+    """Returns texts of error messages directly inside the element's Messages."""
+    texts = []
+    for messages in element.findall("Messages"):
+        for message in messages.iter("Message"):
+            if message.get("Severity", "").lower() in ERROR_SEVERITIES:
+                text = message.findtext("Text") or message.get("ID") or "chyba"
+                texts.append(text.strip())
+    return texts
+
+
+def parse_response(response: str, names: list[str]) -> dict[str, str | None]:
+    """
+    Maps the BarTender response to the result of every command.
+
+    A command fails when its response contains an error message. Errors reported
+    for the whole script (outside any command) fail every command. A command
+    missing from the response is considered printed: BarTender only reports
+    commands that produced messages.
+
+    Args:
+        response (str): Response XML returned by BarTender.
+        names (list[str]): Command names of the submitted script.
+
+    Returns:
+        dict[str, str | None]: Command name → error text, None if printed.
+
+    Raises:
+        ValueError: If the response is not well-formed XML.
+    """
+    try:
+        root = ElementTree.fromstring(response)
+    except ElementTree.ParseError as exc:
+        raise ValueError(f"Neplatná odpověď BarTenderu: {exc}") from exc
+
+    results = dict.fromkeys(names)
+
+    global_errors = []
+    for element in root.iter():
+        if element.tag in ("XMLScript", "Response"):
+            global_errors += _errors(element)
+    if global_errors:
+        return dict.fromkeys(names, "; ".join(global_errors))
+
+    for command in root.iter("Command"):
+        name = command.get("Name")
+        if name not in results:
+            continue
+        errors = _errors(command)
+        for child in command:
+            errors += _errors(child)
+        if errors:
+            results[name] = "; ".join(errors)
+    return results
@@ -36,6 +36,31 @@ class ConfigReader:
         """
         return self.config.get(section, key, fallback=fallback)
 
+    def get_int(self, section: str, key: str, fallback: int) -> int:
+        """
+        Returns an integer value from the config file.
+
+        Raises:
+            ValueError: If the value is present but not a whole number.
+        """
+        raw = self.get_value(section, key, fallback=str(fallback))
+        try:
+            return int(raw)
+        except ValueError as exc:
+            raise ValueError(f"Hodnota [{section}] {key} není číslo: '{raw}'") from exc
+
+    def get_bool(self, section: str, key: str, fallback: bool) -> bool:
+        """
+        Returns a boolean value from the config file (true/false, yes/no, on/off, 1/0).
+
+        Raises:
+            ValueError: If the value is present but not a boolean.
+        """
+        try:
+            return self.config.getboolean(section, key, fallback=fallback)
+        except ValueError as exc:
+            raise ValueError(f"Hodnota [{section}] {key} není ano/ne hodnota") from exc
+
     def get_window_title(self) -> str:
         """
         Retrieves the application window title from the config file.
@@ -48,7 +73,10 @@ class ConfigReader:
     def get_all_labels(self) -> dict:
         """
         Parses all label entries from config and returns a dict:
-        {label_key: (label_path, printer, copies)}
+        {label_key: (label_path, printers, copies)}
+
+        The printer part may list a pool of printers separated by commas
+        (e.g. "PrinterA,PrinterB"); printers is always a tuple.
         """
         if not self.config.has_section("Labels"):
             raise ValueError("Sekce [Labels] chybí v config.ini")
@@ -64,16 +92,60 @@ class ConfigReader:
                 )
 
             label_path = parts[0].strip()
-            printer = parts[1].strip()
+            printers = tuple(p.strip() for p in parts[1].split(",") if p.strip())
+            if not printers:
+                raise ValueError(f"Etiketa '{key}' nemá zadanou tiskárnu: '{raw}'")
             try:
                 copies = int(parts[2])
             except ValueError as exc:
                 raise ValueError(f"Etiketa '{key}' má nečíselný počet kopií: '{parts[2]}'") from exc
 
-            labels[key] = (label_path, printer, copies)
+            labels[key] = (label_path, printers, copies)
 
         return labels
 
+    def get_server_settings(self) -> tuple[str, str, int]:
+        """
+        Reads the [Server] section used by the print server daemon and its clients.
+
+        Returns:
+            tuple: (mode, host, port) where mode is "local" or "client".
+        """
+        mode = self.get_value("Server", "mode", fallback="local").strip().lower()
+        if mode not in ("local", "client"):
+            raise ValueError(f"Neplatný režim tisku v [Server]: '{mode}' (local|client)")
+
+        host = self.get_value("Server", "host", fallback="127.0.0.1").strip()
+        raw_port = self.get_value("Server", "port", fallback="9150")
+        try:
+            port = int(raw_port)
+        except ValueError as exc:
+            raise ValueError(f"Port v [Server] není číslo: '{raw_port}'") from exc
+
+        return mode, host, port
+
+    def get_input_settings(self) -> dict:
+        """
+        Returns raw settings of additional scanner inputs from the [Inputs] section.
+
+        Returns:
+            dict: e.g. {"serial": "COM3:9600", "tcp": "127.0.0.1:9160", "file_drop": "..."}
+        """
+        if not self.config.has_section("Inputs"):
+            return {}
+        return {key: self.config.get("Inputs", key) for key in self.config.options("Inputs")}
+
+    def get_printer_addresses(self) -> dict:
+        """
+        Returns network addresses of printers from the [Printers] section.
+
+        Returns:
+            dict: e.g. {"50x45_ZD621": "tcp://10.0.0.21:9100"}
+        """
+        if not self.config.has_section("Printers"):
+            return {}
+        return {key: self.config.get("Printers", key) for key in self.config.options("Printers")}
+
     @staticmethod
     def load() -> "ConfigReader":
         """Returns a fully initialized ConfigReader instance."""
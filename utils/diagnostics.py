@@ -0,0 +1,165 @@
+"""
+📦 Module: diagnostics.py
+
+Runtime diagnostics dump for a running station or print server daemon.
+
+Responsibilities:
+    - Snapshot the Python heap with tracemalloc (top N allocation sites) and diff it
+      against the previous dump
+    - Collect live counters from registered providers (Qt widgets, window stack depth,
+      job queue and journal backlog, ...) plus logger handler and thread counts
+    - Write everything to logs/diag_<timestamp>.json in a background thread,
+      so printing is not stopped
+
+Triggers:
+    - Ctrl+Shift+F12 in the print window
+    - Creating the flag file logs/diag.flag (checked every few seconds, then deleted)
+
+tracemalloc is started by the first dump (it slows allocations down a little),
+so the first dump has no heap data and every later dump has a snapshot and a diff.
+
+Author: Miloslav Hradecky
+"""
+
+# 🧱 Standard library
+import os
+import gc
+import json
+import logging
+import threading
+import tracemalloc
+from datetime import datetime
+
+# 🧠 First-party (project-specific)
+from utils.logger import get_logger
+from utils.resource_resolver import ResourceResolver
+from utils.background_loop import BackgroundLoop
+
+FLAG_FILE = "logs/diag.flag"
+TRACE_FRAMES = 5
+
+
+def logger_handler_counts() -> dict[str, int]:
+    """Returns the number of handlers of every logger that has any."""
+    loggers = {"root": logging.getLogger()}
+    loggers.update(
+        (name, logger) for name, logger in logging.Logger.manager.loggerDict.items()
+        if isinstance(logger, logging.Logger)
+    )
+    return {name: len(logger.handlers) for name, logger in loggers.items() if logger.handlers}
+
+
+class Diagnostics:
+    """Collects diagnostic data on demand and writes it to logs/diag_<timestamp>.json."""
+
+    def __init__(self, top_n: int = 25):
+        """
+        Args:
+            top_n (int): Number of allocation sites in the snapshot and in the diff.
+        """
+        self.top_n = top_n
+        self.logger = get_logger("Diagnostics")
+        self.flag_path = ResourceResolver().writable(FLAG_FILE)
+        self._providers = {}
+        self._lock = threading.Lock()
+        self._previous = None
+        self._flag_watch = None
+
+    def register(self, name: str, provider):
+        """
+        Adds a live counter to every dump.
+
+        Args:
+            name (str): Key in the dump.
+            provider (Callable[[], Any]): Returns a JSON-serializable value (called
+                in the thread that triggered the dump).
+        """
+        self._providers[name] = provider
+
+    def dump(self):
+        """
+        Collects the counters now and writes the dump in a background thread.
+        Counters are read in the calling thread (Qt objects belong to the GUI thread).
+        """
+        counters = {}
+        for name, provider in self._providers.items():
+            try:
+                counters[name] = provider()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                counters[name] = f"chyba: {e}"  # 💡 a broken provider must not stop the dump
+        threading.Thread(
+            target=self._write, args=(counters,), name="DiagnosticsDump", daemon=True
+        ).start()
+
+    def _heap(self) -> dict:
+        """Takes a tracemalloc snapshot and compares it with the previous one."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+            return {"tracing": "zapnuto tímto výpisem, data budou v dalším výpisu"}
+
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        current, peak = tracemalloc.get_traced_memory()
+        heap = {
+            "current_kib": round(current / 1024, 1),
+            "peak_kib": round(peak / 1024, 1),
+            "top": [
+                {"where": str(stat.traceback[0]), "size_kib": round(stat.size / 1024, 1),
+                 "count": stat.count}
+                for stat in snapshot.statistics("lineno")[:self.top_n]
+            ],
+        }
+        with self._lock:
+            previous, self._previous = self._previous, snapshot
+        if previous is not None:
+            heap["diff"] = [
+                {"where": str(stat.traceback[0]), "size_diff_kib": round(stat.size_diff / 1024, 1),
+                 "count_diff": stat.count_diff}
+                for stat in snapshot.compare_to(previous, "lineno")[:self.top_n]
+            ]
+        return heap
+
+    def _write(self, counters: dict):
+        """Builds the dump and writes it to logs/diag_<timestamp>.json."""
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S-%f")[:-3]  # 💡 ms: no overwrite
+        report = {
+            "timestamp": timestamp,
+            "pid": os.getpid(),
+            "threads": [thread.name for thread in threading.enumerate()],
+            "gc_counts": gc.get_count(),
+            "gc_objects": len(gc.get_objects()),
+            "logger_handlers": logger_handler_counts(),
+            "counters": counters,
+            "heap": self._heap(),
+        }
+        path = ResourceResolver().writable(f"logs/diag_{timestamp}.json")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=1, default=str)
+        except OSError as e:
+            self.logger.error("Diagnostický výpis nelze uložit: %s", str(e))
+            return
+        self.logger.info("Diagnostický výpis uložen: %s", path)
+
+    def check_flag(self) -> bool:
+        """Dumps if the flag file exists (the flag is deleted first)."""
+        try:
+            self.flag_path.unlink()
+        except OSError:
+            return False  # 💡 no flag (the usual case)
+        self.dump()
+        return True
+
+    def start_flag_watch(self, interval: float = 2.0):
+        """Checks the flag file in a background thread (headless daemon)."""
+        if self._flag_watch is None:
+            self._flag_watch = BackgroundLoop(self.check_flag, interval, "DiagnosticsFlag")
+        self._flag_watch.start()
+
+    def stop(self):
+        """Stops the flag watcher thread."""
+        if self._flag_watch is not None:
+            self._flag_watch.stop()
@@ -0,0 +1,329 @@
+"""
+📦 Module: input_sources.py
+
+Pluggable scanner input layer feeding one print job queue.
+
+Sources:
+    - KeyboardWedgeSource: serials typed/scanned into the PrintWindow input field
+    - SerialPortSource:    scanner attached to a serial/COM port (pyserial)
+    - TcpListenerSource:   network scanners sending one serial per line over TCP
+    - FileDropSource:      text files dropped into a watched directory
+    - SimulatedSource:     serials from any iterable (tests, benchmarks, demos)
+
+Every source calls `submit(serial, source_name)`; the name is stored in single.sn
+to attribute each print to the scanner that produced it.
+
+Sources are started once per process. A serial port that fails (scanner unplugged)
+is reopened and a TCP port that cannot be bound is retried, with exponential backoff.
+
+Author: Miloslav Hradecky
+"""
+
+# 🧱 Standard library
+import threading
+import socketserver
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+# 🧩 Third-party libraries
+import serial
+
+# 🧠 First-party (project-specific)
+from utils.logger import get_logger
+
+
+class InputSource:
+    """
+    Base class for all scanner inputs.
+
+    Subclasses call `self.emit(serial)` for every scanned serial number.
+    """
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name (str): Source name recorded with every job (e.g. "serial:COM3").
+        """
+        self.name = name
+        self.logger = get_logger("InputSource")
+        self._submit = None
+
+    def start(self, submit):
+        """
+        Starts delivering serials.
+
+        Args:
+            submit (Callable[[str, str], bool]): Receives (serial, source_name).
+        """
+        self._submit = submit
+
+    def stop(self):
+        """Stops delivering serials."""
+        self._submit = None
+
+    def emit(self, raw: str) -> bool:
+        """Cleans one raw reading and submits it; returns False if it was not accepted."""
+        serial_number = raw.strip()
+        if not serial_number or self._submit is None:
+            return False
+        return self._submit(serial_number, self.name)
+
+
+class KeyboardWedgeSource(InputSource):
+    """Serials entered in the PrintWindow input field (keyboard-wedge scanner)."""
+
+    def __init__(self, name: str = "keyboard"):
+        super().__init__(name)
+
+    def feed(self, raw: str) -> bool:
+        """Submits the current content of the input field."""
+        return self.emit(raw)
+
+
+class ThreadedInputSource(InputSource, ABC):
+    """Input source reading in its own daemon thread until stopped."""
+
+    backoff_initial = 1.0
+    backoff_max = 30.0
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self, submit):
+        super().start(submit)
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run_safe, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        super().stop()
+
+    @property
+    def stopped(self) -> bool:
+        """Returns True once stop() was requested."""
+        return self._stop_event.is_set()
+
+    def wait_retry(self, delay: float) -> float:
+        """Waits before the next reconnect attempt (returns early on stop); returns next delay."""
+        self._stop_event.wait(delay)
+        return min(delay * 2, self.backoff_max)
+
+    def _run_safe(self):
+        """Runs the reader loop and logs unexpected termination."""
+        try:
+            self.run()
+        except OSError as e:
+            self.logger.error("Vstup '%s' byl ukončen chybou: %s", self.name, str(e))
+
+    @abstractmethod
+    def run(self):
+        """Reader loop implemented by subclasses; must return once `stopped` is True."""
+
+
+class SimulatedSource(ThreadedInputSource):
+    """Feeds serials from an iterable, optionally with a fixed delay between them."""
+
+    def __init__(self, serials, name: str = "simulated", interval: float = 0.0):
+        """
+        Args:
+            serials (Iterable[str]): Serial numbers to deliver.
+            name (str): Source name.
+            interval (float): Delay in seconds between two serials.
+        """
+        super().__init__(name)
+        self.serials = serials
+        self.interval = interval
+        self.finished = threading.Event()
+
+    def run(self):
+        for raw in self.serials:
+            if self.stopped:
+                break
+            self.emit(raw)
+            if self.interval:
+                self._stop_event.wait(self.interval)
+        self.finished.set()
+
+
+class SerialPortSource(ThreadedInputSource):
+    """Reads newline-terminated serials from a serial/COM port scanner."""
+
+    def __init__(self, port: str, baudrate: int = 9600, name: str | None = None):
+        """
+        Args:
+            port (str): Port name (e.g. "COM3" or "/dev/ttyUSB0").
+            baudrate (int): Port speed.
+            name (str | None): Source name, defaults to "serial:<port>".
+        """
+        super().__init__(name or f"serial:{port}")
+        self.port = port
+        self.baudrate = baudrate
+
+    def run(self):
+        delay = self.backoff_initial
+        while not self.stopped:
+            try:
+                with serial.Serial(self.port, self.baudrate, timeout=0.5) as connection:
+                    self.logger.info("Čtečka na portu %s připojena.", self.port)
+                    delay = self.backoff_initial
+                    while not self.stopped:
+                        line = connection.readline()
+                        if line:
+                            self.emit(line.decode("ascii", errors="ignore"))
+            except serial.SerialException as e:
+                self.logger.error(
+                    "Port %s nelze číst: %s, nový pokus za %.0f s.",
+                    self.port,
+                    str(e),
+                    delay
+                )
+                delay = self.wait_retry(delay)
+
+
+class _ScannerLineHandler(socketserver.StreamRequestHandler):
+    """Delivers every received line as one serial attributed to the peer address."""
+
+    def handle(self):
+        source = self.server.input_source
+        peer = self.client_address[0]
+        for raw in self.rfile:
+            source.emit_from(raw.decode("utf-8", errors="ignore"), peer)
+
+
+# 💡 the ancestors all come from socketserver (ThreadingMixIn, TCPServer, BaseServer)
+class _ScannerServer(socketserver.ThreadingTCPServer):  # pylint: disable=too-many-ancestors
+    """Threaded TCP server with a back-reference to its TcpListenerSource."""
+    daemon_threads = True
+
+    def __init__(self, address, input_source):
+        self.input_source = input_source
+        super().__init__(address, _ScannerLineHandler)
+
+
+class TcpListenerSource(ThreadedInputSource):
+    """Accepts network scanners that send one serial per line over TCP."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9160, name: str = "tcp"):
+        super().__init__(name)
+        self.host = host
+        self.port = port
+        self._server = None
+        self._server_lock = threading.Lock()
+
+    @property
+    def address(self) -> tuple[str, int] | None:
+        """Returns the bound (host, port) while listening."""
+        server = self._server
+        return server.server_address[:2] if server else None
+
+    def run(self):
+        delay = self.backoff_initial
+        while True:
+            with self._server_lock:
+                if self.stopped:
+                    break
+                try:
+                    self._server = _ScannerServer((self.host, self.port), self)
+                except OSError as e:
+                    self.logger.error(
+                        "Síťový vstup %s:%d nelze otevřít: %s, nový pokus za %.0f s.",
+                        self.host,
+                        self.port,
+                        str(e),
+                        delay
+                    )
+            if self._server is None:
+                delay = self.wait_retry(delay)
+                continue
+            self.logger.info("Síťový vstup čteček naslouchá na %s:%d", *self.address)
+            self._server.serve_forever(poll_interval=0.5)  # 💡 returns on shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def stop(self):
+        self._stop_event.set()
+        with self._server_lock:
+            server = self._server
+        if server is not None:
+            server.shutdown()
+        super().stop()
+
+    def emit_from(self, raw: str, peer: str) -> bool:
+        """Submits a serial attributed to the sending scanner."""
+        serial_number = raw.strip()
+        if not serial_number or self._submit is None:
+            return False
+        return self._submit(serial_number, f"{self.name}:{peer}")
+
+
+class FileDropSource(ThreadedInputSource):
+    """
+    Watches a directory for dropped *.txt files with one serial per line.
+    Processed files are renamed to *.done so they are never read twice.
+    """
+
+    def __init__(self, directory: str, poll_interval: float = 0.5, name: str = "file"):
+        super().__init__(name)
+        self.directory = Path(directory)
+        self.poll_interval = poll_interval
+
+    def run(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        while not self.stopped:
+            for path in sorted(self.directory.glob("*.txt")):
+                self._consume(path)
+            self._stop_event.wait(self.poll_interval)
+
+    def _consume(self, path: Path):
+        """Reads all serials from one dropped file and marks it as processed."""
+        try:
+            done = path.with_suffix(".done")
+            path.replace(done)  # 💡 claim the file first so a rescan cannot read it again
+            lines = done.read_text(encoding="utf-8").splitlines()
+        except OSError as e:
+            self.logger.warning("Soubor %s nelze zpracovat: %s", path, str(e))
+            return
+        for raw in lines:
+            self.emit(raw)
+        self.logger.info("Soubor %s zpracován (%d řádků).", path.name, len(lines))
+
+
+def create_input_sources(settings: dict) -> list[InputSource]:
+    """
+    Builds additional input sources from the [Inputs] section of config.ini.
+
+    Keys:
+        serial    = COM3 or COM3:9600
+        tcp       = 127.0.0.1:9160
+        file_drop = C:/PrintSingleSN/drop
+
+    Args:
+        settings (dict): Raw key/value pairs from [Inputs].
+
+    Returns:
+        list[InputSource]: Configured sources (the keyboard source is not included).
+
+    Raises:
+        ValueError: If a port or speed is not a number.
+    """
+    sources = []
+    try:
+        if settings.get("serial"):
+            port, _, baudrate = settings["serial"].partition(":")
+            sources.append(SerialPortSource(port.strip(), int(baudrate or 9600)))
+        if settings.get("tcp"):
+            host, _, port = settings["tcp"].rpartition(":")
+            sources.append(TcpListenerSource(host.strip() or "127.0.0.1", int(port)))
+    except ValueError as exc:
+        raise ValueError(f"Neplatné nastavení v sekci [Inputs]: {exc}") from exc
+
+    if settings.get("file_drop"):
+        sources.append(FileDropSource(settings["file_drop"].strip()))
+
+    return sources
@@ -0,0 +1,94 @@
+"""
+📦 Module: job_queue.py
+
+Thread-safe, ordered and de-duplicating queue of print jobs.
+
+Responsibilities:
+    - Collect jobs from all input sources (keyboard, serial port, TCP, file drop)
+    - Keep arrival order (FIFO)
+    - Drop repeated reads of the same serial number within a short window
+
+Author: Miloslav Hradecky
+"""
+
+# 🧱 Standard library
+import time
+import threading
+from collections import deque
+
+# 🧠 First-party (project-specific)
+from models.print_job import PrintJob
+
+
+class PrintJobQueue:
+    """
+    FIFO queue shared by all input sources of one station.
+
+    A serial number is rejected while it is still waiting in the queue
+    or when it was accepted less than `dedup_window` seconds ago.
+    """
+
+    def __init__(self, dedup_window: float = 5.0, clock=time.monotonic):
+        """
+        Initializes an empty queue.
+
+        Args:
+            dedup_window (float): Seconds during which a repeated serial is ignored.
+            clock (Callable[[], float]): Monotonic time source (replaceable in tests).
+        """
+        self.dedup_window = dedup_window
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._jobs = deque()
+        self._pending = set()
+        self._last_seen = {}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._jobs)
+
+    def put(self, job: PrintJob) -> bool:
+        """
+        Adds a job unless it duplicates a pending or recently accepted serial.
+
+        Args:
+            job (PrintJob): Job to enqueue.
+
+        Returns:
+            bool: True if the job was accepted, False if it was a duplicate.
+        """
+        now = self._clock()
+        with self._lock:
+            self._forget_expired(now)
+            if job.serial in self._pending or job.serial in self._last_seen:
+                return False
+            self._jobs.append(job)
+            self._pending.add(job.serial)
+            self._last_seen[job.serial] = now
+            return True
+
+    def get_nowait(self) -> PrintJob | None:
+        """Removes and returns the oldest job, or None if the queue is empty."""
+        with self._lock:
+            if not self._jobs:
+                return None
+            job = self._jobs.popleft()
+            self._pending.discard(job.serial)
+            return job
+
+    def clear(self) -> int:
+        """Drops all waiting jobs and returns how many were dropped."""
+        with self._lock:
+            dropped = len(self._jobs)
+            self._jobs.clear()
+            self._pending.clear()
+            return dropped
+
+    def _forget_expired(self, now: float):
+        """Removes serials accepted longer than the de-duplication window ago."""
+        # 💡 Dict keeps insertion order, so the oldest entries are always first
+        while self._last_seen:
+            serial, seen = next(iter(self._last_seen.items()))
+            if now - seen < self.dedup_window:
+                break
+            del self._last_seen[serial]
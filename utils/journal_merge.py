@@ -0,0 +1,430 @@
+"""
+📦 Module: journal_merge.py
+
+Per-station journal shards and the tool merging them into single.sn.
+
+Responsibilities:
+    - Name the shard of a station (single_<PC>.sn), so every line PC appends to its
+      own file on the share instead of contending for single.sn over SMB
+    - Stream-merge new rows of all shards by timestamp into single.sn or its time
+      partitions ([Journal] partition), optionally also into the local print history,
+      skipping duplicates
+    - Remember a read offset per shard, so every run only reads rows added since
+      the previous one, and resume an interrupted run without writing rows twice
+    - Compact idle shards: rename, merge the remainder, delete
+
+Files next to single.sn:
+    single_<PC>.sn           – shard of one station (same layout as single.sn)
+    single_<PC>.sn.compact   – shard being compacted (renamed, nobody appends to it)
+    single.sn.merge.json     – merge state: shard offsets and an unfinished append
+                               (run id and the size of every file it appends to)
+    single.sn.merge.lock     – exists while a merge runs
+
+Usage (administration, e.g. a scheduled task on one PC):
+    python -m utils.journal_merge
+    python -m utils.journal_merge --history --compact-idle 120
+    python -m utils.journal_merge --orders T:/Prikazy/ --compact
+
+Author: Miloslav Hradecky
+"""
+
+# 🧱 Standard library
+import os
+import re
+import sys
+import json
+import time
+import heapq
+import uuid
+import socket
+import argparse
+from pathlib import Path
+from collections import Counter
+
+# 🧠 First-party (project-specific)
+from utils.logger import get_logger
+from utils.journal_spool import JOURNAL_HEADER, fit_row, header_width, read_tail
+from utils.journal_partition import (
+    JOURNAL_NAME, ROW_TIMESTAMP, TIMESTAMP_LENGTH, partition_name, partition_period
+)
+
+SHARD_GLOB = "single_*.sn"
+COMPACT_SUFFIX = ".compact"
+BATCH_SIZE = 10_000
+UNSAFE_NAME_CHARS = re.compile(r"[^A-Za-z0-9_-]")
+
+
+def shard_name(computer_name: str) -> str:
+    """Returns the shard file name of a station, e.g. single_LINKA-07.sn."""
+    return f"single_{UNSAFE_NAME_CHARS.sub('_', computer_name)}.sn"
+
+
+def is_shard(name: str) -> bool:
+    """Returns False for time partitions, which share the single_*.sn pattern."""
+    return partition_period(name.removesuffix(COMPACT_SUFFIX)) is None
+
+
+def read_shard(path: Path, offset: int, end: int, progress: dict[str, int]):
+    """
+    Yields complete rows of a shard between two byte offsets (headers are skipped).
+
+    Args:
+        path (Path): Shard file.
+        offset (int): Position after the last merged row.
+        end (int): Size of the shard when the merge started; rows appended later
+            are left for the next run.
+        progress (dict[str, int]): Updated with the position after every row read.
+    """
+    with path.open("rb") as f:
+        f.seek(offset)
+        position = offset
+        for line in f:
+            if position + len(line) > end or not line.endswith(b"\n"):
+                break  # 💡 row being written right now
+            position += len(line)
+            progress[path.name] = position
+            row = line.decode("utf-8", errors="replace").rstrip("\r\n")
+            if row and not row.startswith("date;"):
+                yield row
+
+
+class JournalMerger:
+    """Incremental, restartable merge of station shards into single.sn."""
+
+    def __init__(self, orders_dir, history=None, compact_idle: float | None = None,
+                 lock_timeout: float = 600.0, partition: str = "none"):
+        """
+        Args:
+            orders_dir (str | Path): Directory with single.sn and the shards (orders_path).
+            history (PrintHistory | None): Also stores merged rows in the print history.
+            compact_idle (float | None): Seconds without a write after which a shard is
+                compacted (0 = every shard, None = never).
+            lock_timeout (float): Age in seconds after which a lock left by a crashed
+                merge is removed.
+            partition (str): none | month | day – merged rows go to single.sn or
+                to the partition of their timestamp.
+        """
+        self.orders_dir = Path(orders_dir)
+        self.partition = partition
+        self.history = history
+        self.compact_idle = compact_idle
+        self.lock_timeout = lock_timeout
+        self.logger = get_logger("JournalMerger")
+
+    @property
+    def state_path(self) -> Path:
+        """Returns the merge state file (shard offsets and the interrupted run)."""
+        return self.orders_dir / f"{JOURNAL_NAME}.merge.json"
+
+    @property
+    def lock_path(self) -> Path:
+        """Returns the lock file held while a merge is running."""
+        return self.orders_dir / f"{JOURNAL_NAME}.merge.lock"
+
+    def _load_state(self) -> dict:
+        """Reads the merge state; offsets of shards that no longer exist are dropped."""
+        try:
+            state = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            state = {}
+        offsets = {
+            name: offset for name, offset in state.get("offsets", {}).items()
+            if (self.orders_dir / name).exists()
+        }
+        return {"offsets": offsets, "pending": state.get("pending")}
+
+    def _save_state(self, state: dict):
+        """Stores the merge state atomically."""
+        tmp = self.state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(tmp, self.state_path)
+
+    def _acquire_lock(self):
+        """
+        Creates the lock file, so two PCs never merge at the same time.
+
+        Raises:
+            FileExistsError: If another merge is running.
+        """
+        try:
+            if time.time() - self.lock_path.stat().st_mtime > self.lock_timeout:
+                self.logger.warning("Odstraněn zámek nedokončeného slučování: %s", self.lock_path)
+                self.lock_path.unlink()
+        except FileNotFoundError:
+            pass
+        fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(f"{socket.gethostname()} {os.getpid()}\n")
+
+    def _release_lock(self):
+        """Removes the lock file."""
+        try:
+            self.lock_path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _history_origin(self, run: str, name: str) -> str:
+        """Origin key of rows one merge run appended to one journal file (print history)."""
+        return f"merge:{run}:{name}"
+
+    def _recover(self, pending: dict) -> Counter:
+        """
+        Returns the rows an interrupted run already appended (with their counts), so
+        they are not written again; a row torn by the interruption is cut off. The rows
+        are stored in the history under the keys of that run, which ignores those
+        the run stored before it was interrupted.
+
+        Args:
+            pending (dict): {"run": run id, "sizes": journal file name → size before the append}.
+        """
+        self.logger.warning("Předchozí slučování nebylo dokončeno, navazuji.")
+        recovered = Counter()
+        for name, size in pending.get("sizes", {}).items():
+            target = self.orders_dir / name
+            if not target.exists():
+                continue
+            with target.open("r+b") as f:
+                f.seek(size)
+                data = f.read()
+                if data and not data.endswith(b"\n"):
+                    data = data[:data.rfind(b"\n") + 1]
+                    f.truncate(size + len(data))
+            rows = [
+                row for row in data.decode("utf-8", errors="replace").splitlines()
+                if not row.startswith("date;")
+            ]
+            if self.history and rows:
+                self.history.add_rows(
+                    enumerate(rows), self._history_origin(pending["run"], name)
+                )
+            recovered.update(rows)
+        return recovered
+
+    def _compact_idle_shards(self, offsets: dict[str, int]) -> bool:
+        """
+        Renames idle shards to *.compact; they are merged to the end and deleted.
+        The station creates a new shard (with header) on its next write.
+
+        Returns:
+            bool: True if any shard was renamed.
+        """
+        if self.compact_idle is None:
+            return False
+        renamed = False
+        now = time.time()
+        for path in sorted(filter(lambda p: is_shard(p.name), self.orders_dir.glob(SHARD_GLOB))):
+            compact_path = path.with_name(path.name + COMPACT_SUFFIX)
+            try:
+                if now - path.stat().st_mtime < self.compact_idle or compact_path.exists():
+                    continue
+                os.rename(path, compact_path)
+            except OSError as e:
+                # 💡 Windows refuses the rename while the station has the shard open
+                self.logger.info("Shard %s nyní nelze zkompaktovat: %s", path.name, str(e))
+                continue
+            offsets[compact_path.name] = offsets.pop(path.name, 0)
+            renamed = True
+            self.logger.info("Shard %s bude zkompaktován.", path.name)
+        return renamed
+
+    def _shards(self, offsets: dict[str, int]) -> list[tuple[Path, int, int]]:
+        """Returns (path, offset, size) of every shard with rows not merged yet."""
+        shards = []
+        paths = sorted(self.orders_dir.glob(SHARD_GLOB))
+        paths += sorted(self.orders_dir.glob(SHARD_GLOB + COMPACT_SUFFIX))
+        for path in filter(lambda p: is_shard(p.name), paths):
+            size = path.stat().st_size
+            offset = offsets.get(path.name, 0)
+            if offset > size:
+                self.logger.warning("Shard %s byl zkrácen, čtu ho od začátku.", path.name)
+                offset = 0
+            if size > offset:
+                shards.append((path, offset, size))
+        return shards
+
+    def _open_target(self, name: str, state: dict, seen: Counter):
+        """
+        Opens a journal file (single.sn or a partition) for appending. Its size is
+        stored as pending first, so an interrupted run can be resumed; rows at the end
+        of the file are added to the dedupe window.
+
+        Returns:
+            tuple[TextIO, int]: The open file and the number of columns its header allows.
+        """
+        target = self.orders_dir / name
+        size = target.stat().st_size if target.exists() else 0
+        state["pending"]["sizes"][name] = size
+        self._save_state(state)  # 💡 before the first write
+        seen |= Counter(read_tail(target))  # 💡 union keeps the larger count
+        width = header_width(target)
+        f = target.open("a", encoding="utf-8")
+        if size == 0:
+            f.write(JOURNAL_HEADER + "\n")  # 💡 header on create, per partition
+        return f, width
+
+    def _append(self, target: tuple, batch: list[str], origin: str, written: dict[str, int],
+                name: str):
+        """
+        Writes one batch of merged rows to a journal file (and the history); empties it.
+        The file gets only the columns of its header, the history gets the whole rows.
+
+        Args:
+            target (tuple[TextIO, int]): Journal file open for appending and its width.
+            batch (list[str]): Rows to write.
+            origin (str): History origin key of this run and file.
+            written (dict[str, int]): Rows this run wrote per file (updated); the index
+                of a row within the run is its history key.
+            name (str): Journal file name.
+        """
+        start = written.get(name, 0)
+        f, width = target
+        f.write("".join(fit_row(row, width) + "\n" for row in batch))
+        if self.history:
+            self.history.add_rows(enumerate(batch, start), origin)
+        written[name] = start + len(batch)
+        batch.clear()
+
+    def _finish_compaction(self, state: dict):
+        """Deletes compacted shards that have been merged completely."""
+        for name in [name for name in state["offsets"] if name.endswith(COMPACT_SUFFIX)]:
+            path = self.orders_dir / name
+            if state["offsets"][name] >= path.stat().st_size:
+                path.unlink()
+                del state["offsets"][name]
+                self.logger.info("Shard %s zkompaktován.", name)
+        self._save_state(state)
+
+    def run(self) -> int:
+        """
+        Merges all new shard rows into single.sn (or its partitions).
+
+        Returns:
+            int: Number of rows appended.
+
+        Raises:
+            FileExistsError: If another merge is running.
+            OSError: If the share cannot be read or written (the next run resumes).
+        """
+        self._acquire_lock()
+        try:
+            return self._merge()
+        finally:
+            self._release_lock()
+
+    def _merge(self) -> int:
+        """Merge itself (runs under the lock)."""
+        state = self._load_state()
+        # 💡 dedupe window: rows already at the end of the targets (tail and the rows of an
+        # interrupted run), not every merged row; each entry cancels one streamed row,
+        # so identical rows printed in the same second are all kept
+        seen = Counter()
+        if state["pending"]:
+            seen |= self._recover(state["pending"])
+        state["pending"] = None
+        if self._compact_idle_shards(state["offsets"]):
+            self._save_state(state)
+
+        shards = self._shards(state["offsets"])
+        if not shards:
+            self._finish_compaction(state)
+            return 0
+
+        run = uuid.uuid4().hex
+        state["pending"] = {"run": run, "sizes": {}}
+        progress = dict(state["offsets"])
+        streams = [read_shard(path, offset, size, progress) for path, offset, size in shards]
+        # 💡 every shard is in time order; heapq.merge keeps one row per shard in memory
+        written = self._write_rows(
+            heapq.merge(*streams, key=lambda row: row[:TIMESTAMP_LENGTH]), run, state, seen
+        )
+
+        appended = sum(written.values())
+        state = {"offsets": progress, "pending": None}
+        self._save_state(state)
+        self._finish_compaction(state)
+        self.logger.info(
+            "Sloučeno %d záznamů z %d shardů do %s.",
+            appended,
+            len(shards),
+            ", ".join(sorted(written))
+        )
+        return appended
+
+    def _write_rows(self, merged, run: str, state: dict, seen: Counter) -> dict[str, int]:
+        """
+        Appends the merged rows to their journal files in batches, skipping rows of the
+        dedupe window, and syncs the files.
+
+        Returns:
+            dict[str, int]: Rows written per journal file (every opened file is listed).
+        """
+        files, batches, written = {}, {}, {}
+        try:
+            for row in merged:
+                name = JOURNAL_NAME
+                if ROW_TIMESTAMP.match(row):
+                    name = partition_name(row, self.partition)
+                if name not in files:
+                    files[name] = self._open_target(name, state, seen)
+                    written[name] = 0
+                key = fit_row(row, files[name][1])  # 💡 as the row appears in the file
+                if seen[key]:
+                    seen[key] -= 1
+                    continue
+                batch = batches.setdefault(name, [])
+                batch.append(row)
+                if len(batch) >= BATCH_SIZE:
+                    self._append(files[name], batch, self._history_origin(run, name), written, name)
+            for name, batch in batches.items():
+                self._append(files[name], batch, self._history_origin(run, name), written, name)
+            for f, _ in files.values():
+                f.flush()
+                os.fsync(f.fileno())
+        finally:
+            for f, _ in files.values():
+                f.close()
+        return written
+
+
+def main(argv=None) -> int:
+    """Command line interface of the merge (run periodically on one PC)."""
+    # pylint: disable=import-outside-toplevel
+    from utils.config_reader import ConfigReader
+    from utils.resource_resolver import ResourceResolver
+    from utils.print_history import PrintHistory
+
+    parser = argparse.ArgumentParser(
+        prog="journal_merge", description="Sloučení shardů stanic do single.sn"
+    )
+    parser.add_argument("--orders", help="složka se single.sn (výchozí z [Paths] orders_path)")
+    parser.add_argument("--history", action="store_true", help="uložit i do historie tisku")
+    parser.add_argument("--compact-idle", type=float, metavar="MINUT",
+                        help="zkompaktovat shardy bez zápisu déle než MINUT")
+    parser.add_argument("--compact", action="store_true", help="zkompaktovat všechny shardy")
+    args = parser.parse_args(argv)
+
+    config_reader = ConfigReader()
+    orders_dir = args.orders or config_reader.get_value("Paths", "orders_path")
+    compact_idle = 0 if args.compact else (
+        args.compact_idle * 60 if args.compact_idle is not None else None
+    )
+    history = None
+    if args.history:
+        history = PrintHistory(ResourceResolver().writable(
+            config_reader.get_value("History", "database", fallback="history/print_history.db")
+        ))
+    partition = config_reader.get_value("Journal", "partition", fallback="none").strip().lower()
+    try:
+        merged = JournalMerger(orders_dir, history, compact_idle, partition=partition).run()
+    except FileExistsError:
+        print("Slučování už běží na jiném PC.")
+        return 1
+    finally:
+        if history:
+            history.close()
+    print(f"Sloučeno {merged} záznamů do {orders_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
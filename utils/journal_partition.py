@@ -0,0 +1,371 @@
+"""
+📦 Module: journal_partition.py
+
+Time-partitioned journal: single.sn split into monthly or daily files.
+
+Responsibilities:
+    - Name the partition of a record (single_2026-10.sn or single_2026-10-18.sn),
+      so appends and exists() checks work on a small file ([Journal] partition)
+    - Select only the partitions overlapping a time range and read their rows
+      (plain or gzip-compressed) in time order
+    - Compress closed partitions (single_2025-01.sn → single_2025-01.sn.gz)
+    - Split an existing single.sn into partitions (one-time migration)
+    - Keep a small manifest (single.manifest.json): period, rows, first and last
+      timestamp, size and compression of every partition
+
+Stations only append to partition files and never write the manifest, so they do
+not contend for it; readers select partitions by file name (the name carries the
+period), the manifest is the catalog for operators and tools.
+
+Usage (administration):
+    python -m utils.journal_partition split             # old single.sn → partitions
+    python -m utils.journal_partition compress --keep 3 # gzip all but the last 3 periods
+    python -m utils.journal_partition index             # refresh the manifest
+    python -m utils.journal_partition cat --since 2026-10-01 --until 2026-10-08
+
+Author: Miloslav Hradecky
+"""
+
+# 🧱 Standard library
+import os
+import re
+import sys
+import gzip
+import json
+import argparse
+from pathlib import Path
+from datetime import date, datetime, timedelta
+
+# 🧠 First-party (project-specific)
+from utils.logger import get_logger
+from utils.journal_spool import JOURNAL_HEADER
+
+JOURNAL_NAME = "single.sn"
+MANIFEST_NAME = "single.manifest.json"
+SPLIT_SUFFIX = ".split"
+GZIP_SUFFIX = ".gz"
+PARTITION_SCHEMES = {"none": 0, "month": len("2026-10"), "day": len("2026-10-18")}
+PARTITION_NAME = re.compile(r"^single_(\d{4}-\d{2}(?:-\d{2})?)\.sn(\.gz)?$")
+ROW_TIMESTAMP = re.compile(r"^\d{4}-\d{2}-\d{2} ")
+TIMESTAMP_LENGTH = len("2026-10-18 00:00:00")
+BATCH_SIZE = 10_000
+
+
+def partition_name(timestamp: str, scheme: str) -> str:
+    """
+    Returns the journal file a record belongs to.
+
+    Args:
+        timestamp (str): Record timestamp ("YYYY-MM-DD HH:MM:SS").
+        scheme (str): none | month | day.
+
+    Returns:
+        str: single.sn, single_YYYY-MM.sn or single_YYYY-MM-DD.sn.
+    """
+    if scheme == "none":
+        return JOURNAL_NAME
+    return f"single_{timestamp[:PARTITION_SCHEMES[scheme]]}.sn"
+
+
+def partition_period(name: str) -> str | None:
+    """Returns the period of a partition file ("2026-10"), None for other files."""
+    match = PARTITION_NAME.match(name)
+    return match.group(1) if match else None
+
+
+def open_journal(path: Path):
+    """Opens a journal file for reading, gzip-compressed partitions included."""
+    if path.name.endswith(GZIP_SUFFIX):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return path.open(encoding="utf-8", errors="replace")
+
+
+def read_rows(path: Path) -> list[str]:
+    """Returns the rows of a journal file without header and empty lines."""
+    with open_journal(path) as f:
+        return [
+            row for row in (line.rstrip("\r\n") for line in f)
+            if row and not row.startswith("date;")
+        ]
+
+
+def select_partitions(orders_dir, since: str | None = None,
+                      until: str | None = None) -> list[Path]:
+    """
+    Returns the journal files that may hold records of [since, until), oldest first.
+
+    A compressed partition comes before a plain file of the same period (rows that
+    arrived after compression). An unpartitioned single.sn is always included.
+
+    Args:
+        orders_dir (str | Path): Directory of the journal (orders_path).
+        since (str | None): Lower bound ("YYYY-MM-DD[ HH:MM:SS]"), inclusive.
+        until (str | None): Upper bound, exclusive.
+    """
+    orders_dir = Path(orders_dir)
+    selected = []
+    for path in orders_dir.iterdir():
+        period = partition_period(path.name)
+        if period is None:
+            continue
+        if since is not None and period < since[:len(period)]:
+            continue
+        start = period if len(period) == PARTITION_SCHEMES["day"] else f"{period}-01"
+        if until is not None and start >= until:
+            continue
+        selected.append((period, not path.name.endswith(GZIP_SUFFIX), path))
+    paths = [path for _, _, path in sorted(selected)]
+
+    legacy = orders_dir / JOURNAL_NAME
+    return [legacy] + paths if legacy.exists() else paths
+
+
+def iter_rows(orders_dir, since: str | None = None, until: str | None = None):
+    """Yields journal rows with a timestamp in [since, until), reading only partitions in range."""
+    for path in select_partitions(orders_dir, since, until):
+        for row in read_rows(path):
+            timestamp = row[:TIMESTAMP_LENGTH]
+            if since is not None and timestamp < since:
+                continue
+            if until is not None and timestamp >= until:
+                continue
+            yield row
+
+
+def cutoff_period(scheme: str, keep: int, today: date | None = None) -> str:
+    """Returns the oldest period that is kept uncompressed (the current one and keep - 1 before)."""
+    today = today or date.today()
+    if scheme == "day":
+        return (today - timedelta(days=keep - 1)).isoformat()
+    months = today.year * 12 + today.month - 1 - (keep - 1)
+    return f"{months // 12:04d}-{months % 12 + 1:02d}"
+
+
+class JournalPartitions:
+    """Maintenance of a partitioned journal: split, compress and manifest."""
+
+    def __init__(self, orders_dir, scheme: str = "month"):
+        """
+        Args:
+            orders_dir (str | Path): Directory of the journal (orders_path).
+            scheme (str): month | day.
+        """
+        if scheme not in PARTITION_SCHEMES or scheme == "none":
+            raise ValueError(f"Neplatné dělení journalu: '{scheme}' (month|day)")
+        self.orders_dir = Path(orders_dir)
+        self.scheme = scheme
+        self.manifest_path = self.orders_dir / MANIFEST_NAME
+        self.logger = get_logger("JournalPartitions")
+
+    @staticmethod
+    def _write(path: Path, rows: list[str]):
+        """Writes a complete journal file (header included) atomically."""
+        tmp = path.with_name(path.name + ".tmp")
+        opener = gzip.open if path.name.endswith(GZIP_SUFFIX) else open
+        with opener(tmp, "wt", encoding="utf-8") as f:
+            f.write(JOURNAL_HEADER + "\n")
+            f.write("".join(row + "\n" for row in rows))
+        os.replace(tmp, path)
+
+    def _flush_split(self, buffers: dict[str, list[str]]) -> set[str]:
+        """Appends buffered rows to the temporary files of their partitions."""
+        for name, rows in buffers.items():
+            tmp = self.orders_dir / (name + SPLIT_SUFFIX + ".tmp")
+            with tmp.open("a", encoding="utf-8") as f:
+                f.write("".join(row + "\n" for row in rows))
+        names = set(buffers)
+        buffers.clear()
+        return names
+
+    def _split_rows(self, work: Path) -> set[str]:
+        """
+        Split pass 1: rows of the old journal to one temporary file per partition
+        (memory bounded by a batch).
+
+        Returns:
+            set[str]: Names of the partitions that got rows.
+        """
+        buffers, names, buffered, skipped = {}, set(), 0, 0
+        for stale in self.orders_dir.glob("*" + SPLIT_SUFFIX + ".tmp"):
+            stale.unlink()
+        with open_journal(work) as f:
+            for line in f:
+                row = line.rstrip("\r\n")
+                if not ROW_TIMESTAMP.match(row):
+                    if row and not row.startswith("date;"):
+                        skipped += 1
+                    continue
+                buffers.setdefault(partition_name(row, self.scheme), []).append(row)
+                buffered += 1
+                if buffered >= BATCH_SIZE:
+                    names |= self._flush_split(buffers)
+                    buffered = 0
+        names |= self._flush_split(buffers)
+        if skipped:
+            self.logger.warning("Při rozdělení přeskočeno %d řádků bez časové značky.", skipped)
+        return names
+
+    def _merge_split(self, names: set[str]) -> int:
+        """
+        Split pass 2: one partition at a time, older rows before those stations already
+        wrote; rows present in both are kept once.
+
+        Returns:
+            int: Number of rows moved from the old journal.
+        """
+        moved = 0
+        for name in sorted(names):
+            path = self.orders_dir / name
+            tmp = path.with_name(name + SPLIT_SUFFIX + ".tmp")
+            existing = read_rows(path) if path.exists() else []
+            known = set(existing)
+            older = [row for row in read_rows(tmp) if row not in known]
+            self._write(path, older + existing)
+            tmp.unlink()
+            moved += len(older)
+        return moved
+
+    def split(self) -> int:
+        """
+        Moves the rows of an unpartitioned single.sn into partitions (run with stations
+        stopped). Rows that stations already wrote to a partition are kept after the
+        older ones; repeating an interrupted split does not duplicate rows.
+
+        Returns:
+            int: Number of rows moved.
+        """
+        legacy = self.orders_dir / JOURNAL_NAME
+        work = legacy.with_name(JOURNAL_NAME + SPLIT_SUFFIX)
+        if legacy.exists() and not work.exists():
+            os.rename(legacy, work)  # 💡 stations now create partitions only
+        if not work.exists():
+            return 0
+
+        names = self._split_rows(work)
+        moved = self._merge_split(names)
+        work.unlink()
+        self.logger.info("single.sn rozdělen do %d partic (%d záznamů).", len(names), moved)
+        self.index()
+        return moved
+
+    def compress(self, keep: int = 3, today: date | None = None) -> int:
+        """
+        Gzips plain partitions older than the last `keep` periods. Rows that arrived
+        after a partition was compressed (late journal spool) are added to its .gz.
+
+        Returns:
+            int: Number of compressed partitions.
+        """
+        cutoff = cutoff_period(self.scheme, keep, today)
+        compressed = 0
+        for path in sorted(self.orders_dir.iterdir()):
+            period = partition_period(path.name)
+            if period is None or path.name.endswith(GZIP_SUFFIX) or period >= cutoff:
+                continue
+            gz_path = path.with_name(path.name + GZIP_SUFFIX)
+            existing = read_rows(gz_path) if gz_path.exists() else []
+            known = set(existing)
+            self._write(gz_path, existing + [row for row in read_rows(path) if row not in known])
+            try:
+                path.unlink()
+            except OSError as e:
+                # 💡 a station still has the file open; the next run finishes it
+                self.logger.warning("Partici %s nelze smazat: %s", path.name, str(e))
+                continue
+            compressed += 1
+            self.logger.info("Partice %s zkomprimována.", path.name)
+        self.index()
+        return compressed
+
+    def _load_manifest(self) -> dict:
+        """Reads the manifest (empty if missing or damaged)."""
+        try:
+            return json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def index(self) -> dict:
+        """
+        Rewrites the manifest. Files whose size and modification time did not change
+        since the last index are not read again.
+
+        Returns:
+            dict: The manifest.
+        """
+        previous = {
+            entry["name"]: entry for entry in self._load_manifest().get("partitions", [])
+        }
+        entries = []
+        for path in select_partitions(self.orders_dir):
+            period = partition_period(path.name)
+            if period is None:
+                continue
+            stat = path.stat()
+            entry = previous.get(path.name)
+            if not entry or entry["bytes"] != stat.st_size or entry["mtime"] != stat.st_mtime:
+                rows = read_rows(path)
+                entry = {
+                    "name": path.name,
+                    "period": period,
+                    "compressed": path.name.endswith(GZIP_SUFFIX),
+                    "rows": len(rows),
+                    "first": min(rows)[:TIMESTAMP_LENGTH] if rows else None,
+                    "last": max(rows)[:TIMESTAMP_LENGTH] if rows else None,
+                    "bytes": stat.st_size,
+                    "mtime": stat.st_mtime,
+                }
+            entries.append(entry)
+
+        manifest = {
+            "scheme": self.scheme,
+            "updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "partitions": entries,
+        }
+        tmp = self.manifest_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(tmp, self.manifest_path)
+        return manifest
+
+
+def main(argv=None) -> int:
+    """Command line interface for maintaining and reading the partitioned journal."""
+    # pylint: disable=import-outside-toplevel
+    from utils.config_reader import ConfigReader
+
+    parser = argparse.ArgumentParser(prog="journal_partition", description="Partice single.sn")
+    parser.add_argument("--orders", help="složka journalu (výchozí z [Paths] orders_path)")
+    parser.add_argument("--scheme", choices=("month", "day"),
+                        help="dělení (výchozí z [Journal] partition)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("split", help="rozdělení starého single.sn do partic")
+    compress_parser = commands.add_parser("compress", help="komprese starých partic")
+    compress_parser.add_argument("--keep", type=int, default=3,
+                                 help="počet posledních období bez komprese")
+    commands.add_parser("index", help="obnovení manifestu")
+    cat_parser = commands.add_parser("cat", help="výpis záznamů v rozsahu")
+    cat_parser.add_argument("--since")
+    cat_parser.add_argument("--until")
+
+    args = parser.parse_args(argv)
+    config_reader = ConfigReader()
+    orders_dir = args.orders or config_reader.get_value("Paths", "orders_path")
+
+    if args.command == "cat":
+        for row in iter_rows(orders_dir, args.since, args.until):
+            print(row)
+        return 0
+
+    scheme = args.scheme or config_reader.get_value("Journal", "partition", fallback="month")
+    partitions = JournalPartitions(orders_dir, scheme.strip().lower())
+    if args.command == "split":
+        print(f"Přesunuto {partitions.split()} záznamů do partic")
+    elif args.command == "compress":
+        print(f"Zkomprimováno {partitions.compress(args.keep)} partic")
+    else:
+        print(f"Manifest: {len(partitions.index()['partitions'])} partic")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
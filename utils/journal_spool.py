@@ -0,0 +1,357 @@
+"""
+📦 Module: journal_spool.py
+
+Local write-ahead spool for journal (single.sn) records.
+
+Responsibilities:
+    - Append every record to a local append-only file first (fsync, no share I/O)
+    - Ship pending records to the share in order from a background thread
+    - Retry with exponential backoff while the share is slow or down
+    - Replay idempotently after a crash: the batch in flight is recorded by WAL
+      sequence numbers and the size of the target before the write, so only rows
+      of that batch found after that offset are treated as shipped
+    - Expose the number of records not yet shipped (backlog counter)
+    - Write only the columns of the target's header: an existing single.sn with the
+      older five-column header keeps getting five-column rows
+
+Files in the spool directory:
+    journal.wal  – JSON lines {"seq": 1, "target": "T:/Prikazy/single.sn", "row": "..."}
+    journal.ack  – sequence number of the last record shipped to the share
+    journal.inflight – {"target": ..., "first": 5, "last": 9, "offset": 1234} of the
+                   last batch handed to the share (resolved after a failure or crash)
+
+Author: Miloslav Hradecky
+"""
+
+# 🧱 Standard library
+import os
+import json
+import threading
+from pathlib import Path
+from itertools import groupby
+
+# 🧠 First-party (project-specific)
+from utils.logger import get_logger
+
+JOURNAL_HEADER = "date;sn;copy;printer;prefix;source;reprint"
+JOURNAL_COLUMNS = tuple(JOURNAL_HEADER.split(";"))
+TAIL_BYTES = 64 * 1024
+
+
+def header_width(target: Path) -> int:
+    """
+    Returns how many columns a row appended to a journal file may have.
+
+    A file created before columns were added keeps its shorter header (e.g. the
+    five-column date;sn;copy;printer;prefix); new columns are written only under a
+    header that names them. A missing, empty or unknown header allows all columns.
+    """
+    try:
+        with target.open(encoding="utf-8", errors="ignore") as f:
+            header = f.readline().strip()
+    except FileNotFoundError:
+        return len(JOURNAL_COLUMNS)
+    columns = tuple(header.split(";"))
+    if header and JOURNAL_COLUMNS[:len(columns)] == columns:
+        return len(columns)
+    return len(JOURNAL_COLUMNS)
+
+
+def fit_row(row: str, width: int) -> str:
+    """Cuts a row to the first `width` columns of its journal file."""
+    if width >= len(JOURNAL_COLUMNS):
+        return row
+    return ";".join(row.split(";")[:width])
+
+
+def append_rows(target: Path, rows: list[str]):
+    """
+    Appends rows to a journal file, writing the header when the file is created
+    and only the columns of its header otherwise.
+
+    Args:
+        target (Path): Journal file on the share.
+        rows (list[str]): Rows without trailing newlines.
+
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    file_exists = target.exists()
+    width = header_width(target) if file_exists else len(JOURNAL_COLUMNS)
+    with target.open(mode="a", encoding="utf-8") as f:
+        if not file_exists:
+            f.write(JOURNAL_HEADER + "\n")
+        f.write("".join(fit_row(row, width) + "\n" for row in rows))
+
+
+def read_tail(target: Path, size: int = TAIL_BYTES) -> set[str]:
+    """Returns the set of rows in the last `size` bytes of a journal file."""
+    if not target.exists():
+        return set()
+    with target.open("rb") as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - size))
+        return set(f.read().decode("utf-8", errors="ignore").splitlines())
+
+
+class JournalSpool:  # pylint: disable=too-many-instance-attributes
+    """
+    Write-ahead spool: local append first, ordered background shipping to the share.
+    """
+
+    def __init__(self, spool_dir, sync_interval: float = 5.0, backoff_max: float = 60.0,
+                 sink=append_rows):
+        """
+        Args:
+            spool_dir (str | Path): Local directory for journal.wal and journal.ack.
+            sync_interval (float): Seconds between shipping attempts when idle.
+            backoff_max (float): Upper bound of the retry delay after a failure.
+            sink (Callable[[Path, list[str]], None]): Writes rows to a target file.
+        """
+        self.spool_dir = Path(spool_dir)
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        self.wal_path = self.spool_dir / "journal.wal"
+        self.ack_path = self.spool_dir / "journal.ack"
+        self.inflight_path = self.spool_dir / "journal.inflight"
+        self.sync_interval = sync_interval
+        self.backoff_max = backoff_max
+        self.sink = sink
+        self.logger = get_logger("JournalSpool")
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._repair_wal()
+        self._acked = self._read_ack()
+        self._last_seq = max(self._acked, self._scan_last_seq())
+
+    @property
+    def pending(self) -> int:
+        """Returns the number of records not shipped to the share yet."""
+        with self._lock:
+            return self._last_seq - self._acked
+
+    def _repair_wal(self):
+        """Cuts off a record torn by a crash so the next append starts on a new line."""
+        if not self.wal_path.exists():
+            return
+        data = self.wal_path.read_bytes()
+        if data and not data.endswith(b"\n"):
+            with self.wal_path.open("r+b") as f:
+                f.truncate(data.rfind(b"\n") + 1)
+            self.logger.warning("Neúplný poslední záznam ve spoolu byl odstraněn.")
+
+    def _read_ack(self) -> int:
+        """Reads the last shipped sequence number."""
+        try:
+            return int(self.ack_path.read_text(encoding="utf-8").strip() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def _write_ack(self, seq: int):
+        """Stores the last shipped sequence number atomically."""
+        tmp = self.ack_path.with_suffix(".tmp")
+        tmp.write_text(str(seq), encoding="utf-8")
+        os.replace(tmp, self.ack_path)
+
+    def _write_inflight(self, target: str, first: int, last: int, offset: int):
+        """Records the batch about to be written and the target size before the write."""
+        tmp = self.inflight_path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({"target": target, "first": first, "last": last, "offset": offset}),
+            encoding="utf-8"
+        )
+        os.replace(tmp, self.inflight_path)
+
+    def _resolve_inflight(self, records: list[dict]) -> int:
+        """
+        Finds out how much of the last batch in flight reached the share.
+
+        The batch rows are matched in order against the rows written after the
+        recorded offset (rows of other stations may be interleaved), so identical
+        rows of different records are counted separately and older rows are never
+        mistaken for shipped ones.
+
+        Args:
+            records (list[dict]): Pending WAL records.
+
+        Returns:
+            int: Last sequence number known to be on the share (the current ack if none).
+
+        Raises:
+            OSError: If the target cannot be read.
+        """
+        try:
+            inflight = json.loads(self.inflight_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return self._acked
+        batch = [
+            r for r in records
+            if r["target"] == inflight["target"]
+            and inflight["first"] <= r["seq"] <= inflight["last"]
+        ]
+        target = Path(inflight["target"])
+        if not batch or not target.exists():
+            return self._acked
+
+        with target.open("r+b") as f:
+            f.seek(inflight["offset"])
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.write(b"\n")  # 💡 a torn row must not swallow the next one
+        written = data.decode("utf-8", errors="ignore").splitlines()
+        width = header_width(target)
+
+        shipped = self._acked
+        position = 0
+        for record in batch:
+            try:
+                position = written.index(fit_row(record["row"], width), position) + 1
+            except ValueError:
+                break
+            shipped = record["seq"]
+        return shipped
+
+    def _read_records(self) -> list[dict]:
+        """Reads all complete records from the WAL (a torn last line is ignored)."""
+        records = []
+        try:
+            with self.wal_path.open(encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        self.logger.warning("Poškozený záznam ve spoolu přeskočen: %r", line)
+        except FileNotFoundError:
+            pass
+        return records
+
+    def _scan_last_seq(self) -> int:
+        """Returns the highest sequence number stored in the WAL."""
+        records = self._read_records()
+        return records[-1]["seq"] if records else 0
+
+    def append(self, target, row: str) -> int:
+        """
+        Durably stores one journal row locally and wakes the syncer.
+
+        Args:
+            target (str | Path): Journal file on the share the row belongs to.
+            row (str): Row without trailing newline.
+
+        Returns:
+            int: Sequence number of the record.
+
+        Raises:
+            OSError: If the local spool cannot be written.
+        """
+        with self._lock:
+            seq = self._last_seq + 1
+            record = {"seq": seq, "target": str(target), "row": row}
+            with self.wal_path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._last_seq = seq
+        self._wake.set()
+        return seq
+
+    def flush(self) -> bool:
+        """
+        Ships all pending records to the share in order.
+
+        Returns:
+            bool: True if nothing is left pending.
+        """
+        with self._lock:
+            acked = self._acked
+        records = [r for r in self._read_records() if r["seq"] > acked]
+
+        try:
+            shipped = self._resolve_inflight(records)
+        except OSError as e:
+            self.logger.warning("Ověření posledního zápisu selhalo: %s", str(e))
+            return False
+        if shipped > acked:
+            self._write_ack(shipped)
+            with self._lock:
+                self._acked = shipped
+            records = [r for r in records if r["seq"] > shipped]
+
+        for target, group in groupby(records, key=lambda r: r["target"]):
+            batch = list(group)
+            try:
+                path = Path(target)
+                offset = path.stat().st_size if path.exists() else 0
+                self._write_inflight(target, batch[0]["seq"], batch[-1]["seq"], offset)
+                self.sink(path, [r["row"] for r in batch])
+                self._write_ack(batch[-1]["seq"])
+            except OSError as e:
+                self.logger.warning(
+                    "Zápis do %s selhal, záznamy zůstávají ve spoolu: %s",
+                    target,
+                    str(e)
+                )
+                return False
+
+            with self._lock:
+                self._acked = batch[-1]["seq"]
+
+        self._compact()
+        return True
+
+    def _compact(self):
+        """Truncates the WAL once every record in it has been shipped."""
+        with self._lock:
+            if self._acked == self._last_seq and self.wal_path.exists():
+                self.wal_path.write_text("", encoding="utf-8")
+
+    def start(self):
+        """Starts the background syncer."""
+        if self._thread is None:
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="JournalSpool", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 3.0):
+        """
+        Stops the syncer. Its last shipping attempt (skipped while the share is failing)
+        is waited for at most `timeout` seconds; records not shipped stay in the WAL
+        and are shipped after the next start, so closing never hangs on the share.
+        """
+        self._stop_event.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self.pending:
+            self.logger.info("Nezapsané záznamy (%d) zůstávají ve spoolu.", self.pending)
+
+    def _run(self):
+        """Syncer loop: ship on every append, retry failures with exponential backoff."""
+        delay = self.sync_interval
+        failing = False
+        while True:
+            if failing:
+                stopped = self._stop_event.wait(delay)  # 💡 appends do not cut the backoff short
+            else:
+                self._wake.wait(delay)
+                self._wake.clear()
+                stopped = self._stop_event.is_set()
+            if stopped:
+                if self.pending and not failing:
+                    self.flush()  # 💡 last attempt, in this thread; stop() does not wait long
+                break
+
+            if self.pending == 0 or self.flush():
+                failing = False
+                delay = self.sync_interval
+            else:
+                delay = min(delay * 2, self.backoff_max) if failing else 1.0
+                failing = True
+                self.logger.info(
+                    "Nezapsaných záznamů: %d, další pokus za %.0f s.",
+                    self.pending,
+                    delay
+                )
@@ -1,39 +1,28 @@
 """
 📦 Module: login_services.py
 
-Provides shared services for login logic, including decryption and BarTender process control.
+Provides shared services for login logic (credential decryption, user sessions).
 
 Author: Miloslav Hradecky
 """
 
-# 🧱 Standard library
-import configparser
-
 # 🧠 First-party (project-specific)
-from utils.bartender_utils import BartenderUtils
-from utils.messenger import Messenger
-
 from models.user_model import SzvDecrypt
+from models.user_session import UserSession
 
 
 class LoginServices:
     """
     Container for login-related services.
-    Provides methods for password validation and BarTender process control.
+    Provides password validation and badge re-authentication returning a UserSession.
+    Shared by LoginController and PrintController, so both use one credential cache.
     """
 
-    def __init__(self, config: configparser.ConfigParser, messenger: Messenger):
-        """
-        Initializes login services with config and messenger.
-
-        Args:
-            config (ConfigParser): Loaded configuration file.
-            messenger (Messenger): Messenger instance for user feedback.
-        """
+    def __init__(self):
+        """Initializes login services (loads the credential decrypter)."""
         self._decrypter = SzvDecrypt()
-        self._bartender = BartenderUtils(messenger=messenger, config=config)
 
-    def check_login(self, password: str) -> bool:
+    def check_login(self, password: str) -> UserSession | None:
         """
         Checks whether the given password is valid using the decryption service.
 
@@ -41,10 +30,20 @@ class LoginServices:
             password (str): The password to validate.
 
         Returns:
-            bool: True if valid, False otherwise.
+            UserSession | None: New session of the user, None if the password is invalid.
         """
-        return self._decrypter.check_login(password)
+        user_info = self._decrypter.check_login(password)
+        return UserSession(user_info) if user_info else None
 
-    def kill_bartender_processes(self):
-        """Terminates any running BarTender processes."""
-        self._bartender.kill_processes()
+    def switch_by_badge(self, badge: str) -> UserSession | None:
+        """
+        Returns a new session if the scanned value is a known badge (cached lookup only).
+
+        Args:
+            badge (str): Scanned value (ID card).
+
+        Returns:
+            UserSession | None: Session of the badge owner, None for any other value.
+        """
+        user_info = self._decrypter.lookup_cached(badge)
+        return UserSession(user_info) if user_info else None
@@ -6,20 +6,140 @@ Utility class for displaying message dialogs in a PyQt6 application.
 Responsibilities:
     - Show error, info, and warning dialogs with consistent styling
     - Center dialogs relative to parent or screen
-    - Display timed non-blocking info popups
+    - Show routine conditions as queued, coalescing toasts (never blocks the caller)
+
+Blocking dialogs are reserved for fatal conditions (startup, login, crash);
+everything on the print path goes through `notify`.
 
 Used across controllers to provide user feedback.
 
 Author: Miloslav Hradecky
 """
 
+# 🧱 Standard library
+from collections import deque
+
 # 🧩 Third-party libraries
-from PyQt6.QtWidgets import QMessageBox, QApplication, QWidget, QDialog, QLabel, QVBoxLayout
-from PyQt6.QtGui import QIcon
-from PyQt6.QtCore import QTimer, Qt
+from PyQt6.QtWidgets import QMessageBox, QApplication, QWidget, QLabel, QVBoxLayout
+from PyQt6.QtCore import QTimer, Qt, pyqtSignal
 
 # 🧠 First-party (project-specific)
-from utils.resource_resolver import ResourceResolver
+from utils import asset_cache
+
+
+class ToastArea(QWidget):
+    """
+    Frameless, non-activating stack of toasts shown at the bottom of a window.
+
+    Identical messages collapse into one toast with a counter, at most
+    `max_visible` toasts are shown and the rest wait in a queue.
+    `post` may be called from any thread; toasts are created in the GUI thread.
+    """
+
+    posted = pyqtSignal(str, str)
+    _screen_area = None
+
+    def __init__(self, parent=None, timeout_ms: int = 5000, max_visible: int = 4):
+        """
+        Args:
+            parent (QWidget, optional): Window the toasts are anchored to.
+            timeout_ms (int): How long a toast stays visible after its last repeat.
+            max_visible (int): Maximum number of toasts shown at once.
+        """
+        super().__init__(parent)
+        self.setObjectName("ToastArea")
+        self.setWindowFlags(
+            Qt.WindowType.Tool |
+            Qt.WindowType.FramelessWindowHint |
+            Qt.WindowType.WindowStaysOnTopHint
+        )
+        self.setAttribute(Qt.WidgetAttribute.WA_ShowWithoutActivating)  # 💡 keeps scanner focus
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+
+        self.timeout_ms = timeout_ms
+        self.max_visible = max_visible
+        self._toasts = {}
+        self._pending = deque()
+
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self.posted.connect(self._show_toast)
+
+    @classmethod
+    def for_parent(cls, parent=None) -> "ToastArea":
+        """Returns the toast area of a window (one shared area per window)."""
+        if parent is None:
+            if cls._screen_area is None:
+                cls._screen_area = cls()
+            return cls._screen_area
+        area = parent.findChild(cls)
+        return area if area is not None else cls(parent)
+
+    def post(self, message: str, level: str = "info"):
+        """Queues a toast (thread-safe)."""
+        self.posted.emit(message, level)
+
+    def _show_toast(self, message: str, level: str):
+        """Shows a new toast, bumps the counter of a visible one, or queues it."""
+        key = (level, message)
+        toast = self._toasts.get(key)
+        if toast is not None:
+            label, timer, count = toast
+            self._toasts[key] = (label, timer, count + 1)
+            label.setText(f"{message}  (×{count + 1})")
+            timer.start(self.timeout_ms)
+            self._reposition()
+            return
+
+        queued = next((item for item in self._pending if item[0] == key), None)
+        if queued is not None:
+            queued[1] += 1
+            return
+        if len(self._toasts) >= self.max_visible:
+            self._pending.append([key, 1])
+            return
+        self._add_toast(key, 1)
+
+    def _add_toast(self, key: tuple[str, str], count: int):
+        """Creates the label and expiry timer of one toast."""
+        level, message = key
+        label = QLabel(message if count == 1 else f"{message}  (×{count})")
+        label.setObjectName("Toast")
+        label.setProperty("level", level)
+        label.setWordWrap(True)
+        self._layout.addWidget(label)
+
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(lambda: self._expire(key))
+        timer.start(self.timeout_ms)
+        self._toasts[key] = (label, timer, count)
+        self._reposition()
+
+    def _expire(self, key: tuple[str, str]):
+        """Removes an expired toast and shows the next queued one."""
+        label, timer, _ = self._toasts.pop(key)
+        timer.deleteLater()
+        label.deleteLater()
+        if self._pending:
+            next_key, count = self._pending.popleft()
+            self._add_toast(next_key, count)
+        elif not self._toasts:
+            self.hide()
+            return
+        self._reposition()
+
+    def _reposition(self):
+        """Places the stack at the bottom of the parent window (or of the screen)."""
+        anchor = self.parentWidget()
+        if anchor is not None and anchor.isVisible():
+            area = anchor.frameGeometry()
+        else:
+            area = QApplication.primaryScreen().availableGeometry()
+        self.setFixedWidth(min(area.width() - 20, 340))
+        self.adjustSize()
+        self.move(area.center().x() - self.width() // 2, area.bottom() - self.height() - 20)
+        self.show()
 
 
 class Messenger:
@@ -27,7 +147,8 @@ class Messenger:
     Wrapper class for displaying styled message dialogs in PyQt6.
 
     Supports:
-        - Blocking dialogs: error, info, warning
+        - Blocking dialogs: error, info, warning (fatal conditions only)
+        - Non-blocking, coalescing toasts: notify
         - Non-blocking timed info popups
         - Centering dialogs on parent or screen
     """
@@ -39,14 +160,15 @@ class Messenger:
         Args:
             parent (QWidget, optional): Parent widget for dialog positioning.
         """
-        self.resolver = ResourceResolver()
-        self.icon_path = self.resolver.resource("views/assets/message.ico")
+        self.icon = asset_cache.icon(asset_cache.MESSAGE_ICON)
 
         if isinstance(parent, QWidget):
             self.parent = parent
         else:
             self.parent = None
 
+        self.toasts = ToastArea.for_parent(self.parent)  # 💡 created in the GUI thread
+
     def center_dialog(self, dialog: QWidget):
         """
         Centers the dialog relative to the parent widget or screen.
@@ -54,7 +176,6 @@ class Messenger:
         Args:
             dialog (QWidget): The dialog to center.
         """
-        QApplication.instance().processEvents()
         dialog.adjustSize()
         rect = dialog.frameGeometry()
 
@@ -67,6 +188,17 @@ class Messenger:
         rect.moveCenter(parent_center)
         dialog.move(rect.topLeft())
 
+    def notify(self, message: str, level: str = "info"):
+        """
+        Shows a non-blocking toast; repeated identical messages collapse with a counter.
+        Safe to call from worker threads.
+
+        Args:
+            message (str): The message to display.
+            level (str): "error", "warning" or "info" (styling only).
+        """
+        self.toasts.post(message, level)
+
     def error(self, message: str, title: str = "Error"):
         """
         Displays a blocking error dialog.
@@ -79,7 +211,7 @@ class Messenger:
         box.setIcon(QMessageBox.Icon.Critical)
         box.setWindowTitle(title)
         box.setText(message)
-        box.setWindowIcon(QIcon(str(self.icon_path)))
+        box.setWindowIcon(self.icon)
         box.show()
         self.center_dialog(box)
         box.exec()
@@ -96,7 +228,7 @@ class Messenger:
         box.setIcon(QMessageBox.Icon.Information)
         box.setWindowTitle(title)
         box.setText(message)
-        box.setWindowIcon(QIcon(str(self.icon_path)))
+        box.setWindowIcon(self.icon)
         box.show()
         self.center_dialog(box)
         box.exec()
@@ -113,47 +245,7 @@ class Messenger:
         box.setIcon(QMessageBox.Icon.Warning)
         box.setWindowTitle(title)
         box.setText(message)
-        box.setWindowIcon(QIcon(str(self.icon_path)))
+        box.setWindowIcon(self.icon)
         box.show()
         self.center_dialog(box)
         box.exec()
-
-    def auto_info_dialog(self, message: str, timeout_ms: int = 3000, title: str = "Zpracování"):
-        """
-        Displays a non-blocking info dialog that automatically closes after a timeout.
-
-        Args:
-            message (str): The message to display.
-            timeout_ms (int): Time in milliseconds before the dialog closes.
-            title (str): Dialog window title.
-        """
-        dialog = QDialog(self.parent)
-        dialog.setWindowTitle(title)
-        dialog.setObjectName("PrintInfoDialog")
-        dialog.setWindowModality(Qt.WindowModality.NonModal)
-
-        # ✅ WindowFlags - displays a header with an icon, but no buttons
-        dialog.setWindowFlags(
-            Qt.WindowType.Window |
-            Qt.WindowType.WindowTitleHint |
-            Qt.WindowType.WindowSystemMenuHint |
-            Qt.WindowType.CustomizeWindowHint
-        )
-        # ✅ Header icon settings
-        dialog.setWindowIcon(QIcon(str(self.icon_path)))
-
-        dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
-
-        layout = QVBoxLayout()
-        label = QLabel(message)
-        label.setObjectName("PrintInfoLabel")
-        label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(label)
-        dialog.setLayout(layout)
-
-        dialog.setMinimumSize(300, 100)
-        dialog.adjustSize()
-        self.center_dialog(dialog)
-        dialog.show()
-
-        QTimer.singleShot(timeout_ms, dialog.close)
@@ -7,7 +7,7 @@ Responsibilities:
     - Load paths from the [Paths] section of config.ini
     - Check existence of each path or file
     - Log missing or invalid entries
-    - Notify user via Messenger dialogs
+    - Notify user with one summary dialog (startup cannot continue)
 
 Used during startup or diagnostics to ensure environment integrity.
 
@@ -61,23 +61,17 @@ class PathValidator:
                 path = self.resolver.resolve(raw)
                 if not path.exists():
                     self.logger.warning("Cesta nebo soubor neexistuje: %s → %s", key, path)
-                    self.messenger.warning(
-                        f"Cesta nebo soubor neexistuje:\n{path}",
-                        "Path Validation"
-                    )
                     self.missing.append((key, path))
             except (FileNotFoundError, ValueError, OSError, RuntimeError) as e:
                 self.logger.error("Chyba při čtení %s: %s", key, str(e))
-                self.messenger.error(f"Chyba při čtení '{key}': {e}", "Path Validation")
                 self.missing.append((key, "chyba v configu"))
 
         if self.missing:
-            self.messenger.error(
-                "Následující cesty jsou neplatné nebo chybí soubor:",
+            details = "\n".join(f"{key}: {path}" for key, path in self.missing)
+            self.messenger.error(  # 💡 one dialog for all paths instead of one per path
+                f"Následující cesty jsou neplatné nebo chybí soubor:\n\n{details}",
                 "Path Validation"
             )
-            for key, path in self.missing:
-                self.messenger.error(f"\n{key}\n{path}", "Path Validation")
             return False
 
         self.logger.info("Všechny cesty v configu jsou validní.")
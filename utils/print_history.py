@@ -0,0 +1,332 @@
+"""
+📦 Module: print_history.py
+
+Local, indexed print history (SQLite in WAL mode) written alongside single.sn.
+
+Responsibilities:
+    - Record every printed label (timestamp, serial, copies, printer, prefix, source)
+    - Answer lookups by serial, time range, prefix and printer through indexes
+    - Import existing single.sn files (5-, 6- and current 7-column rows), including
+      gzip-compressed journal partitions
+    - Export records back to the single.sn CSV layout for older tools
+
+The database lives on the local disk; SQLite must not be opened on a network share.
+Live recording stores every label, including identical rows of one scan or second.
+Imports are idempotent: each imported row is keyed by its origin (file and line,
+or shard and offset), so repeating an import does not store it twice.
+
+Usage (administration):
+    python -m utils.print_history import T:/Prikazy/single.sn
+    python -m utils.print_history import T:/Prikazy/single_2025-01.sn.gz
+    python -m utils.print_history lookup SN123456
+    python -m utils.print_history check SN123456        (exit code 1 if never printed)
+    python -m utils.print_history export single_export.sn --since 2025-01-01
+    python -m utils.print_history export single_full.sn --full
+
+Author: Miloslav Hradecky
+"""
+
+# 🧱 Standard library
+import sys
+import sqlite3
+import argparse
+import threading
+from pathlib import Path
+
+# 🧠 First-party (project-specific)
+from utils.logger import get_logger
+from utils.journal_spool import JOURNAL_HEADER
+from utils.journal_partition import open_journal
+
+COLUMNS = ("printed_at", "serial", "copies", "printer", "prefix", "source", "reprint")
+LEGACY_COLUMNS = COLUMNS[:5]
+LEGACY_HEADER = "date;sn;copy;printer;prefix"
+
+TABLE = """
+CREATE TABLE IF NOT EXISTS prints (
+    id          INTEGER PRIMARY KEY,
+    printed_at  TEXT    NOT NULL,
+    serial      TEXT    NOT NULL,
+    copies      INTEGER NOT NULL,
+    printer     TEXT    NOT NULL,
+    prefix      TEXT    NOT NULL,
+    source      TEXT    NOT NULL DEFAULT '',
+    reprint     INTEGER NOT NULL DEFAULT 0,
+    origin      TEXT,
+    origin_pos  INTEGER
+);
+"""
+
+INDEXES = """
+CREATE UNIQUE INDEX IF NOT EXISTS ux_prints_origin
+    ON prints (origin, origin_pos) WHERE origin IS NOT NULL;
+CREATE INDEX IF NOT EXISTS ix_prints_serial ON prints (serial);
+CREATE INDEX IF NOT EXISTS ix_prints_printed_at ON prints (printed_at);
+CREATE INDEX IF NOT EXISTS ix_prints_prefix ON prints (prefix, printed_at);
+CREATE INDEX IF NOT EXISTS ix_prints_printer ON prints (printer, printed_at);
+"""
+
+
+def parse_journal_row(row: str) -> tuple | None:
+    """
+    Converts one single.sn row to a database record.
+
+    Returns:
+        tuple | None: (printed_at, serial, copies, printer, prefix, source, reprint),
+        None for the header, empty or malformed rows.
+    """
+    parts = row.rstrip("\r\n").split(";")
+    if len(parts) == 5:
+        parts.append("")  # 💡 rows written before the source column existed
+    if len(parts) == 6:
+        parts.append("0")  # 💡 rows written before the reprint column existed
+    if len(parts) != 7 or parts[0] == "date":
+        return None
+    try:
+        copies = int(parts[2])
+    except ValueError:
+        return None
+    return parts[0], parts[1], copies, parts[3], parts[4], parts[5], int(parts[6] == "1")
+
+
+class PrintHistory:
+    """
+    Thread-safe wrapper of the history database (one connection, one lock).
+    """
+
+    def __init__(self, db_path):
+        """
+        Opens (and creates if needed) the history database.
+
+        Args:
+            db_path (str | Path): Local path of the SQLite file.
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.logger = get_logger("PrintHistory")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # 💡 durable enough with WAL
+        self._conn.executescript(TABLE)
+        self._migrate()
+        self._conn.executescript(INDEXES)
+
+    def _migrate(self):
+        """
+        Adds columns missing in databases created by older versions and drops the
+        row-level unique index, which merged identical labels printed in one second.
+        """
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(prints)")}
+        with self._conn:
+            if "reprint" not in columns:
+                self._conn.execute(
+                    "ALTER TABLE prints ADD COLUMN reprint INTEGER NOT NULL DEFAULT 0"
+                )
+            if "origin" not in columns:
+                self._conn.execute("ALTER TABLE prints ADD COLUMN origin TEXT")
+                self._conn.execute("ALTER TABLE prints ADD COLUMN origin_pos INTEGER")
+            self._conn.execute("DROP INDEX IF EXISTS ux_prints_row")
+
+    def close(self):
+        """Closes the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def add_records(self, records) -> int:
+        """
+        Stores printed labels (live recording, every record is stored).
+
+        Args:
+            records (Iterable[tuple]): (printed_at, serial, copies, printer, prefix, source,
+                reprint).
+
+        Returns:
+            int: Number of stored records.
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.executemany(
+                f"INSERT INTO prints ({', '.join(COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(COLUMNS))})",
+                records
+            )
+            return cursor.rowcount
+
+    def add_rows(self, rows, origin: str) -> int:
+        """
+        Imports single.sn rows keyed by their origin, skipping those imported before
+        (header and malformed rows are skipped).
+
+        Args:
+            rows (Iterable[tuple[int, str]]): (position, row); the position (line number
+                or byte offset) identifies the row within its origin.
+            origin (str): Source of the rows (absolute file path or shard name).
+
+        Returns:
+            int: Number of newly stored records.
+        """
+        keyed = (
+            (*record, origin, position) for position, record in (
+                (position, parse_journal_row(row)) for position, row in rows
+            ) if record is not None
+        )
+        columns = COLUMNS + ("origin", "origin_pos")
+        with self._lock, self._conn:
+            cursor = self._conn.executemany(
+                f"INSERT OR IGNORE INTO prints ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))})",
+                keyed
+            )
+            return cursor.rowcount
+
+    def import_journal(self, path, batch_size: int = 10_000) -> int:
+        """
+        Bulk-imports an existing single.sn file (or a .gz partition) in batches.
+        Rows are keyed by file path and line number, so a repeated import (or an
+        import of the grown file) only adds new lines.
+
+        Returns:
+            int: Number of newly stored records.
+        """
+        origin = str(Path(path).resolve())
+        imported = 0
+        batch = []
+        with open_journal(Path(path)) as f:
+            for line_number, row in enumerate(f, start=1):
+                batch.append((line_number, row))
+                if len(batch) >= batch_size:
+                    imported += self.add_rows(batch, origin)
+                    batch = []
+        imported += self.add_rows(batch, origin)
+        self.logger.info("Import %s: %d nových záznamů.", path, imported)
+        return imported
+
+    def find(  # pylint: disable=too-many-arguments
+            self, serial: str | None = None, *, since: str | None = None,
+            until: str | None = None, prefix: str | None = None,
+            printer: str | None = None, limit: int | None = None) -> list[dict]:
+        """
+        Returns records matching all given filters, oldest first.
+        Each optional filter is one keyword, so callers name only the ones they use.
+
+        Args:
+            serial (str | None): Exact serial number.
+            since (str | None): Lower bound of printed_at ("YYYY-MM-DD[ HH:MM:SS]"), inclusive.
+            until (str | None): Upper bound of printed_at, exclusive.
+            prefix (str | None): User prefix.
+            printer (str | None): Printer name.
+            limit (int | None): Maximum number of records.
+        """
+        conditions, params = [], []
+        for column, operator, value in (
+                ("serial", "=", serial),
+                ("printed_at", ">=", since),
+                ("printed_at", "<", until),
+                ("prefix", "=", prefix),
+                ("printer", "=", printer)):
+            if value is not None:
+                conditions.append(f"{column} {operator} ?")
+                params.append(value)
+
+        sql = f"SELECT {', '.join(COLUMNS)} FROM prints"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY printed_at, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def was_printed(self, serial: str) -> bool:
+        """Returns True if the serial number has been printed before."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM prints WHERE serial = ? LIMIT 1", (serial,)
+            ).fetchone()
+        return row is not None
+
+    def export_csv(self, path, legacy: bool = True, **filters) -> int:
+        """
+        Writes records as a single.sn file.
+
+        Args:
+            path (str | Path): Output file.
+            legacy (bool): Old 5-column layout (date;sn;copy;printer;prefix) for older
+                tools; False writes the current layout with source and reprint.
+            **filters: Same filters as `find`.
+
+        Returns:
+            int: Number of exported records.
+        """
+        header, columns = (LEGACY_HEADER, LEGACY_COLUMNS) if legacy else (JOURNAL_HEADER, COLUMNS)
+        records = self.find(**filters)
+        with Path(path).open("w", encoding="utf-8", newline="") as f:
+            f.write(header + "\n")
+            for record in records:
+                f.write(";".join(str(record[column]) for column in columns) + "\n")
+        return len(records)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Returns the parser of the command line interface."""
+    parser = argparse.ArgumentParser(prog="print_history", description="Historie tisku")
+    parser.add_argument("--db", help="cesta k databázi (výchozí z [History] database)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="import souborů single.sn")
+    import_parser.add_argument("files", nargs="+")
+
+    lookup_parser = commands.add_parser("lookup", help="vyhledání sériového čísla")
+    lookup_parser.add_argument("serial")
+
+    check_parser = commands.add_parser("check", help="bylo sériové číslo už vytištěno?")
+    check_parser.add_argument("serial")
+
+    export_parser = commands.add_parser("export", help="export do formátu single.sn")
+    export_parser.add_argument("output")
+    export_parser.add_argument("--full", action="store_true",
+                               help="nový formát se sloupci source a reprint")
+    for name in ("since", "until", "prefix", "printer"):
+        export_parser.add_argument(f"--{name}")
+    return parser
+
+
+def main(argv=None) -> int:
+    """Command line interface for importing, searching and exporting the history."""
+    # pylint: disable=import-outside-toplevel
+    from utils.config_reader import ConfigReader
+    from utils.resource_resolver import ResourceResolver
+
+    args = _build_parser().parse_args(argv)
+    db_path = args.db or ResourceResolver().writable(
+        ConfigReader().get_value("History", "database", fallback="history/print_history.db")
+    )
+    history = PrintHistory(db_path)
+    try:
+        if args.command == "import":
+            for file in args.files:
+                print(f"{file}: {history.import_journal(file)} nových záznamů")
+        elif args.command == "lookup":
+            for record in history.find(serial=args.serial):
+                print(";".join(str(record[column]) for column in COLUMNS))
+        elif args.command == "check":
+            if not history.was_printed(args.serial):
+                print(f"{args.serial}: nevytištěno")
+                return 1
+            print(f"{args.serial}: vytištěno")
+        else:
+            filters = {
+                name: getattr(args, name) for name in ("since", "until", "prefix", "printer")
+            }
+            exported = history.export_csv(args.output, legacy=not args.full, **filters)
+            print(f"Exportováno {exported} záznamů")
+    finally:
+        history.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,345 @@
+"""
+📦 Module: print_server.py
+
+Local print server (daemon mode) and its thin client.
+
+Responsibilities:
+    - Accept print requests from several clients over a localhost TCP socket
+    - Feed all requests into one job queue executed by a single worker thread
+    - Keep one warm print engine per station instead of one per GUI
+
+Protocol (UTF-8, one request and one response per line):
+    - Bare line:      "SN123456"                          → print serial with prefix "?"
+    - JSON request:   {"serial": "SN123456", "prefix": "AB", "source": "serial:COM3"}
+    - JSON command:   {"command": "ping"} | {"command": "status"} (queue, journal backlog)
+    - JSON response:  {"ok": true, "serial": "SN123456"} | {"ok": false, "error": "..."}
+
+Uses only the standard library, so the protocol can be exercised with a local client
+on any platform by passing a dummy job handler.
+
+Author: Miloslav Hradecky
+"""
+
+# 🧱 Standard library
+import json
+import queue
+import socket
+import threading
+import socketserver
+from dataclasses import asdict
+
+# 🧠 First-party (project-specific)
+from utils.logger import get_logger
+
+from models.print_job import PrintJob
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 9150
+
+
+def parse_request(line: str) -> dict:
+    """
+    Parses one protocol line into a request dictionary.
+
+    Args:
+        line (str): Raw line without the trailing newline.
+
+    Returns:
+        dict: Request with either a "command" or a "serial" key.
+
+    Raises:
+        ValueError: If the line is empty or the JSON payload is invalid.
+    """
+    line = line.strip()
+    if not line:
+        raise ValueError("Prázdný požadavek")
+
+    if not line.startswith("{"):
+        return {"serial": line}
+
+    try:
+        request = json.loads(line)
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"Neplatný JSON požadavek: {exc.msg}") from exc
+
+    if not isinstance(request, dict):
+        raise ValueError("Požadavek musí být JSON objekt")
+    return request
+
+
+def encode_message(payload: dict) -> bytes:
+    """Encodes a request or response dictionary as one protocol line."""
+    return (json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+class _QueuedJob:
+    """Print job waiting in the server queue together with its completion state."""
+
+    def __init__(self, job: PrintJob):
+        self.job = job
+        self.done = threading.Event()
+        self.result = {"ok": False, "error": "Úloha nebyla zpracována"}
+        self._lock = threading.Lock()
+        self._state = "queued"  # 💡 queued → running | cancelled
+
+    def take(self) -> bool:
+        """Marks the job as running; False if it was cancelled while queued (worker)."""
+        with self._lock:
+            if self._state != "queued":
+                return False
+            self._state = "running"
+            return True
+
+    def cancel(self) -> bool:
+        """Cancels the job unless the worker has already started it."""
+        with self._lock:
+            if self._state == "queued":
+                self._state = "cancelled"
+            return self._state == "cancelled"
+
+
+class _PrintRequestHandler(socketserver.StreamRequestHandler):
+    """Reads protocol lines from one client connection and writes responses."""
+
+    def handle(self):
+        for raw in self.rfile:
+            try:
+                line = raw.decode("utf-8")
+            except UnicodeDecodeError:
+                response = {"ok": False, "error": "Požadavek není v kódování UTF-8"}
+            else:
+                if not line.strip():
+                    continue
+                response = self.server.print_server.dispatch(line)
+            self.wfile.write(encode_message(response))
+
+
+# 💡 the ancestors all come from socketserver (ThreadingMixIn, TCPServer, BaseServer)
+class _ThreadingServer(socketserver.ThreadingTCPServer):  # pylint: disable=too-many-ancestors
+    """Threaded TCP server holding a back-reference to its PrintServer."""
+    daemon_threads = True
+
+    def __init__(self, address, print_server):
+        self.print_server = print_server
+        super().__init__(address, _PrintRequestHandler)
+
+
+class PrintServer:  # pylint: disable=too-many-instance-attributes
+    """
+    Serves print requests over localhost TCP and executes them one by one.
+
+    All connections share one FIFO queue and one worker thread, so the print
+    engine is only ever driven from a single thread.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+            self, handler, host=DEFAULT_HOST, port=DEFAULT_PORT, initializer=None,
+            job_timeout=120.0, status=None, validator=None):
+        """
+        Initializes the server.
+
+        Args:
+            handler (Callable[[PrintJob], bool]): Executes one print job.
+            host (str): Address to bind (localhost by default).
+            port (int): TCP port to bind (0 picks a free port).
+            initializer (Callable | None): Called once in the worker thread before jobs run.
+            job_timeout (float): Seconds a job may wait in the queue; a job not started
+                by then is cancelled, a started job is always awaited.
+            status (Callable[[], dict] | None): Extra fields for the "status" command.
+            validator (Callable[[str], str | None] | None): Returns why a serial is
+                rejected (None if valid); rejected serials are never queued.
+        """
+        self.handler = handler
+        self.status = status
+        self.validator = validator
+        self.initializer = initializer
+        self.job_timeout = job_timeout
+        self.logger = get_logger("PrintServer")
+        self._jobs = queue.Queue()
+        self._server = _ThreadingServer((host, port), self)
+        self._worker = None
+        self._listener = None
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """Returns the (host, port) the server is bound to."""
+        return self._server.server_address[:2]
+
+    @property
+    def queue_depth(self) -> int:
+        """Returns the number of jobs waiting for the worker."""
+        return self._jobs.qsize()
+
+    def _start_worker(self):
+        """Starts the single job worker thread if it is not running yet."""
+        if self._worker is None:
+            self._worker = threading.Thread(
+                target=self._work, name="PrintServerWorker", daemon=True
+            )
+            self._worker.start()
+
+    def start(self):
+        """Starts the worker and serves requests in a background thread."""
+        self._start_worker()
+        self._listener = threading.Thread(
+            target=self._server.serve_forever, name="PrintServerListener", daemon=True
+        )
+        self._listener.start()
+        self.logger.info("Tiskový server naslouchá na %s:%d", *self.address)
+
+    def serve_forever(self):
+        """Starts the worker and serves requests in the calling thread until stopped."""
+        self._start_worker()
+        self.logger.info("Tiskový server naslouchá na %s:%d", *self.address)
+        self._server.serve_forever()
+
+    def stop(self):
+        """Stops accepting requests and shuts down the worker thread."""
+        if self._listener is not None:
+            self._server.shutdown()
+            self._listener.join()
+            self._listener = None
+        self._server.server_close()
+        if self._worker is not None:
+            self._jobs.put(None)
+            self._worker.join()
+            self._worker = None
+        self.logger.info("Tiskový server byl zastaven.")
+
+    def submit(self, job: PrintJob) -> dict:
+        """
+        Enqueues a job and waits until the worker has processed it.
+
+        A job still waiting after job_timeout is cancelled, so it never prints after
+        its client gave up; a job already printing is awaited (its outcome matters).
+
+        Args:
+            job (PrintJob): Job to print.
+
+        Returns:
+            dict: Protocol response for the job.
+        """
+        item = _QueuedJob(job)
+        self._jobs.put(item)
+        if not item.done.wait(self.job_timeout) and item.cancel():
+            self.logger.warning("Úloha %s zrušena, ve frontě čekala příliš dlouho.", job.serial)
+            return {
+                "ok": False,
+                "serial": job.serial,
+                "error": "Vypršel čas čekání ve frontě, úloha zrušena (nevytištěno)"
+            }
+        item.done.wait()
+        return item.result
+
+    def dispatch(self, line: str) -> dict:  # pylint: disable=too-many-return-statements
+        """
+        Handles one protocol line and returns the response dictionary.
+        Every protocol outcome (command, rejection, print result) returns its own response.
+
+        Args:
+            line (str): Raw protocol line.
+
+        Returns:
+            dict: Response to send back to the client.
+        """
+        try:
+            request = parse_request(line)
+        except ValueError as e:
+            return {"ok": False, "error": str(e)}
+
+        command = request.get("command")
+        if command == "ping":
+            return {"ok": True, "command": "ping"}
+        if command == "status":
+            extra = self.status() if self.status else {}
+            return {"ok": True, "command": "status", "queue": self.queue_depth, **extra}
+        if command is not None:
+            return {"ok": False, "error": f"Neznámý příkaz: {command}"}
+
+        serial = str(request.get("serial", "")).strip()
+        if not serial:
+            return {"ok": False, "error": "Chybí sériové číslo"}
+        if self.validator:
+            reason = self.validator(serial)
+            if reason is not None:
+                return {"ok": False, "error": f"Neplatné sériové číslo: {reason}"}
+
+        prefix = str(request.get("prefix") or "?")
+        source = str(request.get("source") or "server")
+        reprint = bool(request.get("reprint", False))
+        return self.submit(PrintJob(serial=serial, prefix=prefix, source=source, reprint=reprint))
+
+    def _work(self):
+        """Worker loop: executes queued jobs in FIFO order."""
+        if self.initializer:
+            self.initializer()
+
+        while True:
+            item = self._jobs.get()
+            if item is None:
+                break
+            if not item.take():
+                continue  # 💡 cancelled by submit, its client already has the answer
+            try:
+                ok = self.handler(item.job)
+                item.result = {"ok": bool(ok), "serial": item.job.serial}
+                if not ok:
+                    item.result["error"] = "Tisk se nezdařil"
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                self.logger.exception("Chyba při zpracování úlohy %s: %s", item.job.serial, e)
+                item.result = {"ok": False, "serial": item.job.serial, "error": str(e)}
+            finally:
+                item.done.set()
+
+
+class PrintClient:
+    """Thin client sending print requests to a running PrintServer."""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=10.0):
+        """
+        Initializes the client.
+
+        Args:
+            host (str): Server address.
+            port (int): Server TCP port.
+            timeout (float): Connect and command timeout in seconds; print jobs wait for
+                their answer (the server cancels jobs that wait too long in its queue).
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+    def request(self, payload: dict, wait: bool = False) -> dict:
+        """
+        Sends one request and returns the decoded response.
+
+        Args:
+            payload (dict): Request or command.
+            wait (bool): Wait for the response without a timeout (print jobs).
+
+        Raises:
+            OSError: If the server is not reachable or the connection drops.
+            ValueError: If the response is not valid JSON.
+        """
+        with socket.create_connection((self.host, self.port), timeout=self.timeout) as sock:
+            if wait:
+                sock.settimeout(None)
+            sock.sendall(encode_message(payload))
+            with sock.makefile("rb") as stream:
+                line = stream.readline()
+        if not line:
+            raise ConnectionError("Tiskový server ukončil spojení bez odpovědi")
+        return json.loads(line.decode("utf-8"))
+
+    def submit(self, job: PrintJob) -> dict:
+        """Sends a print job and returns the server response."""
+        request = asdict(job)
+        request.pop("prepared")  # 💡 prepared labels are local to the process that printed
+        return self.request(request, wait=True)
+
+    def ping(self) -> bool:
+        """Returns True if the server answers a ping."""
+        try:
+            return bool(self.request({"command": "ping"}).get("ok"))
+        except (OSError, ValueError):
+            return False
@@ -0,0 +1,597 @@
+"""
+📦 Module: print_service.py
+
+Headless label printing pipeline shared by the GUI and the print server daemon.
+
+Responsibilities:
+    - Resolve configured labels (path, printer, copies)
+    - Assign the printer, write label.csv and print each label on the one
+      app-owned BarTender engine (quit on close when the service owns it)
+    - Pick a printer from the label's pool (round_robin, least_jobs, failover)
+    - Print from a local, validated copy of each template (TemplateCache)
+    - Skip labels of printers known to be down (per-printer circuit breaker)
+    - Append the print record to single.sn through a local write-ahead spool
+      (or to the station's own shard single_<PC>.sn, [Journal] shards = true,
+      or to the monthly/daily partition single_YYYY-MM.sn, [Journal] partition)
+    - Record every print in the local, indexed print history (SQLite)
+    - Reprint a job from its prepared labels (no label or printer resolution)
+    - Pass label data via label.csv ([Printing] data_mode = file) or directly
+      as COM named substrings (data_mode = com, nothing is written to the share)
+    - Print all labels of a scan or of a batch of scans with one BTXML script
+      (data_mode = btxml, one BarTender invocation instead of one per label)
+    - Print .zpl templates directly as raw ZPL (TCP port 9100 or raw spooler),
+      without BarTender; network printers ([Printers]) get a connection per burst
+      (persistent only when listed in [Printing] tcp_persistent)
+
+Has no dependency on Qt; user feedback goes through an optional Messenger.
+
+Author: Miloslav Hradecky
+"""
+
+# 🧱 Standard library
+import os
+import csv
+import sqlite3
+import configparser
+from functools import partial
+from pathlib import Path
+from datetime import datetime
+
+# 🧠 First-party (project-specific)
+from utils.logger import get_logger
+from utils.config_reader import ConfigReader
+from utils.bartender_engine import BartenderEngine
+from utils.bartender_utils import BartenderUtils
+from utils.btxml import ScriptEntry, build_script, parse_response
+from utils.set_printer import set_printer_in_label
+from utils.printer_health import PrinterHealthRegistry
+from utils.printer_status import get_printer_status, is_printer_ready, send_raw
+from utils.printer_pool import PrinterPool, PrinterStatusCache
+from utils.template_cache import TemplateCache
+from utils.journal_spool import JournalSpool
+from utils.journal_merge import shard_name
+from utils.journal_partition import PARTITION_SCHEMES, partition_name
+from utils.system_info import get_computer_name
+from utils.print_history import PrintHistory
+from utils.resource_resolver import ResourceResolver
+from utils.printer_transport import PrinterTransport
+from utils.zpl_engine import ZplEngine, is_zpl_template
+
+from models.print_job import PrintJob, PreparedLabel
+
+LABEL_FIELDS = ("SerialNumber", "Date", "Signature")
+DATA_MODES = ("file", "com", "btxml")
+
+
+class PrintService:  # pylint: disable=too-many-instance-attributes
+    """
+    Executes print jobs for all labels defined in config.ini.
+    Can run inside the GUI (with Messenger) or inside the daemon (log only).
+    """
+
+    def __init__(self, config_reader: ConfigReader, messenger=None,
+                 engine: BartenderEngine | None = None):
+        """
+        Initializes the service with loaded configuration and optional Messenger.
+
+        Args:
+            config_reader (ConfigReader): Loaded configuration reader.
+            messenger (Messenger | None): Optional messenger for user feedback.
+            engine (BartenderEngine | None): App-owned BarTender engine; without it
+                the service owns one and quits it on close.
+        """
+        self.config_reader = config_reader
+        self.config = config_reader.config
+        self.messenger = messenger
+        self.logger = get_logger("PrintService")
+        self._owns_engine = engine is None
+        self.engine = engine or BartenderEngine()
+        self.bartender_utils = BartenderUtils(self.engine)  # 💡 failures go via breakers
+        self.transport = PrinterTransport(
+            config_reader.get_printer_addresses(),
+            spooler=send_raw,
+            timeout=config_reader.get_int("Printing", "tcp_timeout", 5),
+            idle_timeout=config_reader.get_int("Printing", "tcp_idle_timeout", 30),
+            max_in_flight=config_reader.get_int("Printing", "tcp_max_in_flight", 4),
+            persistent=[
+                name.strip() for name in config_reader.get_value(
+                    "Printing", "tcp_persistent", fallback=""
+                ).split(",") if name.strip()
+            ],
+            linger=config_reader.get_int("Printing", "tcp_linger", 2)
+        )
+        self.zpl_engine = ZplEngine(self.transport)
+        self.printer_health = PrinterHealthRegistry(
+            probe=self._printer_ready,
+            probe_interval=config_reader.get_int("Printing", "probe_interval", 10),
+            retries=config_reader.get_int("Printing", "retries", 2),
+            on_change=self._printer_changed,
+            failure_threshold=config_reader.get_int("Printing", "failure_threshold", 3)
+        )
+        self.printer_health.start()
+
+        self.pool_strategy = config_reader.get_value(
+            "Printing", "pool_strategy", fallback="round_robin"
+        ).strip().lower()
+        self.status_cache = PrinterStatusCache(self._printer_status)
+        self.status_cache.start()
+        self._pools = {}
+        self.data_mode = config_reader.get_value(
+            "Printing", "data_mode", fallback="file"
+        ).strip().lower()
+        if self.data_mode not in DATA_MODES:
+            raise ValueError(
+                f"Neplatný data_mode v [Printing]: '{self.data_mode}' ({'|'.join(DATA_MODES)})"
+            )
+        self._bindings = {}     # label_path → (printer, template mtime) after set_printer
+        self._label_rows = {}   # label.csv path → (last written row, file mtime)
+
+        self.template_cache = None
+        if config_reader.get_bool("Cache", "templates", True):
+            self.template_cache = TemplateCache(
+                ResourceResolver().writable(
+                    config_reader.get_value("Cache", "directory", fallback="cache/templates")
+                ),
+                validate=config_reader.get_value("Cache", "validate", fallback="mtime").strip(),
+                refresh_interval=config_reader.get_int("Cache", "refresh_interval", 60)
+            )
+            self._watch_templates()
+            self.template_cache.start()
+
+        self.journal = JournalSpool(
+            ResourceResolver().writable(
+                config_reader.get_value("Journal", "spool_dir", fallback="spool")
+            ),
+            sync_interval=config_reader.get_int("Journal", "sync_interval", 5)
+        )
+        self.journal.start()
+        self.journal_shard = None
+        if config_reader.get_bool("Journal", "shards", False):
+            # 💡 one file per station: no SMB contention on single.sn, merged by journal_merge
+            self.journal_shard = shard_name(get_computer_name())
+        self.journal_partition = config_reader.get_value(
+            "Journal", "partition", fallback="none"
+        ).strip().lower()
+        if self.journal_partition not in PARTITION_SCHEMES:
+            raise ValueError(
+                f"Neplatné partition v [Journal]: '{self.journal_partition}' "
+                f"({'|'.join(PARTITION_SCHEMES)})"
+            )
+
+        self.history = None
+        if config_reader.get_bool("History", "enabled", True):
+            self.history = PrintHistory(
+                ResourceResolver().writable(
+                    config_reader.get_value(
+                        "History", "database", fallback="history/print_history.db"
+                    )
+                )
+            )
+
+    def close(self):
+        """Stops background workers and tries to ship the journal backlog."""
+        self.printer_health.stop()
+        self.status_cache.stop()
+        if self.template_cache:
+            self.template_cache.stop()
+        self.journal.stop()
+        if self.history:
+            self.history.close()
+        self.transport.close()
+        if self._owns_engine:
+            self.engine.close()
+
+    def _printer_status(self, printer: str) -> tuple[bool, int]:
+        """Returns (ready, queued_jobs) from the network transport or the Windows spooler."""
+        status = self.transport.status(printer)
+        return status if status is not None else get_printer_status(printer)
+
+    def _printer_ready(self, printer: str) -> bool:
+        """Health probe of PrinterHealthRegistry (network or spooler printer)."""
+        status = self.transport.status(printer)
+        return status[0] if status is not None else is_printer_ready(printer)
+
+    def _watch_templates(self):
+        """Registers all configured templates so they are cached before the first scan."""
+        try:
+            labels = self.config_reader.get_all_labels()
+        except ValueError:
+            return  # 💡 reported on the first print attempt
+        self.template_cache.watch(path for path, _, _ in labels.values() if path)
+
+    def _notify(self, level: str, message: str):
+        """Shows a non-blocking toast via Messenger if available (error/warning/info)."""
+        if self.messenger:
+            self.messenger.notify(message, level)
+
+    def _printer_changed(self, printer: str, available: bool):
+        """Announces a printer going down once, instead of an error box for every label."""
+        if not available:
+            self._notify(
+                "error",
+                f"Tiskárna {printer} je nedostupná.\n"
+                "Její etikety se přeskakují, dokud nebude opět v provozu."
+            )
+
+    @staticmethod
+    def label_data(job: PrintJob) -> dict[str, str]:
+        """Returns the label data fields (LABEL_FIELDS) of a job."""
+        today = datetime.today().strftime("%Y-%m-%d")
+        return dict(zip(LABEL_FIELDS, (job.serial, today, job.prefix)))
+
+    def write_to_label_csv(self, job: PrintJob, label_path: str):
+        """Saves serial number, date, and user prefix to label.csv next to the label file."""
+        label_file = Path(label_path)
+        csv_path = label_file.parent / "label.csv"
+        row = list(self.label_data(job).values())
+        cached = self._label_rows.get(csv_path)
+        if cached and cached[0] == row and cached[1] == self._mtime(csv_path):
+            return  # 💡 reprint or second label of the same job: data file is current
+
+        try:
+            with csv_path.open(mode="w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f, delimiter=";")
+                writer.writerow(LABEL_FIELDS)  # 💡 header
+                writer.writerow(row)
+            self._label_rows[csv_path] = (row, self._mtime(csv_path))
+        except (OSError, IOError) as e:
+            self.logger.error("Chyba při zápisu do label.csv: %s", str(e))
+            self._notify("error", "Nepodařilo se zapsat do label.csv")
+
+    def write_sn(self, job: PrintJob, copies: int, printer: str):
+        """
+        Records serial number, timestamp, user prefix, and input source for single.sn
+        in the orders_path directory defined in config.ini.
+
+        The row is stored in the local spool first; the background syncer appends
+        it to single.sn (with header on create), so printing never waits for the share.
+        With [Journal] shards = true the row goes to the station's shard instead,
+        with [Journal] partition to the partition of its timestamp (header on create
+        applies to every partition).
+        """
+        try:
+            orders_path_raw = self.config.get("Paths", "orders_path")
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            file_path = Path(orders_path_raw) / (
+                self.journal_shard or partition_name(timestamp, self.journal_partition)
+            )
+
+            row = (
+                f"{timestamp};{job.serial};{copies};{printer};{job.prefix};{job.source};"
+                f"{int(job.reprint)}"
+            )
+
+            self.journal.append(file_path, row)
+
+        except (OSError, IOError, configparser.Error) as e:
+            self.logger.error("Chyba při zápisu do single.sn: %s", str(e))
+            self._notify("error", "Nepodařilo se zapsat do single.sn")
+            return
+
+        if self.history:
+            try:
+                self.history.add_records(
+                    [(timestamp, job.serial, copies, printer, job.prefix, job.source,
+                      int(job.reprint))]
+                )
+            except sqlite3.Error as e:
+                self.logger.warning("Záznam do historie tisku selhal: %s", str(e))
+
+    def _pool(self, label_key: str, printers: tuple[str, ...]) -> PrinterPool:
+        """Returns the printer pool of a label, creating it on first use."""
+        pool = self._pools.get(label_key)
+        if pool is None or pool.printers != printers:
+            pool = PrinterPool(
+                printers,
+                self.pool_strategy,
+                self.status_cache,
+                self.printer_health.is_available
+            )
+            if len(printers) > 1:
+                self.status_cache.watch(printers)
+            self._pools[label_key] = pool
+        return pool
+
+    def _print_on_pool(self, job: PrintJob, label_key: str, label_path: str,
+                       pool: PrinterPool, copies: int) -> str | None:
+        """
+        Prints one label on a printer chosen from its pool, trying the next printer
+        only if nothing was sent to the previous one (not ready or breaker open).
+        A label that was sent and failed is not sent again: it might have printed.
+
+        Returns:
+            str | None: Printer that printed the label, or None if none could.
+        """
+        tried = []
+        printer = pool.select()
+        while printer is not None:
+            operation = partial(self._print_label, job, label_path, printer, copies)
+            result = self.printer_health.call(printer, operation)
+            if result:
+                self.status_cache.note_submitted(printer)
+                return printer
+
+            tried.append(printer)
+            if self.printer_health.is_available(printer):
+                self._notify(
+                    "warning",
+                    f"Etiketa {label_key} se na tiskárně {printer} nevytiskla."
+                )
+            if result is False:
+                return None  # 💡 outcome unknown, no failover
+            printer = pool.select(exclude=tried)
+        return None
+
+    @staticmethod
+    def _mtime(path) -> int | None:
+        """Returns the modification time of a file in ns (None if it does not exist)."""
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _bind_printer(self, label_path: str, printer: str) -> bool:
+        """
+        Assigns the printer in the template unless it is still bound to it.
+        A template changed on disk (refreshed from the share, rebound elsewhere) is bound again.
+        """
+        mtime = self._mtime(label_path)
+        if mtime is not None and self._bindings.get(label_path) == (printer, mtime):
+            return True
+
+        if not set_printer_in_label(label_path, printer, self.engine, logger=self.logger):
+            self._bindings.pop(label_path, None)
+            return False
+        self._bindings[label_path] = (printer, self._mtime(label_path))
+        return True
+
+    def _print_label(self, job: PrintJob, label_path: str, printer: str, copies: int) -> bool:
+        """Prints one label (single attempt): raw ZPL, via label.csv, or via BarTender COM."""
+        if is_zpl_template(label_path):
+            return self.zpl_engine.print_label(label_path, printer, copies, self.label_data(job))
+        if self.data_mode == "com":
+            # 💡 printer and data are set on the open format only, nothing is saved
+            return self.bartender_utils.print_label_data(
+                label_path, printer, copies, self.label_data(job)
+            )
+        if self.data_mode == "btxml":
+            entry = ScriptEntry("0001", label_path, printer, copies, self.label_data(job))
+            errors = self._run_script([entry])
+            return errors is not None and errors.get(entry.name, "") is None
+
+        if not self._bind_printer(label_path, printer):
+            self.logger.warning(
+                "Tiskárnu '%s' se nepodařilo nastavit v etiketě '%s'",
+                printer,
+                label_path
+            )
+            return False
+
+        self.write_to_label_csv(job, label_path)
+        return self.bartender_utils.print_label(label_path, printer, copies)
+
+    def print_job(self, job: PrintJob) -> bool:
+        """
+        Prints all configured labels for one serial number.
+        A failing printer does not stop labels assigned to other printers.
+
+        Args:
+            job (PrintJob): Serial number and user prefix to print.
+
+        Returns:
+            bool: True if all labels were printed.
+        """
+        if self.data_mode == "btxml":
+            return self.print_batch([job])[0]
+
+        resolved = self._resolve_labels()
+        if resolved is None:
+            return False
+        labels, pools = resolved
+
+        all_printed = True
+        job.prepared = []
+        for label_key, (label_path, printers, copies) in labels.items():
+            printer = self._print_on_pool(job, label_key, label_path, pools[label_key], copies)
+            if printer is None:
+                self.logger.warning(
+                    "Etiketa '%s' nevytištěna, tiskárny %s jsou mimo provoz.", label_key, printers
+                )
+                all_printed = False
+                continue
+
+            self.logger.info(
+                "Etiketa: '%s' | Tiskárna: '%s' | Serial number: '%s' | Pcs kopií: '%d'",
+                label_key,
+                printer,
+                job.serial,
+                copies
+            )
+            self.write_sn(job, copies, printer)
+            job.prepared.append(PreparedLabel(label_key, label_path, printer, copies))
+
+        return all_printed
+
+    def print_batch(self, jobs: list[PrintJob]) -> list[bool]:
+        """
+        Prints all labels of several scans with one BTXML script (btxml data mode).
+        Labels the script reported as failed are retried one by one on their printer
+        pool; if the script failed as a whole, nothing is sent again (it may have printed).
+
+        Args:
+            jobs (list[PrintJob]): Scans in print order.
+
+        Returns:
+            list[bool]: Per job, True if all its labels were printed.
+        """
+        resolved = self._resolve_labels()
+        if resolved is None:
+            return [False] * len(jobs)
+        labels, pools = resolved
+
+        planned = self._plan_batch(jobs, labels, pools)
+        errors = self._run_script([entry for _, _, entry in planned if entry.printer])
+
+        results = [True] * len(jobs)
+        for index, label_key, entry in planned:
+            job = jobs[index]
+            printer = entry.printer
+            if printer and errors is not None and errors.get(entry.name, "") is None:
+                self.printer_health.report_success(printer)
+                self.status_cache.note_submitted(printer)
+            elif printer and errors is None:
+                self.logger.warning(
+                    "Etiketa '%s' (SN %s): dávka selhala, výsledek tisku neznámý.",
+                    label_key,
+                    job.serial
+                )
+                results[index] = False
+                continue
+            else:
+                if errors and errors.get(entry.name):
+                    self.logger.warning(
+                        "Etiketa '%s' (SN %s) v dávce nevytištěna: %s",
+                        label_key,
+                        job.serial,
+                        errors[entry.name]
+                    )
+                printer = self._print_on_pool(
+                    job, label_key, entry.label_path, pools[label_key], entry.copies
+                )
+            if printer is None:
+                self.logger.warning(
+                    "Etiketa '%s' nevytištěna, tiskárny %s jsou mimo provoz.",
+                    label_key,
+                    pools[label_key].printers
+                )
+                results[index] = False
+                continue
+
+            self.logger.info(
+                "Etiketa: '%s' | Tiskárna: '%s' | Serial number: '%s' | Pcs kopií: '%d'",
+                label_key,
+                printer,
+                job.serial,
+                entry.copies
+            )
+            self.write_sn(job, entry.copies, printer)
+            job.prepared.append(PreparedLabel(label_key, entry.label_path, printer, entry.copies))
+
+        return results
+
+    def _plan_batch(self, jobs: list[PrintJob], labels: dict, pools: dict) -> list[tuple]:
+        """
+        Assigns a printer to every label of every job of a batch (clears job.prepared).
+
+        Returns:
+            list[tuple[int, str, ScriptEntry]]: (job index, label key, script entry);
+            entries of .zpl labels have no printer.
+        """
+        planned = []
+        for index, job in enumerate(jobs):
+            job.prepared = []
+            data = self.label_data(job)
+            for label_key, (label_path, _, copies) in labels.items():
+                # 💡 .zpl labels are not BarTender templates; they are sent one by one later
+                printer = None if is_zpl_template(label_path) else pools[label_key].select()
+                name = f"{index + 1:04d}_{label_key}"
+                planned.append(
+                    (index, label_key, ScriptEntry(name, label_path, printer, copies, data))
+                )
+        return planned
+
+    def _resolve_labels(self) -> tuple[dict, dict] | None:
+        """
+        Reads the labels and their printer pools from config.ini.
+
+        Returns:
+            tuple | None: ({label_key: (label_path, printers, copies)}, {label_key: pool}),
+            label paths already pointing to the template cache; None if not printable.
+        """
+        try:
+            labels = self.config_reader.get_all_labels()
+            pools = {key: self._pool(key, printers) for key, (_, printers, _) in labels.items()}
+        except ValueError as e:
+            self.logger.error("Chyba v config.ini: %s", str(e))
+            self._notify("error", f"Chyba v config.ini:\n{str(e)}")
+            return None
+
+        if not labels:
+            self.logger.warning("V config.ini nejsou definovány žádné etikety.")
+            self._notify("warning", "V config.ini nejsou definovány žádné etikety.")
+            return None
+
+        for label_key, (label_path, printers, copies) in labels.items():
+            if not label_path:
+                self.logger.warning("Etiketa '%s' nemá definovanou cestu.", label_key)
+                self._notify("warning", f"Etiketa {label_key} není definována v config.ini")
+                return None
+            if self.template_cache:
+                labels[label_key] = (self.template_cache.local_path(label_path), printers, copies)
+        return labels, pools
+
+    def _run_script(self, entries: list[ScriptEntry]) -> dict[str, str | None] | None:
+        """
+        Runs entries as one BTXML script.
+
+        Returns:
+            dict[str, str | None] | None: Entry name → error text (None if printed);
+            None if the script failed as a whole (outcome unknown).
+        """
+        if not entries:
+            return {}
+        response = self.bartender_utils.run_xml_script(build_script(entries))
+        if response is None:
+            return None
+
+        names = [entry.name for entry in entries]
+        if not response.strip():
+            return dict.fromkeys(names)
+        try:
+            return parse_response(response, names)
+        except ValueError as e:
+            # 💡 the script ran; printing again could duplicate labels
+            self.logger.warning(
+                "Odpověď BarTenderu nelze zpracovat, tisk považován za úspěšný: %s",
+                str(e)
+            )
+            return dict.fromkeys(names)
+
+    def reprint(self, job: PrintJob) -> bool:
+        """
+        Prints a job again from its prepared labels (same templates, printers and copies).
+        Falls back to a full print if the job has no prepared labels.
+
+        Args:
+            job (PrintJob): Previously printed job with reprint=True.
+
+        Returns:
+            bool: True if all labels were printed again.
+        """
+        if not job.prepared:
+            return self.print_job(job)
+
+        all_printed = True
+        for label in job.prepared:
+            operation = partial(
+                self._print_label, job, label.label_path, label.printer, label.copies
+            )
+            if not self.printer_health.call(label.printer, operation):
+                self.logger.warning(
+                    "Dotisk etikety '%s' na tiskárně '%s' se nezdařil.",
+                    label.label_key,
+                    label.printer
+                )
+                self._notify("warning", f"Dotisk etikety {label.label_key} se nezdařil.")
+                all_printed = False
+                continue
+
+            self.logger.info(
+                "Dotisk: '%s' | Tiskárna: '%s' | Serial number: '%s'",
+                label.label_key,
+                label.printer,
+                job.serial
+            )
+            self.write_sn(job, label.copies, label.printer)
+
+        return all_printed
@@ -0,0 +1,78 @@
+"""
+📦 Module: print_worker.py
+
+Background thread that prints queued jobs, so the GUI thread never waits for a print.
+
+Responsibilities:
+    - Sleep until woken up (a job or a reprint was queued) and then run the drain callback
+    - Report whether there is anything left to print (headless drivers wait for idle)
+    - Survive errors of one drain (logged and reported) and stop after the current job
+
+Author: Miloslav Hradecky
+"""
+
+# 🧱 Standard library
+import threading
+
+# 🧠 First-party (project-specific)
+from utils.logger import get_logger
+
+
+class PrintWorker:
+    """The only thread that prints; it drains the queue whenever it is woken up."""
+
+    def __init__(self, drain, on_error=None, name: str = "PrintWorker"):
+        """
+        Starts the worker thread.
+
+        Args:
+            drain (Callable[[], None]): Prints everything that is waiting (worker thread).
+            on_error (Callable[[Exception], None] | None): Reports a failed drain to the user.
+            name (str): Thread name.
+        """
+        self.logger = get_logger("PrintWorker")
+        self._wakeup = threading.Event()
+        self._wake_lock = threading.Lock()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._work, args=(drain, on_error), name=name, daemon=True
+        )
+        self._thread.start()
+
+    def wake(self):
+        """Tells the worker that a job or a reprint is waiting (any thread)."""
+        with self._wake_lock:
+            self._idle.clear()
+            self._wakeup.set()
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """Blocks until the worker has nothing left to print (headless drivers)."""
+        return self._idle.wait(timeout)
+
+    def stop(self, timeout: float = 10.0):
+        """Stops the worker after the job it is printing."""
+        self._stopping = True
+        self._wakeup.set()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            self.logger.warning("Tiskové vlákno neskončilo do %.0f s.", timeout)
+
+    def _work(self, drain, on_error):
+        """Worker loop: drains the queue whenever it is woken up."""
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if self._stopping:
+                break
+            try:
+                drain()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                self.logger.exception("Chyba tiskového vlákna: %s", e)
+                if on_error:
+                    on_error(e)
+            with self._wake_lock:
+                # 💡 a wake() during the drain keeps the worker busy for one more round
+                if not self._wakeup.is_set():
+                    self._idle.set()
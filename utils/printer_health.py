@@ -0,0 +1,221 @@
+"""
+📦 Module: printer_health.py
+
+Per-printer health state with circuit breakers, bounded probe retries and background probing.
+
+Responsibilities:
+    - Track consecutive failures of every printer
+    - Fail fast (skip the label) while a printer is known to be down
+    - Probe a printer before an operation, retrying the probe with exponential backoff
+    - Run the operation (a print) exactly once: its outcome is unknown after it was sent,
+      so repeating it could print a duplicate label
+    - Probe open printers in the background and close the breaker when they come back
+
+The probe is injected, so the module itself has no platform dependency.
+
+Author: Miloslav Hradecky
+"""
+
+# 🧱 Standard library
+import time
+import threading
+
+# 🧠 First-party (project-specific)
+from utils.logger import get_logger
+from utils.background_loop import BackgroundLoop
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:  # pylint: disable=too-many-instance-attributes
+    """
+    Classic three-state circuit breaker for one printer (configuration plus the
+    lock-guarded state, failure count, current timeout and opening time).
+
+    closed    → operations run; `failure_threshold` failures in a row open the breaker
+    open      → operations are rejected until `reset_timeout` elapses
+    half_open → one trial operation; success closes, failure re-opens with a doubled timeout
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 30.0,
+                 max_reset_timeout: float = 300.0, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._reset_timeout = reset_timeout
+        self._opened_at = 0.0
+
+    @property
+    def state(self) -> str:
+        """Returns the current state (closed, open, half_open)."""
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        """Returns True if an operation may be attempted now."""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and self._clock() - self._opened_at >= self._reset_timeout:
+                self._state = HALF_OPEN
+                return True
+            return False
+
+    def record_success(self) -> bool:
+        """Closes the breaker; returns True if it was not closed before."""
+        with self._lock:
+            was_closed = self._state == CLOSED
+            self._state = CLOSED
+            self._failures = 0
+            self._reset_timeout = self.base_reset_timeout
+            return not was_closed
+
+    def record_failure(self) -> bool:
+        """Counts a failure; returns True if the breaker has just opened."""
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN:
+                self._reset_timeout = min(self._reset_timeout * 2, self.max_reset_timeout)
+                self._state = OPEN
+                self._opened_at = self._clock()
+                return False
+            if self._state == OPEN or self._failures < self.failure_threshold:
+                return False
+            self._state = OPEN
+            self._opened_at = self._clock()
+            return True
+
+
+class PrinterHealthRegistry:  # pylint: disable=too-many-instance-attributes
+    """
+    Holds one CircuitBreaker per printer and probes open printers in the background.
+    """
+
+    def __init__(self, probe, probe_interval: float = 10.0, retries: int = 2,
+                 backoff: float = 0.5, on_change=None, **breaker_kwargs):
+        """
+        Args:
+            probe (Callable[[str], bool]): Returns True if the printer is ready.
+            probe_interval (float): Seconds between two background probe rounds.
+            retries (int): Extra readiness probes of a printer that is not ready.
+            backoff (float): First probe retry delay in seconds (doubles with every attempt).
+            on_change (Callable[[str, bool], None] | None): Called with (printer, available)
+                whenever a breaker opens or closes (closing may come from the probe thread).
+            **breaker_kwargs: Passed to every CircuitBreaker.
+        """
+        self.probe = probe
+        self.retries = retries
+        self.backoff = backoff
+        self.on_change = on_change
+        self.breaker_kwargs = breaker_kwargs
+        self.logger = get_logger("PrinterHealth")
+        self._lock = threading.Lock()
+        self._breakers = {}
+        self._probe_loop = BackgroundLoop(
+            self.probe_open_printers, probe_interval, "PrinterHealthProbe"
+        )
+
+    def breaker(self, printer: str) -> CircuitBreaker:
+        """Returns the breaker of a printer, creating it on first use."""
+        with self._lock:
+            if printer not in self._breakers:
+                self._breakers[printer] = CircuitBreaker(printer, **self.breaker_kwargs)
+            return self._breakers[printer]
+
+    def is_available(self, printer: str) -> bool:
+        """Returns False while the printer's breaker is open."""
+        return self.breaker(printer).state != OPEN
+
+    def call(self, printer: str, operation) -> bool | None:
+        """
+        Runs an operation for a printer once, after it passed the readiness probe.
+
+        Only the idempotent probe is retried; a printer that stays not ready fails the
+        operation before anything is sent, so the caller may try another printer.
+
+        Args:
+            printer (str): Printer the operation targets.
+            operation (Callable[[], bool]): Returns True on success.
+
+        Returns:
+            bool | None: True on success, False if the operation ran and failed (its
+            outcome is unknown, do not repeat it), None if it was not run at all
+            (breaker open or printer not ready).
+        """
+        breaker = self.breaker(printer)
+        if not breaker.allow():
+            self.logger.warning("Tiskárna '%s' je mimo provoz, etiketa přeskočena.", printer)
+            return None
+
+        result = None
+        if self.wait_ready(printer):
+            result = bool(operation())
+        if result:
+            if breaker.record_success():
+                self._changed(printer, True)
+            return True
+
+        if breaker.record_failure():
+            self._changed(printer, False)
+        return result
+
+    def wait_ready(self, printer: str) -> bool:
+        """
+        Probes the printer, retrying the probe with backoff while it is not ready.
+
+        Returns:
+            bool: True once the probe succeeded, False after all retries.
+        """
+        delay = self.backoff
+        for attempt in range(self.retries + 1):
+            if self.probe(printer):
+                return True
+            if attempt < self.retries:
+                self.logger.warning(
+                    "Tiskárna '%s' není připravena (pokus %d), nová kontrola za %.1f s.",
+                    printer,
+                    attempt + 1,
+                    delay
+                )
+                time.sleep(delay)
+                delay *= 2
+
+        self.logger.warning("Tiskárna '%s' není připravena, etiketa nebyla odeslána.", printer)
+        return False
+
+    def report_success(self, printer: str):
+        """Records an operation that succeeded outside `call` (e.g. a batched print)."""
+        if self.breaker(printer).record_success():
+            self._changed(printer, True)
+
+    def start(self):
+        """Starts the background probe thread."""
+        self._probe_loop.start()
+
+    def stop(self):
+        """Stops the background probe thread."""
+        self._probe_loop.stop()
+
+    def probe_open_printers(self):
+        """Probes every printer with an open breaker and closes it if the printer is back."""
+        with self._lock:
+            down = [name for name, b in self._breakers.items() if b.state != CLOSED]
+        for printer in down:
+            if self.probe(printer) and self.breaker(printer).record_success():
+                self._changed(printer, True)
+
+    def _changed(self, printer: str, available: bool):
+        """Logs a breaker transition and forwards it to the on_change callback."""
+        if available:
+            self.logger.info("Tiskárna '%s' je opět dostupná.", printer)
+        else:
+            self.logger.error("Tiskárna '%s' je nedostupná, další etikety se přeskočí.", printer)
+        if self.on_change:
+            self.on_change(printer, available)
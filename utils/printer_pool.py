@@ -0,0 +1,127 @@
+"""
+📦 Module: printer_pool.py
+
+Load balancing of one label across a pool of identical printers.
+
+Responsibilities:
+    - Keep a cached, background-refreshed view of printer readiness and queue depth
+    - Pick a printer for each label by strategy: round_robin, least_jobs or failover
+    - Never pick a printer whose circuit breaker is open
+
+Config example ([Labels]):
+    label01 = T:/.../50x45_SN.btw|50x45_ZD621_A,50x45_ZD621_B|1
+
+Author: Miloslav Hradecky
+"""
+
+# 🧱 Standard library
+import threading
+
+# 🧠 First-party (project-specific)
+from utils.logger import get_logger
+from utils.background_loop import BackgroundLoop
+
+ROUND_ROBIN = "round_robin"
+LEAST_JOBS = "least_jobs"
+FAILOVER = "failover"
+STRATEGIES = (ROUND_ROBIN, LEAST_JOBS, FAILOVER)
+
+
+class PrinterStatusCache:
+    """
+    Cached view of (ready, queued_jobs) per printer, refreshed in a background thread.
+    Pool selection reads only this cache and never waits for the spooler.
+    """
+
+    def __init__(self, query, refresh_interval: float = 2.0):
+        """
+        Args:
+            query (Callable[[str], tuple[bool, int]]): Reads (ready, queued_jobs) of a printer.
+            refresh_interval (float): Seconds between two refresh rounds.
+        """
+        self.query = query
+        self.logger = get_logger("PrinterStatusCache")
+        self._lock = threading.Lock()
+        self._status = {}
+        self._refresh_loop = BackgroundLoop(self.refresh, refresh_interval, "PrinterStatusCache")
+
+    def watch(self, printers):
+        """Registers printers to be refreshed (unknown printers are assumed ready)."""
+        with self._lock:
+            for printer in printers:
+                self._status.setdefault(printer, (True, 0))
+
+    def get(self, printer: str) -> tuple[bool, int]:
+        """Returns the cached (ready, queued_jobs) of a printer."""
+        with self._lock:
+            return self._status.get(printer, (True, 0))
+
+    def note_submitted(self, printer: str):
+        """Counts a job sent to a printer until the next refresh reads the real queue."""
+        with self._lock:
+            ready, jobs = self._status.get(printer, (True, 0))
+            self._status[printer] = (ready, jobs + 1)
+
+    def refresh(self):
+        """Queries all watched printers once."""
+        with self._lock:
+            printers = list(self._status)
+        for printer in printers:
+            status = self.query(printer)
+            with self._lock:
+                self._status[printer] = status
+
+    def start(self):
+        """Starts the background refresh thread."""
+        self._refresh_loop.start()
+
+    def stop(self):
+        """Stops the background refresh thread."""
+        self._refresh_loop.stop()
+
+
+class PrinterPool:  # pylint: disable=too-few-public-methods
+    """Selects one printer of a label's pool according to the configured strategy."""
+
+    def __init__(self, printers, strategy: str, status_cache: PrinterStatusCache, is_available):
+        """
+        Args:
+            printers (Sequence[str]): Printers of the pool in configured (priority) order.
+            strategy (str): round_robin, least_jobs or failover.
+            status_cache (PrinterStatusCache): Cached printer state.
+            is_available (Callable[[str], bool]): False while a printer's breaker is open.
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Neznámá strategie výběru tiskárny: '{strategy}'")
+        self.printers = tuple(printers)
+        self.strategy = strategy
+        self.status_cache = status_cache
+        self.is_available = is_available
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def select(self, exclude=()) -> str | None:
+        """
+        Picks a printer for the next label.
+
+        Args:
+            exclude (Iterable[str]): Printers already tried for this label.
+
+        Returns:
+            str | None: Chosen printer, or None if every printer is down or excluded.
+        """
+        usable = [p for p in self.printers if p not in exclude and self.is_available(p)]
+        ready = [p for p in usable if self.status_cache.get(p)[0]]
+        candidates = ready or usable  # 💡 the cache is advisory, the breaker is authoritative
+        if not candidates:
+            return None
+
+        if self.strategy == LEAST_JOBS:
+            return min(candidates, key=lambda p: self.status_cache.get(p)[1])
+        if self.strategy == FAILOVER:
+            return candidates[0]
+
+        with self._lock:
+            chosen = candidates[self._next % len(candidates)]
+            self._next += 1
+        return chosen
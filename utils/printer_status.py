@@ -0,0 +1,97 @@
+"""
+📦 Module: printer_status.py
+
+Queries the Windows spooler for the state of a printer.
+Used as the health probe of PrinterHealthRegistry and as the data source
+of PrinterStatusCache (printer pools).
+
+Also sends raw data (ZPL) to a printer through the spooler (RAW datatype).
+
+Author: Miloslav Hradecky
+"""
+
+# 🧩 Third-party libraries
+import pywintypes
+import win32print
+
+# 📌 Spooler status bits meaning the printer cannot print right now
+PROBLEM_STATUS = (
+    win32print.PRINTER_STATUS_OFFLINE
+    | win32print.PRINTER_STATUS_ERROR
+    | win32print.PRINTER_STATUS_NOT_AVAILABLE
+    | win32print.PRINTER_STATUS_PAPER_OUT
+    | win32print.PRINTER_STATUS_PAPER_JAM
+    | win32print.PRINTER_STATUS_DOOR_OPEN
+)
+
+
+def get_printer_status(printer_name: str) -> tuple[bool, int]:
+    """
+    Reads readiness and spooler queue depth of a printer.
+
+    Args:
+        printer_name (str): Name of the printer as shown in Windows.
+
+    Returns:
+        tuple: (ready, queued_jobs); a missing printer is reported as (False, 0).
+    """
+    try:
+        handle = win32print.OpenPrinter(printer_name)
+    except pywintypes.error:
+        return False, 0
+
+    try:
+        info = win32print.GetPrinter(handle, 2)
+    except pywintypes.error:
+        return False, 0
+    finally:
+        win32print.ClosePrinter(handle)
+
+    if info["Attributes"] & win32print.PRINTER_ATTRIBUTE_WORK_OFFLINE:
+        return False, info["cJobs"]
+    return not info["Status"] & PROBLEM_STATUS, info["cJobs"]
+
+
+def is_printer_ready(printer_name: str) -> bool:
+    """
+    Checks whether a printer exists, is online, and reports no error.
+
+    Args:
+        printer_name (str): Name of the printer as shown in Windows.
+
+    Returns:
+        bool: True if the printer can accept jobs.
+    """
+    ready, _ = get_printer_status(printer_name)
+    return ready
+
+
+def send_raw(printer_name: str, payload: bytes, document: str = "PrintSingleSN"):
+    """
+    Sends raw bytes (e.g. ZPL) to a printer through the Windows spooler, unprocessed.
+
+    Args:
+        printer_name (str): Name of the printer as shown in Windows.
+        payload (bytes): Data in the printer language.
+        document (str): Document name shown in the print queue.
+
+    Raises:
+        OSError: If the printer cannot be opened or the spooler rejects the job.
+    """
+    try:
+        handle = win32print.OpenPrinter(printer_name)
+    except pywintypes.error as exc:
+        raise OSError(f"Tiskárnu '{printer_name}' nelze otevřít: {exc}") from exc
+
+    try:
+        win32print.StartDocPrinter(handle, 1, (document, None, "RAW"))
+        try:
+            win32print.StartPagePrinter(handle)
+            win32print.WritePrinter(handle, payload)
+            win32print.EndPagePrinter(handle)
+        finally:
+            win32print.EndDocPrinter(handle)
+    except pywintypes.error as exc:
+        raise OSError(f"Spooler odmítl data pro '{printer_name}': {exc}") from exc
+    finally:
+        win32print.ClosePrinter(handle)
@@ -0,0 +1,296 @@
+"""
+📦 Module: printer_transport.py
+
+Transport of raw printer data (ZPL) to network printers over short-lived connections.
+
+Responsibilities:
+    - Resolve printer names from [Labels] to network addresses ([Printers] mapping
+      or a literal "tcp://host[:port]"); other names go to the Windows spooler
+    - Reuse a printer's TCP connection only within a burst of labels and close it
+      `linger` seconds after the last one, because most printers accept a single
+      raw-port client at a time and other stations or the driver would be locked out
+    - Keep the connection open between bursts only for printers opted in as persistent
+      (TCP keep-alive on, reopened after `idle_timeout`)
+    - Probe reachability with a connection that is closed right away
+    - Detect connections dropped by the printer and reconnect transparently
+    - Bound the jobs in flight per printer; writes of one printer are serialized
+      back to back on its connection (pipelined, no per-label round trip)
+
+The spooler is injected, so the module has no platform dependency and can be
+exercised against local socket servers simulating slow or dropping printers.
+
+Config example:
+    [Printers]
+    50x45_ZD621 = tcp://10.0.0.21:9100
+
+Author: Miloslav Hradecky
+"""
+
+# 🧱 Standard library
+import time
+import socket
+import select
+import threading
+
+# 🧠 First-party (project-specific)
+from utils.logger import get_logger
+
+TCP_SCHEME = "tcp://"
+DEFAULT_TCP_PORT = 9100
+
+
+def parse_tcp_target(printer: str) -> tuple[str, int] | None:
+    """
+    Parses a network printer address.
+
+    Returns:
+        tuple[str, int] | None: (host, port) for "tcp://host[:port]", None for spooler names.
+    """
+    if not printer.lower().startswith(TCP_SCHEME):
+        return None
+    host, _, port = printer[len(TCP_SCHEME):].rpartition(":")
+    if not host or not port.isdigit():
+        return printer[len(TCP_SCHEME):], DEFAULT_TCP_PORT
+    return host, int(port)
+
+
+class PrinterConnection:  # pylint: disable=too-many-instance-attributes
+    """TCP connection to one printer, closed after a burst unless it is persistent."""
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+            self, address: tuple[str, int], timeout: float = 5.0, idle_timeout: float = 30.0,
+            max_in_flight: int = 4, persistent: bool = False, linger: float = 2.0):
+        """
+        Args:
+            address (tuple[str, int]): (host, port) of the printer.
+            timeout (float): Connect/send timeout and the longest wait for a free slot.
+            idle_timeout (float): Seconds after which an unused connection is reopened
+                (printers silently drop idle sockets).
+            max_in_flight (int): Jobs that may be sending or waiting for this printer.
+            persistent (bool): Keep the connection open between bursts.
+            linger (float): Seconds a non-persistent connection waits for the next job
+                of a burst before it is closed (0 closes it after every job).
+        """
+        self.address = address
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.persistent = persistent
+        self.linger = linger
+        self.logger = get_logger("PrinterConnection")
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._sock = None
+        self._last_used = 0.0
+        self._closer = None
+
+    def _open(self):
+        """Opens a new connection with TCP keep-alive."""
+        sock = socket.create_connection(self.address, timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        if hasattr(socket, "SIO_KEEPALIVE_VALS"):
+            # 💡 Windows: first probe after 10 s idle, then every 3 s
+            sock.ioctl(socket.SIO_KEEPALIVE_VALS, (1, 10_000, 3_000))
+        self._sock = sock
+        self._last_used = time.monotonic()
+
+    def _close(self):
+        """Closes the connection (errors of an already broken socket are ignored)."""
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+
+    def _usable(self) -> bool:
+        """
+        Checks an open connection without blocking: idle too long, closed by the
+        printer (readable with EOF) or failed. Data the printer sent (status bytes)
+        is discarded.
+        """
+        if self._sock is None:
+            return False
+        if time.monotonic() - self._last_used > self.idle_timeout:
+            return False
+        try:
+            readable, _, failed = select.select([self._sock], [], [self._sock], 0)
+            while readable:
+                if not self._sock.recv(4096):
+                    return False
+                readable, _, failed = select.select([self._sock], [], [self._sock], 0)
+        except OSError:
+            return False
+        return not failed
+
+    def probe(self) -> bool:
+        """
+        Health probe: True if the printer accepts a connection. An open connection
+        counts as reachable; a new one is closed at once unless the printer is persistent.
+        """
+        with self._lock:
+            if self._usable():
+                return True
+            self._close()
+            try:
+                self._open()
+            except OSError:
+                return False
+            if not self.persistent:
+                self._close()
+            return True
+
+    def _release(self):
+        """Closes a non-persistent connection now or after linger seconds (lock held)."""
+        if self.persistent:
+            return
+        if self._closer is not None:
+            self._closer.cancel()
+            self._closer = None
+        if self.linger <= 0:
+            self._close()
+            return
+        self._closer = threading.Timer(self.linger, self._close_idle)
+        self._closer.daemon = True
+        self._closer.start()
+
+    def _close_idle(self):
+        """Timer callback: closes the connection unless a newer job has used it."""
+        with self._lock:
+            if time.monotonic() - self._last_used >= self.linger:
+                self._close()
+
+    def send(self, payload: bytes):
+        """
+        Writes one job, reusing the connection of the current burst and reconnecting once
+        if the printer dropped it.
+
+        Raises:
+            OSError: If the printer is unreachable, too slow or too many jobs are in flight.
+        """
+        # 💡 a slot is waited for with a timeout, so it cannot be taken in a with block
+        if not self._slots.acquire(timeout=self.timeout):  # pylint: disable=consider-using-with
+            raise OSError(f"Tiskárna {self.address[0]} nepřijímá data (příliš mnoho úloh)")
+        try:
+            with self._lock:
+                reused = self._usable()
+                if not reused:
+                    self._close()
+                    self._open()
+                try:
+                    self._sock.sendall(payload)
+                except OSError:
+                    self._close()
+                    if not reused:
+                        raise
+                    # 💡 the printer dropped the connection between the check and the write
+                    self.logger.info("Spojení s %s:%d obnoveno.", *self.address)
+                    self._open()
+                    self._sock.sendall(payload)
+                self._last_used = time.monotonic()
+                self._release()
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """Closes the connection."""
+        with self._lock:
+            if self._closer is not None:
+                self._closer.cancel()
+                self._closer = None
+            self._close()
+
+
+class PrinterTransport:  # pylint: disable=too-many-instance-attributes
+    """Sends raw data to printers: network printers over pooled connections, others via spooler."""
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+            self, addresses: dict[str, str] | None = None, spooler=None, timeout: float = 5.0,
+            idle_timeout: float = 30.0, max_in_flight: int = 4, persistent=(),
+            linger: float = 2.0):
+        """
+        Args:
+            addresses (dict[str, str] | None): Printer name → "tcp://host[:port]" ([Printers]).
+            spooler (Callable[[str, bytes], None] | None): Sends raw bytes to a Windows
+                printer (raises OSError on failure); None allows network printers only.
+            timeout (float): Connect/send timeout in seconds.
+            idle_timeout (float): Seconds after which an unused persistent connection
+                is reopened.
+            max_in_flight (int): Jobs that may be sending or waiting per printer.
+            persistent (Iterable[str]): Printers (names or tcp:// addresses) whose
+                connection stays open between bursts.
+            linger (float): Seconds other connections stay open after the last job.
+        """
+        self.spooler = spooler
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.max_in_flight = max_in_flight
+        self.linger = linger
+        self.addresses = {}
+        for name, target in (addresses or {}).items():
+            address = parse_tcp_target(target.strip())
+            if address is None:
+                raise ValueError(f"Tiskárna '{name}' v [Printers] nemá adresu tcp://: '{target}'")
+            self.addresses[name] = address
+        self.persistent = {self.resolve(name) for name in persistent} - {None}
+        self._lock = threading.Lock()
+        self._connections = {}
+
+    def resolve(self, printer: str) -> tuple[str, int] | None:
+        """Returns the network address of a printer, None for spooler printers."""
+        return self.addresses.get(printer) or parse_tcp_target(printer)
+
+    def connection(self, printer: str) -> PrinterConnection | None:
+        """Returns the pooled connection of a network printer (created on first use)."""
+        address = self.resolve(printer)
+        if address is None:
+            return None
+        with self._lock:
+            connection = self._connections.get(address)
+            if connection is None:
+                connection = PrinterConnection(
+                    address,
+                    self.timeout,
+                    self.idle_timeout,
+                    self.max_in_flight,
+                    persistent=address in self.persistent,
+                    linger=self.linger
+                )
+                self._connections[address] = connection
+            return connection
+
+    def send(self, printer: str, payload: bytes):
+        """
+        Sends raw bytes to the printer.
+
+        Raises:
+            OSError: If the printer cannot be reached or the spooler rejects the job.
+        """
+        connection = self.connection(printer)
+        if connection is not None:
+            connection.send(payload)
+            return
+        if self.spooler is None:
+            raise OSError(f"Tiskárna '{printer}' není síťová a raw spooler není k dispozici")
+        self.spooler(printer, payload)
+
+    def status(self, printer: str) -> tuple[bool, int] | None:
+        """
+        Health of a network printer: (reachable, 0); a raw port has no job queue.
+        The probe does not hold the printer's port (see PrinterConnection.probe).
+
+        Returns:
+            tuple[bool, int] | None: None for spooler printers.
+        """
+        connection = self.connection(printer)
+        if connection is None:
+            return None
+        return connection.probe(), 0
+
+    def close(self):
+        """Closes all pooled connections."""
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for connection in connections:
+            connection.close()
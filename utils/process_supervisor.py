@@ -0,0 +1,160 @@
+"""
+📦 Module: process_supervisor.py
+
+Keeps one external process (the BarTender engine) warm for the whole session.
+
+Responsibilities:
+    - Start the process once and watch it from a background thread
+    - Detect crashed (exited) and hung (failed health probe) instances
+    - Restart them with exponential backoff
+    - Terminate only the instance it started itself
+
+Uses only the standard library, so it can be exercised with any dummy child process.
+A launcher may start the process some other way (e.g. through COM) and return
+a Popen-like handle (pid, poll, terminate, wait, kill) instead.
+
+Author: Miloslav Hradecky
+"""
+
+# 🧱 Standard library
+import time
+import threading
+import subprocess
+
+# 🧠 First-party (project-specific)
+from utils.logger import get_logger
+from utils.background_loop import BackgroundLoop
+
+
+class ProcessSupervisor:  # pylint: disable=too-many-instance-attributes
+    """
+    Supervises a single owned child process.
+
+    The optional probe receives the child PID and returns False when the
+    process is alive but not responding; such an instance is restarted.
+    `restarts` counts the restarts of this session (reported by diagnostics).
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+            self, command: list[str] | None, probe=None, name: str = "process",
+            probe_interval: float = 5.0, backoff_initial: float = 1.0,
+            backoff_max: float = 60.0, stable_after: float = 60.0, launcher=None,
+            **popen_kwargs):
+        """
+        Initializes the supervisor without starting the process.
+
+        Args:
+            command (list[str] | None): Command line of the supervised process.
+            probe (Callable[[int], bool] | None): Health probe called with the child PID.
+            name (str): Name used in log messages.
+            probe_interval (float): Seconds between two health checks.
+            backoff_initial (float): First restart delay in seconds.
+            backoff_max (float): Upper bound of the restart delay.
+            stable_after (float): Uptime after which the backoff is reset.
+            launcher (Callable[[], Popen-like] | None): Starts the process instead of
+                subprocess.Popen(command).
+            **popen_kwargs: Extra arguments for subprocess.Popen (e.g. creationflags).
+        """
+        self.command = command
+        self.probe = probe
+        self.name = name
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.stable_after = stable_after
+        self.launcher = launcher
+        self.popen_kwargs = popen_kwargs
+        self.logger = get_logger("ProcessSupervisor")
+        self.restarts = 0
+
+        self._lock = threading.Lock()
+        self._process = None
+        self._started_at = 0.0
+        self._backoff = backoff_initial
+        self._monitor_loop = BackgroundLoop(self._monitor, probe_interval, f"{name}Supervisor")
+
+    @property
+    def pid(self) -> int | None:
+        """Returns the PID of the owned process while it is running."""
+        with self._lock:
+            if self._process is not None and self._process.poll() is None:
+                return self._process.pid
+            return None
+
+    def is_running(self) -> bool:
+        """Returns True if the owned process is alive."""
+        return self.pid is not None
+
+    def start(self):
+        """Starts the process and the background monitor (no-op if already started)."""
+        if self._monitor_loop.running:
+            return
+        self._spawn()
+        self._monitor_loop.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stops monitoring and terminates the owned process."""
+        self._monitor_loop.stop()
+        self._terminate(timeout)
+
+    def _spawn(self) -> bool:
+        """Launches a new instance of the process."""
+        try:
+            if self.launcher is not None:
+                process = self.launcher()
+            else:
+                # 💡 the child outlives this call; _terminate ends it, so no with block
+                process = subprocess.Popen(  # pylint: disable=consider-using-with
+                    self.command, **self.popen_kwargs
+                )
+        except OSError as e:
+            self.logger.error("%s nelze spustit: %s", self.name, str(e))
+            return False
+        with self._lock:
+            self._process = process
+            self._started_at = time.monotonic()
+        self.logger.info("%s spuštěn (PID %d).", self.name, process.pid)
+        return True
+
+    def _terminate(self, timeout: float = 5.0):
+        """Terminates the owned process, killing it if it does not exit in time."""
+        with self._lock:
+            process, self._process = self._process, None
+        if process is None or process.poll() is not None:
+            return
+        process.terminate()
+        try:
+            process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        self.logger.info("%s ukončen (PID %d).", self.name, process.pid)
+
+    def _check(self) -> str | None:
+        """Returns the failure reason ("crashed"/"hung"/"missing") or None if healthy."""
+        with self._lock:
+            process = self._process
+        if process is None:
+            return "missing"
+        if process.poll() is not None:
+            return "crashed"
+        if self.probe is not None and not self.probe(process.pid):
+            return "hung"
+        return None
+
+    def _monitor(self):
+        """Monitor round (every probe_interval): probe the process, restart it with backoff."""
+        reason = self._check()
+        if reason is None:
+            if time.monotonic() - self._started_at >= self.stable_after:
+                self._backoff = self.backoff_initial
+            return
+
+        self.logger.warning(
+            "%s nereaguje (%s), restart za %.1f s.", self.name, reason, self._backoff
+        )
+        self._terminate()
+        if self._monitor_loop.wait(self._backoff):
+            return  # 💡 stopped during the backoff
+        self._backoff = min(self._backoff * 2, self.backoff_max)
+        if self._spawn():
+            self.restarts += 1
@@ -26,9 +26,24 @@ Author: Miloslav Hradecky
 
 # 🧱 Standard library
 import sys
+from functools import cache
 from pathlib import Path
 
 
+@cache
+def _runtime_path() -> Path:
+    """Returns the directory of the script/executable (resolved once per process)."""
+    return Path(sys.argv[0]).resolve().parent
+
+
+@cache
+def _base_path() -> Path:
+    """Detects base path depending on runtime context (standard or PyInstaller)."""
+    if getattr(sys, 'frozen', False):
+        return Path(sys._MEIPASS)  # type: ignore  # pylint: disable=protected-access
+    return Path(__file__).resolve().parent.parent
+
+
 class ResourceResolver:
     """
     Resolves file paths for resources, config, and writable outputs.
@@ -37,14 +52,8 @@ class ResourceResolver:
 
     def __init__(self, config_filename: str = "config.ini"):
         self.config_filename = config_filename
-        self.runtime_path = Path(sys.argv[0]).resolve().parent
-        self.base_path = self._detect_base_path()
-
-    def _detect_base_path(self) -> Path:  # noqa
-        """Detects base path depending on runtime context (standard or PyInstaller)."""
-        if getattr(sys, 'frozen', False):
-            return Path(sys._MEIPASS)  # type: ignore
-        return Path(__file__).resolve().parent.parent
+        self.runtime_path = _runtime_path()  # 💡 memoized, the resolver is created often
+        self.base_path = _base_path()
 
     def resource(self, relative_path: str) -> Path:
         """Resolves path to bundled resource (e.g. .qss, images)."""
@@ -55,9 +64,9 @@ class ResourceResolver:
         path = Path(config_value)
         return path if path.is_absolute() else self.resource(config_value)
 
-    def writable(self, relative_path: str) -> Path:  # noqa
+    def writable(self, relative_path: str) -> Path:
         """Returns writable path relative to script or executable location."""
-        return Path(sys.argv[0]).resolve().parent / relative_path
+        return self.runtime_path / relative_path
 
     def config(self) -> Path:
         """
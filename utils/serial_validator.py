@@ -0,0 +1,217 @@
+"""
+📦 Module: serial_validator.py
+
+Serial number validation rules, compiled once from config.ini and evaluated
+on every scan before any print work (no BarTender run, no journal row).
+
+Rules ([Validation], all optional):
+    pattern     – regular expression the whole serial must match
+    length      – exact length ("10") or range ("8-12")
+    prefix      – allowed prefixes separated by commas ("SN,RM")
+    check_digit – last character is a check digit: mod10 (Luhn), mod11 or gs1
+
+Global keys apply to every serial; keys prefixed by a label key
+("label01.pattern") add rules of that label, which must exist in [Labels].
+A serial must pass all rules.
+
+Config example:
+    [Validation]
+    length = 10
+    check_digit = gs1
+    label02.prefix = 84,85
+
+Author: Miloslav Hradecky
+"""
+
+# 🧱 Standard library
+import re
+from dataclasses import dataclass
+from typing import Callable
+
+# 🧠 First-party (project-specific)
+from utils.config_reader import ConfigReader
+
+RULE_KEYS = ("pattern", "length", "prefix", "check_digit")
+
+
+def _digits(text: str) -> list[int]:
+    """Returns the ASCII digits of the text as integers (other characters are ignored)."""
+    return [ord(char) - 48 for char in text if "0" <= char <= "9"]
+
+
+def check_mod10(serial: str) -> bool:
+    """Luhn (mod 10) check digit over the digits of the serial."""
+    digits = _digits(serial)
+    if len(digits) < 2:
+        return False
+    total = 0
+    for i, digit in enumerate(reversed(digits)):
+        if i % 2:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        total += digit
+    return total % 10 == 0
+
+
+def check_mod11(serial: str) -> bool:
+    """Mod 11 check digit (weights 2–7 from the right, remainder 10 written as X)."""
+    body = _digits(serial[:-1])
+    if not body:
+        return False
+    total = sum(digit * (2 + i % 6) for i, digit in enumerate(reversed(body)))
+    check = (11 - total % 11) % 11
+    return serial[-1].upper() == ("X" if check == 10 else str(check))
+
+
+def check_gs1(serial: str) -> bool:
+    """GS1 (GTIN/SSCC) check digit: weights 3 and 1 alternating from the right."""
+    digits = _digits(serial)
+    if len(digits) < 2:
+        return False
+    total = sum(digit * (3 if i % 2 == 0 else 1) for i, digit in enumerate(reversed(digits[:-1])))
+    return (10 - total % 10) % 10 == digits[-1]
+
+
+CHECK_DIGITS = {
+    "mod10": check_mod10,
+    "mod11": check_mod11,
+    "gs1": check_gs1,
+}
+
+
+@dataclass(frozen=True)
+class ValidationRule:
+    """Compiled rules of one scope (global or one label)."""
+    scope: str
+    pattern: re.Pattern | None = None
+    min_length: int = 0
+    max_length: int | None = None
+    prefixes: tuple[str, ...] = ()
+    check_digit: Callable[[str], bool] | None = None
+    check_name: str = ""
+
+    def check(self, serial: str) -> str | None:
+        """
+        Evaluates the rule.
+
+        Returns:
+            str | None: Reason of the rejection, None if the serial is valid.
+        """
+        if len(serial) < self.min_length or (
+                self.max_length is not None and len(serial) > self.max_length):
+            allowed = (
+                str(self.min_length) if self.min_length == self.max_length
+                else f"{self.min_length}–{self.max_length if self.max_length is not None else '∞'}"
+            )
+            return f"délka {len(serial)} (povoleno {allowed})"
+        if self.prefixes and not serial.startswith(self.prefixes):
+            return f"nezačíná prefixem {', '.join(self.prefixes)}"
+        if self.pattern is not None and self.pattern.fullmatch(serial) is None:
+            return f"neodpovídá vzoru {self.pattern.pattern}"
+        if self.check_digit is not None and not self.check_digit(serial):
+            return f"chybná kontrolní číslice ({self.check_name})"
+        return None
+
+
+def compile_rule(scope: str, settings: dict) -> ValidationRule:
+    """
+    Compiles the raw settings of one scope.
+
+    Raises:
+        ValueError: If a setting is invalid (reported at config load, not on a scan).
+    """
+    where = f"[Validation] {scope + '.' if scope else ''}"
+
+    pattern = None
+    if settings.get("pattern"):
+        try:
+            pattern = re.compile(settings["pattern"])
+        except re.error as exc:
+            raise ValueError(f"{where}pattern není platný regulární výraz: {exc}") from exc
+
+    min_length, max_length = 0, None
+    if settings.get("length"):
+        raw = settings["length"].replace(" ", "")
+        low, _, high = raw.partition("-")
+        try:
+            min_length = int(low) if low else 0
+            max_length = int(high) if high else (None if "-" in raw else min_length)
+        except ValueError as exc:
+            raise ValueError(f"{where}length není číslo ani rozsah: '{raw}'") from exc
+
+    prefixes = tuple(p.strip() for p in settings.get("prefix", "").split(",") if p.strip())
+
+    check_name = settings.get("check_digit", "").strip().lower()
+    if check_name and check_name not in CHECK_DIGITS:
+        raise ValueError(
+            f"{where}check_digit '{check_name}' není podporován ({'|'.join(CHECK_DIGITS)})"
+        )
+
+    return ValidationRule(
+        scope=scope,
+        pattern=pattern,
+        min_length=min_length,
+        max_length=max_length,
+        prefixes=prefixes,
+        check_digit=CHECK_DIGITS.get(check_name),
+        check_name=check_name
+    )
+
+
+class SerialValidator:
+    """Evaluates all compiled rules on a serial number."""
+
+    def __init__(self, rules: list[ValidationRule]):
+        self.rules = tuple(rules)
+
+    def __bool__(self) -> bool:
+        return bool(self.rules)
+
+    def validate(self, serial: str) -> str | None:
+        """
+        Checks the serial against all rules.
+
+        Returns:
+            str | None: Reason of the first failed rule (with its label), None if valid.
+        """
+        for rule in self.rules:
+            reason = rule.check(serial)
+            if reason is not None:
+                return f"{rule.scope}: {reason}" if rule.scope else reason
+        return None
+
+    @classmethod
+    def from_config(cls, config_reader: ConfigReader) -> "SerialValidator":
+        """
+        Compiles the [Validation] section (an empty or missing section accepts everything).
+
+        Raises:
+            ValueError: If a key or value in [Validation] is invalid or a rule names
+                a label that is not configured in [Labels].
+        """
+        config = config_reader.config
+        if not config.has_section("Validation"):
+            return cls([])
+
+        scopes = {}
+        for key in config.options("Validation"):
+            scope, _, name = key.rpartition(".")
+            if name not in RULE_KEYS:
+                raise ValueError(
+                    f"[Validation] neznámý klíč '{key}' (očekáváno: {', '.join(RULE_KEYS)})"
+                )
+            scopes.setdefault(scope, {})[name] = config.get("Validation", key).strip()
+
+        # 💡 a mistyped label key would otherwise never match and silently check nothing
+        unknown = sorted(scope for scope in scopes if scope)
+        if unknown:
+            labels = config_reader.get_all_labels()
+            unknown = [scope for scope in unknown if scope not in labels]
+        if unknown:
+            raise ValueError(
+                f"[Validation] pravidla pro nenakonfigurované etikety: {', '.join(unknown)}"
+            )
+
+        # 💡 global rules first, then labels in config order
+        return cls([compile_rule(scope, scopes[scope]) for scope in sorted(scopes, key=bool)])
@@ -2,27 +2,28 @@
 📦 Module: set_printer.py
 
 Assigns a printer to a BarTender label file (.btw) via COM automation.
-Validates printer availability and updates label metadata.
+Validates printer availability and updates label metadata on the shared engine.
 
 Author: Miloslav Hradecky
 """
 
 # 🧱 Standard library
 from pathlib import Path
-import win32com.client
 import win32print
 from pywintypes import com_error
 
 
-def set_printer_in_label(label_path: str, printer_name: str, logger=None, messenger=None) -> bool:
+def set_printer_in_label(label_path: str, printer_name: str, engine, logger=None,
+                         messenger=None) -> bool:
     """
     Sets the printer for a BarTender label file (.btw) if the printer exists.
 
     Args:
         label_path (str): Full path to the .btw label file.
         printer_name (str): Name of the printer to assign.
+        engine (BartenderEngine): The one BarTender engine of the process.
         logger (Logger, optional): Logger for error reporting.
-        messenger (Messenger, optional): Messenger for user feedback.
+        messenger (Messenger, optional): Messenger for non-blocking user feedback.
 
     Returns:
         bool: True if printer was successfully set, False otherwise.
@@ -32,7 +33,7 @@ def set_printer_in_label(label_path: str, printer_name: str, logger=None, messen
         if logger:
             logger.error("Soubor etikety neexistuje: %s", label_file)
         if messenger:
-            messenger.error(f"Soubor etikety neexistuje: {label_file}", "Set Printer")
+            messenger.notify(f"Soubor etikety neexistuje: {label_file}", "error")
         return False
 
     printers = [p[2] for p in win32print.EnumPrinters(2)]
@@ -40,22 +41,24 @@ def set_printer_in_label(label_path: str, printer_name: str, logger=None, messen
         if logger:
             logger.error("Tiskárna '%s' není dostupná v systému.", printer_name)
         if messenger:
-            messenger.error(f"Tiskárna '{printer_name}' není dostupná.", "Set Printer")
+            messenger.notify(f"Tiskárna '{printer_name}' není dostupná.", "error")
         return False
 
     try:
-        btapp = win32com.client.Dispatch("BarTender.Application")
-        btapp.Visible = False
-
-        btformat = btapp.Formats.Open(str(label_file), False, "")
-        btformat.Printer = printer_name
-        btformat.Save()
-        btformat.Close(1)
+        engine.call(_save_printer, str(label_file), printer_name)
         return True
 
-    except com_error as e:
+    except (com_error, TimeoutError, RuntimeError) as e:
         if logger:
             logger.error("Chyba COM při nastavování tiskárny: %s", str(e))
         if messenger:
-            messenger.error("Nepodařilo se nastavit tiskárnu v etiketě.", "Set Printer")
+            messenger.notify("Nepodařilo se nastavit tiskárnu v etiketě.", "error")
         return False
+
+
+def _save_printer(btapp, label_path: str, printer_name: str):
+    """Saves the printer into the template (engine thread)."""
+    btformat = btapp.Formats.Open(label_path, False, "")
+    btformat.Printer = printer_name
+    btformat.Save()
+    btformat.Close(1)
@@ -5,6 +5,7 @@ Logs basic system information at application startup.
 
 Responsibilities:
     - Retrieve local IP address and computer name
+    - Provide the computer name for per-station files (journal shards)
     - Log version, hostname, and IP for diagnostics
     - Used during initialization to trace environment context
 
@@ -19,6 +20,19 @@ import platform
 from utils.logger import get_logger
 
 
+def get_computer_name() -> str:
+    """
+    Returns the name of this computer.
+
+    Returns:
+        str: Network name of the PC, "Neznámý" if it cannot be determined.
+    """
+    try:
+        return platform.node() or "Neznámý"
+    except OSError:
+        return "Neznámý"
+
+
 def log_system_info(version: str):
     """
     Logs system information including application version, computer name, and IP address.
@@ -34,10 +48,9 @@ def log_system_info(version: str):
     except socket.gaierror:
         ip_address = "Neznámá"
 
-    # 📌 PC Name
-    try:
-        computer_name = platform.node()
-    except OSError:
-        computer_name = "Neznámý"
-
-    logger.info("Aplikace v%s spuštěna | PC: %s | IP: %s", version, computer_name, ip_address)
+    logger.info(
+        "Aplikace v%s spuštěna | PC: %s | IP: %s",
+        version,
+        get_computer_name(),
+        ip_address
+    )
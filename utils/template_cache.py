@@ -0,0 +1,185 @@
+"""
+📦 Module: template_cache.py
+
+Local, validated cache of BarTender templates (.btw) from the network share.
+
+Responsibilities:
+    - Mirror every configured template into a local cache directory
+    - Validate the copy against the share by size/mtime or by SHA-256 hash
+    - Refresh stale copies in a background thread
+    - Serve the local copy to printer assignment and printing without touching the share
+
+Templates from one share directory share one cache directory, so files placed next
+to them (label.csv) keep the same relative layout as on the share.
+
+Author: Miloslav Hradecky
+"""
+
+# 🧱 Standard library
+import os
+import json
+import shutil
+import hashlib
+import threading
+from pathlib import Path
+
+# 🧠 First-party (project-specific)
+from utils.logger import get_logger
+from utils.background_loop import BackgroundLoop
+
+MTIME = "mtime"
+HASH = "hash"
+
+
+def file_sha256(path: Path) -> str:
+    """Returns the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TemplateCache:
+    """
+    Keeps local copies of label templates and their share fingerprints in a manifest.
+
+    The print path only calls `local_path`, which never touches the share once
+    a template is cached; staleness is detected by the background refresh.
+    """
+
+    def __init__(self, cache_dir, validate: str = MTIME, refresh_interval: float = 60.0):
+        """
+        Args:
+            cache_dir (str | Path): Local directory holding the cached templates.
+            validate (str): "mtime" (size + modification time) or "hash" (SHA-256).
+            refresh_interval (float): Seconds between two background validation rounds.
+        """
+        if validate not in (MTIME, HASH):
+            raise ValueError(f"Neznámý způsob validace šablon: '{validate}' (mtime|hash)")
+
+        self.cache_dir = Path(cache_dir)
+        self.validate = validate
+        self.logger = get_logger("TemplateCache")
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._manifest = self._load_manifest()
+        self._refresh_loop = BackgroundLoop(
+            self.refresh_all, refresh_interval, "TemplateCache", immediate=True
+        )
+
+    @property
+    def manifest_path(self) -> Path:
+        """Returns the path of the manifest inside the cache directory."""
+        return self.cache_dir / "manifest.json"
+
+    def _load_manifest(self) -> dict:
+        """Loads the manifest of cached templates (empty if missing or corrupted)."""
+        try:
+            return json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self):
+        """Writes the manifest atomically."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._manifest, indent=2), encoding="utf-8")
+        os.replace(tmp, self.manifest_path)
+
+    def _cache_file(self, share_path: Path) -> Path:
+        """Returns the local path of a template (one subdirectory per share directory)."""
+        folder = hashlib.sha1(str(share_path.parent).lower().encode("utf-8")).hexdigest()[:10]
+        return self.cache_dir / folder / share_path.name
+
+    def _fingerprint(self, share_path: Path) -> dict:
+        """Reads the current fingerprint of a template on the share."""
+        stat = share_path.stat()
+        fingerprint = {"size": stat.st_size, "mtime": stat.st_mtime_ns}
+        if self.validate == HASH:
+            fingerprint["sha256"] = file_sha256(share_path)
+        return fingerprint
+
+    def _is_current(self, entry: dict | None, fingerprint: dict) -> bool:
+        """Compares a manifest entry with the share fingerprint."""
+        if not entry or not Path(entry["local"]).exists():
+            return False
+        if self.validate == HASH:
+            return entry.get("sha256") == fingerprint["sha256"]
+        return (
+            entry.get("size") == fingerprint["size"]
+            and entry.get("mtime") == fingerprint["mtime"]
+        )
+
+    def sync(self, share_path) -> bool:
+        """
+        Copies a template from the share if the cached copy is missing or stale.
+
+        Args:
+            share_path (str | Path): Template path on the share.
+
+        Returns:
+            bool: True if a valid local copy exists after the call.
+        """
+        share_path = Path(share_path)
+        key = str(share_path)
+        with self._sync_lock:  # 💡 share I/O runs outside the manifest lock
+            with self._lock:
+                entry = self._manifest.get(key)
+            try:
+                fingerprint = self._fingerprint(share_path)
+                if self._is_current(entry, fingerprint):
+                    return True
+
+                local = self._cache_file(share_path)
+                local.parent.mkdir(parents=True, exist_ok=True)
+                tmp = local.with_name(local.name + ".tmp")
+                shutil.copyfile(share_path, tmp)
+                os.replace(tmp, local)
+            except OSError as e:
+                self.logger.warning("Šablonu %s nelze obnovit z share: %s", share_path, str(e))
+                return bool(entry) and Path(entry["local"]).exists()
+
+            with self._lock:
+                self._manifest[key] = {"local": str(local), **fingerprint}
+                self._save_manifest()
+        self.logger.info("Šablona %s uložena do cache: %s", share_path.name, local)
+        return True
+
+    def watch(self, share_paths):
+        """Registers templates for the background refresh (copied on the next round)."""
+        with self._lock:
+            for share_path in share_paths:
+                self._manifest.setdefault(str(Path(share_path)), {})
+
+    def local_path(self, share_path) -> str:
+        """
+        Returns the local copy of a template for printing.
+
+        The share is only read when the template is not cached yet; if it cannot
+        be copied, the share path itself is returned so printing still works.
+        """
+        key = str(Path(share_path))
+        with self._lock:
+            entry = self._manifest.get(key)
+            if entry and Path(entry["local"]).exists():
+                return entry["local"]
+        if self.sync(share_path):
+            with self._lock:
+                return self._manifest[key]["local"]
+        return str(share_path)
+
+    def refresh_all(self):
+        """Validates every watched template against the share."""
+        with self._lock:
+            share_paths = list(self._manifest)
+        for share_path in share_paths:
+            self.sync(share_path)
+
+    def start(self):
+        """Starts the background refresh thread (first round runs immediately)."""
+        self._refresh_loop.start()
+
+    def stop(self):
+        """Stops the background refresh thread."""
+        self._refresh_loop.stop()
@@ -5,6 +5,7 @@ Manages a stack of active windows in a PyQt6 application.
 
 Responsibilities:
     - Push and pop windows with visibility control
+    - Re-push long-lived windows without duplicating them on the stack
     - Hide previous window when a new one is shown
     - Restore previous window when current is closed
     - Handle graceful exit transitions
@@ -14,6 +15,9 @@ Used by controllers to manage navigation between screens.
 Author: Miloslav Hradecky
 """
 
+# 🧱 Standard library
+import weakref
+
 
 class WindowStackManager:
     """
@@ -26,39 +30,41 @@ class WindowStackManager:
     def __init__(self):
         """Initializes the window stack and exit flag."""
         self._stack = []
+        self._connected = weakref.WeakSet()  # 💡 windows whose destroyed signal is connected
         self._is_exiting = False
 
+    def __len__(self) -> int:
+        """Returns the stack depth (reported by diagnostics)."""
+        return len(self._stack)
+
     def mark_exiting(self):
         """Marks the application as exiting to prevent window restoration."""
         self._is_exiting = True
 
     def push(self, window):
         """
-        Adds a new window to the stack and hides the previous one.
+        Adds a window to the top of the stack and hides the previous one.
+        A window that is already on the stack is moved to the top instead of added twice.
 
         Args:
             window (QWidget): The window to show.
         """
-        if self._stack:
+        if self._stack and self._stack[-1] is not window:
             self._stack[-1].hide()
+
+        if window in self._stack:
+            self._stack.remove(window)
+        if window not in self._connected:
+            # 📌 a re-pushed window must not trigger _on_window_closed more than once
+            window.destroyed.connect(self._on_window_closed)
+            self._connected.add(window)
         self._stack.append(window)
-        window.destroyed.connect(self._on_window_closed)
         window.show()
 
-    def show_previous(self):
-        """
-        Shows the previous window in the stack without removing the current one.
-        Useful for manual navigation (e.g. 'Back' button).
-        """
-        if len(self._stack) >= 2 and not self._is_exiting:
-            current = self._stack[-1]
-            previous = self._stack[-2]
-            current.hide()
-            previous.show()
-
     def pop(self):
         """
-        Removes the top window from the stack and restores the previous one if applicable.
+        Removes and hides the top window and restores the previous one if applicable.
+        The removed window is kept alive, so it can be pushed again later.
 
         Returns:
             QWidget or None: The window that was removed.
@@ -67,6 +73,7 @@ class WindowStackManager:
             return None
 
         closing = self._stack.pop()
+        closing.hide()
 
         if self._stack and not self._is_exiting:
             previous = self._stack[-1]
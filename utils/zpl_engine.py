@@ -0,0 +1,134 @@
+"""
+📦 Module: zpl_engine.py
+
+Direct raw ZPL printing for Zebra printers, bypassing BarTender.
+
+Responsibilities:
+    - Load .zpl templates once (reloaded when the file changes) and pre-split them
+      at their placeholders {SerialNumber}, {Date} and {Signature}
+    - Render a label per scan by joining the pre-split parts with the scan data
+    - Hand the raw bytes to PrinterTransport (pooled TCP connection to port 9100
+      or the Windows raw spooler)
+
+The module itself has no platform dependency and can be exercised on any OS
+against a local TCP sink.
+
+Config example ([Labels]):
+    label01 = T:/.../50x45_SN.zpl|tcp://10.0.0.21,50x45_ZD621|1
+
+Author: Miloslav Hradecky
+"""
+
+# 🧱 Standard library
+import os
+import re
+import threading
+
+# 🧠 First-party (project-specific)
+from utils.logger import get_logger
+from utils.printer_transport import PrinterTransport
+
+ZPL_SUFFIX = ".zpl"
+PLACEHOLDER = re.compile(r"\{(\w+)\}")
+ZPL_PREFIXES = str.maketrans("", "", "^~")
+
+
+def is_zpl_template(label_path: str) -> bool:
+    """Returns True for labels printed by this engine (.zpl templates)."""
+    return str(label_path).lower().endswith(ZPL_SUFFIX)
+
+
+class ZplTemplate:  # pylint: disable=too-few-public-methods
+    """ZPL text split at its placeholders once; rendering only joins strings."""
+
+    def __init__(self, text: str):
+        # 💡 even items are literal ZPL, odd items are placeholder names
+        self.parts = PLACEHOLDER.split(text)
+        self.has_quantity = "^PQ" in text.upper()
+
+    def render(self, data: dict[str, str], copies: int = 1) -> str:
+        """
+        Substitutes the placeholders and sets the number of copies.
+
+        Args:
+            data (dict[str, str]): Placeholder name → value; unknown placeholders stay as they are.
+            copies (int): Copies of the label (^PQ added unless the template sets it).
+
+        Returns:
+            str: ZPL ready to be sent to the printer.
+        """
+        rendered = []
+        for i, part in enumerate(self.parts):
+            if i % 2 == 0:
+                rendered.append(part)
+            elif part in data:
+                # 💡 ^ and ~ start ZPL commands and must not come from scanned data
+                rendered.append(str(data[part]).translate(ZPL_PREFIXES))
+            else:
+                rendered.append("{" + part + "}")
+        zpl = "".join(rendered)
+
+        if copies > 1 and not self.has_quantity:
+            head, separator, tail = zpl.rpartition("^XZ")
+            if separator:
+                zpl = f"{head}^PQ{copies}^XZ{tail}"
+        return zpl
+
+
+class ZplEngine:
+    """Renders cached ZPL templates and sends them through a PrinterTransport."""
+
+    def __init__(self, transport: PrinterTransport | None = None, encoding: str = "utf-8"):
+        """
+        Args:
+            transport (PrinterTransport | None): Delivers the bytes; the default
+                reaches network printers only (no spooler).
+            encoding (str): Encoding of the printer (UTF-8 with ^CI28 in the template).
+        """
+        self.transport = transport or PrinterTransport()
+        self.encoding = encoding
+        self.logger = get_logger("ZplEngine")
+        self._lock = threading.Lock()
+        self._templates = {}  # path → (mtime_ns, ZplTemplate)
+
+    def template(self, label_path: str) -> ZplTemplate:
+        """
+        Returns the compiled template, reading the file only when it changed.
+
+        Raises:
+            OSError: If the template cannot be read.
+        """
+        mtime = os.stat(label_path).st_mtime_ns
+        with self._lock:
+            cached = self._templates.get(label_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        with open(label_path, encoding="utf-8") as f:
+            compiled = ZplTemplate(f.read())
+        with self._lock:
+            self._templates[label_path] = (mtime, compiled)
+        return compiled
+
+    def print_label(self, label_path: str, printer: str, copies: int,
+                    data: dict[str, str]) -> bool:
+        """
+        Renders one label and sends it to the printer.
+
+        Returns:
+            bool: True if the printer (or the spooler) accepted the data.
+        """
+        try:
+            payload = self.template(label_path).render(data, copies).encode(self.encoding)
+            self.transport.send(printer, payload)
+        except (OSError, UnicodeError) as e:
+            self.logger.error(
+                "ZPL etiketa %s na tiskárnu %s neodeslána: %s",
+                os.path.basename(label_path),
+                printer,
+                str(e)
+            )
+            return False
+
+        self.logger.info("Etiketa (ZPL): %s tiskárna: %s", os.path.basename(label_path), printer)
+        return True
@@ -17,11 +17,10 @@ Author: Miloslav Hradecky
 # 🧩 Third-party libraries
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton
-from PyQt6.QtGui import QPalette, QColor, QPixmap, QIcon
+from PyQt6.QtGui import QPalette, QColor
 
 # 🧠 First-party (project-specific)
-from utils.config_reader import ConfigReader
-from utils.resource_resolver import ResourceResolver
+from utils import asset_cache
 
 
 class LoginWindow(QWidget):
@@ -40,11 +39,9 @@ class LoginWindow(QWidget):
         super().__init__()
 
         self.controller = controller
-        self.resolver = ResourceResolver()
         self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
 
-        config = ConfigReader()
-        title = config.get_window_title()
+        title = asset_cache.window_title()
 
         # 📌 Setting the window name and size
         self.setWindowTitle(title)
@@ -53,8 +50,7 @@ class LoginWindow(QWidget):
         self.setWindowFlag(Qt.WindowType.WindowCloseButtonHint, False)
 
         # 📌 Window icon settings
-        icon_path = self.resolver.resource("views/assets/main.ico")
-        self.setWindowIcon(QIcon(str(icon_path)))
+        self.setWindowIcon(asset_cache.icon(asset_cache.MAIN_ICON))
 
         # 📌 Setting the window background colour
         self.setObjectName("LoginWindow")
@@ -63,14 +59,8 @@ class LoginWindow(QWidget):
         layout = QVBoxLayout()
 
         # 📌 Application logo
-        login_logo = self.resolver.resource("views/assets/user.png")
         self.logo = QLabel(self)
-        pixmap = QPixmap(str(login_logo)).scaled(
-            self.width() - 20, 200,
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
-        )
-        self.logo.setPixmap(pixmap)
+        self.logo.setPixmap(asset_cache.pixmap("views/assets/user.png", self.width() - 20, 200))
         self.logo.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(self.logo)
 
@@ -6,7 +6,8 @@ Defines the PrintWindow class — a GUI for printing labels based on scanned ser
 Includes:
 - Display of work order and product info
 - Input field for serial number
-- Buttons for printing and exiting
+- Buttons for printing, reprinting the last label (also F2) and exiting
+- Status line with the number of journal records waiting for the share
 - Visual effects via WindowEffectsManager
 
 Used with a controller to handle print logic.
@@ -25,14 +26,13 @@ from PyQt6.QtWidgets import (
     QLineEdit,
     QPushButton
 )
-from PyQt6.QtGui import QPalette, QColor, QPixmap, QIcon
+from PyQt6.QtGui import QPalette, QColor, QKeySequence, QShortcut
 
 # 🧠 First-party (project-specific)
-from utils.config_reader import ConfigReader
-from utils.resource_resolver import ResourceResolver
+from utils import asset_cache
 
 
-class PrintWindow(QWidget):
+class PrintWindow(QWidget):  # pylint: disable=too-many-instance-attributes
     """
     GUI window for printing product labels based on serial number input.
     Displays order and product info, input field, and navigation buttons.
@@ -45,12 +45,9 @@ class PrintWindow(QWidget):
         Configures layout, input field, buttons, labels, and fade-in effect.
         """
         super().__init__()
-        self.controller = controller
-        self.resolver = ResourceResolver()
-        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        self.controller = controller  # 💡 created once per process, hidden between logins
 
-        config = ConfigReader()
-        title = config.get_window_title()
+        title = asset_cache.window_title()
 
         # 🪟 Title and size
         self.setWindowTitle(title)
@@ -58,8 +55,7 @@ class PrintWindow(QWidget):
         self.setWindowFlag(Qt.WindowType.WindowCloseButtonHint, False)
 
         # 📌 Window icon settings
-        icon_path = self.resolver.resource("views/assets/main.ico")
-        self.setWindowIcon(QIcon(str(icon_path)))
+        self.setWindowIcon(asset_cache.icon(asset_cache.MAIN_ICON))
 
         # 📌 Setting the window background colour
         self.setObjectName("PrintWindow")
@@ -68,14 +64,8 @@ class PrintWindow(QWidget):
         layout = QVBoxLayout()
 
         # 📌 Logo
-        print_logo = self.resolver.resource("views/assets/print.png")
         logo = QLabel(self)
-        pixmap = QPixmap(str(print_logo)).scaled(
-            self.width() - 20, 200,
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
-        )
-        logo.setPixmap(pixmap)
+        logo.setPixmap(asset_cache.pixmap("views/assets/print.png", self.width() - 20, 200))
         logo.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         # 📌 Serial number input
@@ -85,16 +75,33 @@ class PrintWindow(QWidget):
 
         # 📌 Buttons
         self.print_button: QPushButton = QPushButton('Tisk')
+        self.reprint_button: QPushButton = QPushButton('Dotisk (F2)')
         self.back_button: QPushButton = QPushButton('Zpět')
         self.exit_button: QPushButton = QPushButton("Ukončit")
 
+        # 📌 Journal backlog status (hidden while empty)
+        self.status_label = QLabel()
+        self.status_label.setObjectName("PrintStatusLabel")
+        self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.status_label.hide()
+
         # 📌 Enter triggers print
         self.serial_number_input.returnPressed.connect(self.print_button.click)
 
+        # 📌 F2 reprints the last label
+        self.reprint_shortcut = QShortcut(QKeySequence("F2"), self)
+
+        # 📌 Hidden diagnostics dump (logs/diag_<timestamp>.json)
+        self.diagnostics_shortcut = QShortcut(QKeySequence("Ctrl+Shift+F12"), self)
+
         # 📌 Add elements to the main layout
         layout.addWidget(logo)
         layout.addWidget(self.serial_number_input)
-        layout.addWidget(self.print_button)
+        print_layout = QHBoxLayout()
+        print_layout.addWidget(self.print_button, 2)
+        print_layout.addWidget(self.reprint_button, 1)
+        layout.addLayout(print_layout)
+        layout.addWidget(self.status_label)
 
         # 📌 Bottom layout for navigation buttons
         bottom_layout = QHBoxLayout()
@@ -116,6 +123,11 @@ class PrintWindow(QWidget):
         palette.setColor(QPalette.ColorRole.PlaceholderText, QColor("#FFFFFF"))
         self.serial_number_input.setPalette(palette)
 
+    def set_status(self, text: str):
+        """Shows a status line below the print button (empty text hides it)."""
+        self.status_label.setText(text)
+        self.status_label.setVisible(bool(text))
+
     def reset_input_focus(self):
         """Clears the serial number input field and sets focus back to it."""
         self.serial_number_input.clear()
@@ -124,6 +136,7 @@ class PrintWindow(QWidget):
     def disable_inputs(self):
         """Disables all interactive input controls."""
         self.print_button.setDisabled(True)
+        self.reprint_button.setDisabled(True)
         self.back_button.setDisabled(True)
         self.exit_button.setDisabled(True)
         self.serial_number_input.setDisabled(True)
@@ -132,6 +145,7 @@ class PrintWindow(QWidget):
     def restore_inputs(self):
         """Enables all interactive input controls and resets focus."""
         self.print_button.setDisabled(False)
+        self.reprint_button.setDisabled(False)
         self.back_button.setDisabled(False)
         self.exit_button.setDisabled(False)
         self.serial_number_input.setDisabled(False)
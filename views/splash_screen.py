@@ -3,54 +3,43 @@
 
 Provides visual splash screen displayed during application initialization.
 Includes logo fade-in, progress bar, and automatic transition to main window.
+
+Both animations are driven by one coarse timer (STEPS frames in total),
+so the splash never competes with the startup work for more than a few repaints per second.
 """
 
 # 🧩 Third-party libraries
-from PyQt6.QtWidgets import QWidget, QLabel, QProgressBar, QVBoxLayout
-from PyQt6.QtGui import QPixmap, QIcon, QPainter
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtWidgets import QWidget, QLabel, QProgressBar, QVBoxLayout, QGraphicsOpacityEffect
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 
 # 🧠 First-party (project-specific)
-from utils.config_reader import ConfigReader
-from utils.resource_resolver import ResourceResolver
+from utils import asset_cache
+
+STEPS = 60             # 📌 frames of the whole splash (progress bar range)
+STEP_MS = 100          # ⏱️ one frame every 100 ms → 6 s splash
+FADE_STEPS = 45        # 📌 logo is fully visible after 4.5 s
 
 
-class PixmapFader(QLabel):
+class PixmapFader(QLabel):  # pylint: disable=too-few-public-methods
     """
     QLabel subclass used to animate the fade-in effect of a QPixmap.
     Useful for adding visual polish to splash screens or transitions.
-    The image gradually becomes visible using a timer and alpha blending.
+    The pixmap is set once; only the opacity of a QGraphicsOpacityEffect changes,
+    so no frame allocates a new pixmap or painter.
     """
 
     def __init__(self, pixmap, parent=None):
         super().__init__(parent)
-        self.full_pixmap = pixmap
-        self.alpha = 0
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.fade_in)  # type: ignore
-        self.start_fade()
+        self.setPixmap(pixmap)
+        self.effect = QGraphicsOpacityEffect(self)
+        self.effect.setOpacity(0.0)
+        self.setGraphicsEffect(self.effect)
 
-    def start_fade(self):
-        """Starts the fade-in animation."""
-        self.timer.start(90)  # ⏱️ Trigger every 90 ms
-
-    def fade_in(self):
-        """Gradually increases image opacity to create a fade-in effect."""
-        if self.alpha >= 255:
-            self.timer.stop()
-            return
-
-        # 🖼️ Create transparent pixmap with gradual opacity
-        faded = QPixmap(self.full_pixmap.size())
-        faded.fill(Qt.GlobalColor.transparent)
-
-        painter = QPainter(faded)
-        painter.setOpacity(self.alpha / 255)
-        painter.drawPixmap(0, 0, self.full_pixmap)
-        painter.end()
-
-        self.setPixmap(faded)
-        self.alpha += 5  # 📌 Gradually increase alpha
+    def set_opacity(self, opacity: float):
+        """Sets the image opacity (0.0 – 1.0); repaints only when it changes."""
+        opacity = max(0.0, min(1.0, opacity))
+        if opacity != self.effect.opacity():
+            self.effect.setOpacity(opacity)
 
 
 class CustomSplash(QWidget):
@@ -60,37 +49,31 @@ class CustomSplash(QWidget):
     Automatically transitions to the main window once loading is complete.
     """
 
+    finished = pyqtSignal()
+
     def __init__(self, target_window):
         """Initializes the splash screen with logo, message, and progress bar."""
         super().__init__()
         self.target_window = target_window  # 👀 Window to show after splash
-        self.resolver = ResourceResolver()
 
         # 🎨 Transparent background + frameless
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint)
         self.setObjectName("CustomSplash")
 
-        config = ConfigReader()
-        title = config.get_window_title()
+        title = asset_cache.window_title()
 
         # 📌 Setting the window name and size
         self.setWindowTitle(title)
         self.setFixedSize(600, 400)
 
         # 🧩 Set window icon using resource_path for compatibility
-        icon_login_path = self.resolver.resource("views/assets/main.ico")
-        self.setWindowIcon(QIcon(str(icon_login_path)))
+        self.setWindowIcon(asset_cache.icon(asset_cache.MAIN_ICON))
 
         # 🎬 Display splash logo with fade-in animation
-        splash_image_path = self.resolver.resource("views/assets/splash_logo.png")
-        pixmap = QPixmap(str(splash_image_path))
-        scaled = pixmap.scaled(
-            240, 240,
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
+        self.logo_label = PixmapFader(
+            asset_cache.pixmap("views/assets/splash_logo.png", 240, 240)
         )
-        logo_label = PixmapFader(scaled)
 
         # 🎨 Container with rounded background
         container = QWidget(self)
@@ -100,7 +83,7 @@ class CustomSplash(QWidget):
         layout = QVBoxLayout(container)
         layout.setContentsMargins(20, 20, 20, 20)
         layout.setSpacing(15)
-        layout.addWidget(logo_label, alignment=Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.logo_label, alignment=Qt.AlignmentFlag.AlignCenter)
 
         # 💬 Display loading message
         self.message = QLabel("Inicializuji aplikaci...", container)
@@ -110,7 +93,7 @@ class CustomSplash(QWidget):
         # 📶 Progress bar setup
         self.progress = QProgressBar(container)
         self.progress.setObjectName("splashProgress")
-        self.progress.setRange(0, 200)
+        self.progress.setRange(0, STEPS)
         self.progress.setValue(0)
         self.progress.setTextVisible(True)
         layout.addWidget(self.progress)
@@ -120,10 +103,10 @@ class CustomSplash(QWidget):
         main_layout.addWidget(container)
         self.setLayout(main_layout)
 
-        # 🕒 Timer to update progress bar and trigger transition
+        # 🕒 One timer drives the fade, the progress bar and the transition
         self.timer = QTimer()
         self.timer.timeout.connect(self.handle_timer)  # type: ignore
-        self.timer.start(30)
+        self.timer.start(STEP_MS)
         self.counter = 0
 
     def start(self):
@@ -131,12 +114,14 @@ class CustomSplash(QWidget):
         self.show()
 
     def handle_timer(self):
-        """Updates progress bar and triggers transition to main window when complete."""
+        """Updates logo opacity and progress bar, then triggers transition to main window."""
         self.counter += 1
+        self.logo_label.set_opacity(self.counter / FADE_STEPS)
         self.progress.setValue(self.counter)
 
         # 🚪 When progress completes, close splash and show main window
-        if self.counter >= 200:
+        if self.counter >= STEPS:
             self.timer.stop()
             self.target_window.show()
             self.close()
+            self.finished.emit()